@@ -0,0 +1,27 @@
+"""
+Audio Processing Package Initializer
+
+Signal-level audio helpers used by the services (alignment of known narration
+to its audio, the shared ASR model registry, the soundtrack mixer, and friends).
+"""
+from .alignment import AlignmentResult, align_text_to_audio
+from .asr_registry import ASR_BACKENDS, ASRBackend, get_asr_registry
+from .batch_transcription import transcribe_batched
+from .ingest import IngestedAudio, ingest_audio, load_canonical_pcm
+from .loudness import LoudnessAnalyzer, LoudnessProfile
+from .mixer import mix_narration_with_music
+
+__all__ = [
+    "ASR_BACKENDS",
+    "ASRBackend",
+    "AlignmentResult",
+    "IngestedAudio",
+    "LoudnessAnalyzer",
+    "LoudnessProfile",
+    "align_text_to_audio",
+    "get_asr_registry",
+    "ingest_audio",
+    "load_canonical_pcm",
+    "mix_narration_with_music",
+    "transcribe_batched",
+]
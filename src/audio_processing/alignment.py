@@ -0,0 +1,216 @@
+"""
+Forced alignment of known narration text against its TTS audio.
+
+We already know exactly what the TTS engine was asked to say, so open-ended
+ASR is unnecessary for captions: this module places the script's words onto
+the audio using its energy envelope. Speech is split into islands at pauses,
+pauses are matched to word boundaries (favouring punctuation) by a small
+dynamic programme over cumulative speaking time, and words between anchors
+are spread in proportion to their expected spoken length. Words come straight
+from the script, so brand names are never mis-transcribed.
+
+The result carries a confidence score; callers fall back to Whisper when it
+is low.
+"""
+import logging
+import re
+import subprocess
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+FRAME_SECONDS = 0.01
+MIN_PAUSE_SECONDS = 0.12      # Shorter dips are stops/plosives inside speech
+LONG_PAUSE_SECONDS = 0.25     # A pause this long almost always sits between words
+UNMATCHED_PAUSE_COST = 0.5    # Per second of pause left inside a word
+PUNCTUATION_BONUS = 0.04      # Pull pauses towards boundaries after , . ! ? ; :
+MIN_CHARS_PER_SECOND = 6.0    # Plausible narration speaking-rate band
+MAX_CHARS_PER_SECOND = 30.0
+
+@dataclass
+class AlignmentResult:
+    """Word timings in the `asr_word_timings` shape plus a confidence in [0, 1]."""
+    word_timings: List[Dict[str, float]] = field(default_factory=list)
+    confidence: float = 0.0
+    reason: str = ""
+
+def decode_mono(path: str, ffmpeg_binary: str = "ffmpeg") -> Optional[np.ndarray]:
+    """Decode any audio file to mono float32 PCM at SAMPLE_RATE (None on failure)."""
+    try:
+        result = subprocess.run(
+            [ffmpeg_binary, "-hide_banner", "-loglevel", "error", "-i", path,
+             "-ac", "1", "-ar", str(SAMPLE_RATE), "-f", "s16le", "-"],
+            capture_output=True, timeout=60, check=True
+        )
+    except (subprocess.SubprocessError, OSError) as e:
+        log.debug(f"Audio decode failed for {path}: {e}")
+        return None
+    return np.frombuffer(result.stdout, dtype=np.int16).astype(np.float32) / 32768.0
+
+def _word_weight(word: str) -> float:
+    """Expected relative spoken length: letters and digits, with a floor for short words."""
+    core = re.sub(r"[^\w]", "", word)
+    digits = sum(c.isdigit() for c in core)
+    # Digits are read out as whole words ("2024" -> "twenty twenty-four")
+    return max(2.0, len(core) - digits + digits * 3.0)
+
+def _speech_islands(samples: np.ndarray) -> List[Tuple[float, float]]:
+    """(start, end) seconds of voiced regions separated by pauses >= MIN_PAUSE_SECONDS."""
+    frame = int(SAMPLE_RATE * FRAME_SECONDS)
+    frames = samples[: samples.size // frame * frame].reshape(-1, frame)
+    if frames.size == 0:
+        return []
+    energy_db = 10 * np.log10(np.mean(frames ** 2, axis=1) + 1e-10)
+    # Smooth over 30ms so single quiet frames don't split words
+    energy_db = np.convolve(energy_db, np.ones(3) / 3, mode="same")
+
+    loud = np.percentile(energy_db, 95)
+    floor = np.percentile(energy_db, 10)
+    threshold = max(floor + 0.25 * (loud - floor), loud - 35.0)
+    voiced = energy_db > threshold
+
+    islands: List[Tuple[float, float]] = []
+    start = None
+    for i, is_voiced in enumerate(voiced):
+        if is_voiced and start is None:
+            start = i
+        elif not is_voiced and start is not None:
+            islands.append((start * FRAME_SECONDS, i * FRAME_SECONDS))
+            start = None
+    if start is not None:
+        islands.append((start * FRAME_SECONDS, len(voiced) * FRAME_SECONDS))
+
+    # Merge islands separated by dips too short to be pauses
+    merged: List[Tuple[float, float]] = []
+    for island in islands:
+        if merged and island[0] - merged[-1][1] < MIN_PAUSE_SECONDS:
+            merged[-1] = (merged[-1][0], island[1])
+        else:
+            merged.append(island)
+    return merged
+
+def align_text_to_audio(text: str, audio_path: str, ffmpeg_binary: str = "ffmpeg") -> AlignmentResult:
+    """
+    Align the known `text` to the speech in `audio_path`.
+
+    Args:
+        text: The exact narration sent to TTS
+        audio_path: The synthesized narration
+        ffmpeg_binary: ffmpeg used to decode the audio
+
+    Returns:
+        AlignmentResult with one {'word', 'start', 'end'} entry per script word
+    """
+    words = text.split()
+    if not words:
+        return AlignmentResult(reason="empty text")
+    samples = decode_mono(audio_path, ffmpeg_binary)
+    if samples is None or samples.size < SAMPLE_RATE * 0.2:
+        return AlignmentResult(reason="audio unreadable or too short")
+    islands = _speech_islands(samples)
+    if not islands:
+        return AlignmentResult(reason="no speech detected")
+    return align_words_to_islands(words, islands)
+
+def align_words_to_islands(words: List[str], islands: List[Tuple[float, float]]) -> AlignmentResult:
+    """Core of align_text_to_audio, separated from decoding."""
+    weights = np.array([_word_weight(w) for w in words])
+    cum_weight = np.concatenate(([0.0], np.cumsum(weights))) / weights.sum()
+
+    # Speaking-time axis: position of each pause measured in voiced seconds only
+    voiced_before = np.cumsum([0.0] + [end - start for start, end in islands])
+    total_voiced = voiced_before[-1]
+    pauses = [
+        (islands[k][1], islands[k + 1][0], voiced_before[k + 1] / total_voiced)
+        for k in range(len(islands) - 1)
+    ]
+    breaks_after = [bool(re.search(r"[,.!?;:—-]$", w)) for w in words]
+
+    # DP: match pauses (in order) to word gaps 1..n-1 (in order); unmatched pauses fall inside words
+    n_gaps, n_pauses = len(words) - 1, len(pauses)
+    inf = float("inf")
+    cost = np.full((n_gaps + 1, n_pauses + 1), inf)
+    choice = np.zeros((n_gaps + 1, n_pauses + 1), dtype=np.int8)  # 0 skip gap, 1 skip pause, 2 match
+    cost[0, 0] = 0.0
+    for g in range(n_gaps + 1):
+        for p in range(n_pauses + 1):
+            if g == 0 and p == 0:
+                continue
+            best, how = inf, 0
+            if g > 0 and cost[g - 1, p] < best:
+                best, how = cost[g - 1, p], 0
+            if p > 0:
+                pause_len = pauses[p - 1][1] - pauses[p - 1][0]
+                skip = cost[g, p - 1] + UNMATCHED_PAUSE_COST * pause_len
+                if skip < best:
+                    best, how = skip, 1
+            if g > 0 and p > 0:
+                match = cost[g - 1, p - 1] + abs(cum_weight[g] - pauses[p - 1][2])
+                if breaks_after[g - 1]:
+                    match -= PUNCTUATION_BONUS
+                if match < best:
+                    best, how = match, 2
+            cost[g, p], choice[g, p] = best, how
+
+    anchors: Dict[int, Tuple[float, float]] = {}  # gap index -> (pause start, pause end)
+    g, p = n_gaps, n_pauses
+    while g > 0 or p > 0:
+        how = choice[g, p]
+        if how == 2:
+            anchors[g] = pauses[p - 1][:2]
+            g, p = g - 1, p - 1
+        elif how == 1:
+            p -= 1
+        else:
+            g -= 1
+
+    # Lay words out between anchors proportionally to their weights
+    timings: List[Dict[str, float]] = []
+    bounds = [0] + sorted(anchors) + [len(words)]
+    span_start = islands[0][0]
+    for a, b in zip(bounds, bounds[1:]):
+        span_end = anchors[b][0] if b in anchors else islands[-1][1]
+        span_weights = weights[a:b]
+        edges = span_start + (span_end - span_start) * np.concatenate(
+            ([0.0], np.cumsum(span_weights))) / span_weights.sum()
+        for k in range(b - a):
+            timings.append({
+                "word": words[a + k],
+                "start": round(float(edges[k]), 3),
+                "end": round(float(edges[k + 1]), 3),
+            })
+        if b in anchors:
+            span_start = anchors[b][1]
+
+    confidence, reason = _confidence(words, islands, pauses, anchors, breaks_after, total_voiced)
+    return AlignmentResult(word_timings=timings, confidence=confidence, reason=reason)
+
+def _confidence(
+    words: List[str], islands: List[Tuple[float, float]],
+    pauses: List[Tuple[float, float, float]], anchors: Dict[int, Tuple[float, float]],
+    breaks_after: List[bool], total_voiced: float
+) -> Tuple[float, str]:
+    """Heuristic agreement between the script's structure and the audio's pauses."""
+    chars_per_second = sum(len(w) for w in words) / max(total_voiced, 1e-3)
+    if not MIN_CHARS_PER_SECOND <= chars_per_second <= MAX_CHARS_PER_SECOND:
+        return 0.0, f"implausible speaking rate ({chars_per_second:.1f} chars/s)"
+
+    matched_pauses = {pause[:2] for pause in anchors.values()}
+    long_pauses = [p[:2] for p in pauses if p[1] - p[0] >= LONG_PAUSE_SECONDS]
+    pause_score = (
+        sum(p in matched_pauses for p in long_pauses) / len(long_pauses) if long_pauses else 1.0
+    )
+    interior_breaks = [g + 1 for g, is_break in enumerate(breaks_after[:-1]) if is_break]
+    punct_score = (
+        sum(g in anchors for g in interior_breaks) / len(interior_breaks) if interior_breaks else 1.0
+    )
+    # Without long pauses or interior punctuation no word boundary can be confirmed
+    # (however many short dips split the speech), so the timings are guesses:
+    # score them as unusable and let ASR decide
+    if not long_pauses and not interior_breaks:
+        return 0.0, "no pauses to verify against"
+    return round(0.5 * pause_score + 0.5 * punct_score, 3), ""
@@ -0,0 +1,214 @@
+"""
+Process-wide ASR model registry.
+
+Speech recognition models are expensive to load, so they are loaded once per
+process and shared by every AudioService (and every job in a batch) through
+this registry. Engines sit behind a small backend interface:
+
+- "whisper": openai-whisper on PyTorch (fp32 on CPU)
+- "faster-whisper": CTranslate2 with int8 quantization on CPU, usually several
+  times faster at the same accuracy for the short segments we transcribe
+
+Thread counts are set explicitly so transcription doesn't fight the video
+encoder for every core. Models can be pre-warmed in the background at startup.
+"""
+import logging
+import os
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+# Optional dependencies are handled locally
+try:
+    import whisper
+except ImportError:
+    whisper = None
+
+try:
+    from faster_whisper import WhisperModel
+except ImportError:
+    WhisperModel = None
+
+BACKEND_AUTO = "auto"
+BACKEND_WHISPER = "whisper"
+BACKEND_FASTER_WHISPER = "faster-whisper"
+ASR_BACKENDS = (BACKEND_AUTO, BACKEND_WHISPER, BACKEND_FASTER_WHISPER)
+
+def default_asr_threads() -> int:
+    """A quarter of the cores (at least one) - the rest stay with the encoder."""
+    return max(1, (os.cpu_count() or 4) // 4)
+
+class ASRBackend(ABC):
+    """Loaded speech recognition engine producing word-level timings."""
+
+    name: str = ""
+
+    def __init__(self, model_name: str, cpu_threads: int):
+        self.model_name = model_name
+        self.cpu_threads = cpu_threads
+        # One shared model serves every thread; inference calls are serialized
+        self._inference_lock = threading.Lock()
+
+    @classmethod
+    @abstractmethod
+    def is_available(cls) -> bool:
+        """Whether the engine's package is installed."""
+
+    @abstractmethod
+    def load(self) -> None:
+        """Load the model weights (called once by the registry)."""
+
+    def transcribe(self, audio_path: str, language: str = "en") -> List[Dict[str, Any]]:
+        """
+        Transcribe one file. Safe to call from several threads.
+
+        Returns:
+            Raw word timings: [{'word': str, 'start': float, 'end': float}, ...]
+        """
+        with self._inference_lock:
+            return self._transcribe(audio_path, language)
+
+    @abstractmethod
+    def _transcribe(self, audio_path: str, language: str) -> List[Dict[str, Any]]:
+        """Engine-specific transcription (called under the inference lock)."""
+
+class WhisperBackend(ASRBackend):
+    """openai-whisper on CPU."""
+
+    name = BACKEND_WHISPER
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return whisper is not None
+
+    def load(self) -> None:
+        import torch
+        torch.set_num_threads(self.cpu_threads)
+        self.model = whisper.load_model(self.model_name, device="cpu")
+
+    def _transcribe(self, audio_path: str, language: str) -> List[Dict[str, Any]]:
+        result = self.model.transcribe(
+            audio_path,
+            word_timestamps=True,
+            fp16=False,  # More stable on CPU
+            language=language,
+            condition_on_previous_text=False  # Each segment independent
+        )
+        return [
+            {"word": word["word"], "start": word["start"], "end": word["end"]}
+            for segment in result.get("segments", [])
+            for word in segment.get("words", [])
+            if all(key in word for key in ("word", "start", "end"))
+        ]
+
+class FasterWhisperBackend(ASRBackend):
+    """CTranslate2 Whisper with int8 weights on CPU."""
+
+    name = BACKEND_FASTER_WHISPER
+
+    def __init__(self, model_name: str, cpu_threads: int, compute_type: str = "int8"):
+        super().__init__(model_name, cpu_threads)
+        self.compute_type = compute_type
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return WhisperModel is not None
+
+    def load(self) -> None:
+        self.model = WhisperModel(
+            self.model_name, device="cpu", compute_type=self.compute_type,
+            cpu_threads=self.cpu_threads, num_workers=1
+        )
+
+    def _transcribe(self, audio_path: str, language: str) -> List[Dict[str, Any]]:
+        segments, _ = self.model.transcribe(
+            audio_path,
+            language=language,
+            word_timestamps=True,
+            condition_on_previous_text=False,
+            beam_size=1,  # Greedy decoding is plenty for clean TTS audio
+            vad_filter=False
+        )
+        return [
+            {"word": word.word, "start": word.start, "end": word.end}
+            for segment in segments
+            for word in (segment.words or [])
+        ]
+
+_BACKEND_CLASSES = {
+    BACKEND_WHISPER: WhisperBackend,
+    BACKEND_FASTER_WHISPER: FasterWhisperBackend,
+}
+
+class ASRRegistry:
+    """Loads each (backend, model) pair at most once per process."""
+
+    def __init__(self):
+        self._models: Dict[Tuple[str, str], ASRBackend] = {}
+        self._failed: Dict[Tuple[str, str], str] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def resolve_backend(name: str) -> Optional[str]:
+        """Concrete backend for `name`; "auto" prefers the quantized engine when installed."""
+        if name == BACKEND_AUTO:
+            for candidate in (BACKEND_FASTER_WHISPER, BACKEND_WHISPER):
+                if _BACKEND_CLASSES[candidate].is_available():
+                    return candidate
+            return None
+        backend_cls = _BACKEND_CLASSES.get(name)
+        return name if backend_cls and backend_cls.is_available() else None
+
+    def get(self, backend: str = BACKEND_AUTO, model_name: str = "base",
+            cpu_threads: Optional[int] = None) -> Optional[ASRBackend]:
+        """
+        Return the loaded backend, loading it on first use.
+
+        Returns:
+            The backend, or None if it is not installed or failed to load
+        """
+        resolved = self.resolve_backend(backend)
+        if not resolved:
+            log.warning(f"ASR backend '{backend}' not available - subtitles will rely on alignment only")
+            return None
+        key = (resolved, model_name)
+        with self._lock:
+            if key in self._models:
+                return self._models[key]
+            if key in self._failed:
+                return None
+
+            threads = cpu_threads or default_asr_threads()
+            log.info(f"Loading {resolved} ASR model '{model_name}' ({threads} CPU threads)...")
+            instance = _BACKEND_CLASSES[resolved](model_name, threads)
+            try:
+                instance.load()
+            except Exception as e:
+                self._failed[key] = str(e)
+                log.error(f"❌ Failed to load {resolved} model '{model_name}': {e}")
+                return None
+            self._models[key] = instance
+            log.info(f"✅ {resolved} model '{model_name}' loaded - shared process-wide")
+            return instance
+
+    def prewarm(self, backend: str = BACKEND_AUTO, model_name: str = "base",
+                cpu_threads: Optional[int] = None) -> threading.Thread:
+        """Load a model on a background thread so the first job doesn't wait for it."""
+        thread = threading.Thread(
+            target=self.get, args=(backend, model_name, cpu_threads), name="asr-prewarm", daemon=True
+        )
+        thread.start()
+        return thread
+
+    def unload_all(self) -> None:
+        with self._lock:
+            self._models.clear()
+            self._failed.clear()
+
+_registry = ASRRegistry()
+
+def get_asr_registry() -> ASRRegistry:
+    """Process-wide ASR registry."""
+    return _registry
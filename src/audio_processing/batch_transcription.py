@@ -0,0 +1,114 @@
+"""
+Single-pass transcription of many short narration files.
+
+Transcribing 15-30 sentence-length files one by one is dominated by per-call
+overhead (mel setup, decoder start-up, window padding). Instead, all files are
+decoded into one PCM buffer with short silences between them, the buffer is
+transcribed in a single call, and the words are split back per file using the
+known sample offsets.
+"""
+import logging
+import os
+import tempfile
+import wave
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from audio_processing.alignment import SAMPLE_RATE, decode_mono
+from audio_processing.asr_registry import ASRBackend
+
+log = logging.getLogger(__name__)
+
+GAP_SECONDS = 0.6  # Silence between files so no word straddles two of them
+
+@dataclass
+class _Placement:
+    index: int
+    start: float     # Offset of the file in the batch, seconds
+    duration: float
+
+def _write_wav(path: str, samples: np.ndarray) -> None:
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16)
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes(pcm.tobytes())
+
+def transcribe_batched(
+    backend: ASRBackend,
+    audio_paths: Sequence[str],
+    max_batch_seconds: float = 600.0,
+    language: str = "en",
+    workdir: Optional[str] = None
+) -> List[Optional[List[Dict[str, float]]]]:
+    """
+    Transcribe `audio_paths` in as few ASR calls as possible.
+
+    Args:
+        backend: Loaded ASR backend
+        audio_paths: Files to transcribe
+        max_batch_seconds: Upper bound on audio per call (bounds memory)
+        language: Spoken language
+        workdir: Where the temporary batch WAV is written
+
+    Returns:
+        Per input file: word timings relative to that file, or None if it could not be decoded
+    """
+    results: List[Optional[List[Dict[str, float]]]] = [None] * len(audio_paths)
+    gap = np.zeros(int(GAP_SECONDS * SAMPLE_RATE), dtype=np.float32)
+
+    batch: List[np.ndarray] = []
+    placements: List[_Placement] = []
+    cursor = 0.0
+
+    def flush() -> None:
+        nonlocal batch, placements, cursor
+        if placements:
+            _transcribe_one_batch(backend, batch, placements, results, language, workdir)
+        batch, placements, cursor = [], [], 0.0
+
+    for index, path in enumerate(audio_paths):
+        samples = decode_mono(path)
+        if samples is None or samples.size == 0:
+            continue
+        duration = samples.size / SAMPLE_RATE
+        if placements and cursor + duration > max_batch_seconds:
+            flush()
+        placements.append(_Placement(index, cursor, duration))
+        batch.extend((samples, gap))
+        cursor += duration + GAP_SECONDS
+    flush()
+    return results
+
+def _transcribe_one_batch(
+    backend: ASRBackend, batch: List[np.ndarray], placements: List[_Placement],
+    results: List[Optional[List[Dict[str, float]]]], language: str, workdir: Optional[str]
+) -> None:
+    fd, wav_path = tempfile.mkstemp(suffix=".wav", prefix="asr_batch_", dir=workdir)
+    os.close(fd)
+    try:
+        _write_wav(wav_path, np.concatenate(batch))
+        words = backend.transcribe(wav_path, language=language)
+    finally:
+        os.remove(wav_path)
+
+    log.debug(f"Batched ASR: {len(placements)} files, "
+              f"{placements[-1].start + placements[-1].duration:.1f}s in one pass")
+
+    for placement in placements:
+        results[placement.index] = []
+    starts = [p.start for p in placements]
+    for word in words:
+        start, end = float(word["start"]), float(word["end"])
+        # Assign by word midpoint, then express relative to the owning file
+        midpoint = (start + end) / 2
+        owner = max(0, np.searchsorted(starts, midpoint, side="right") - 1)
+        placement = placements[owner]
+        local_start = max(0.0, start - placement.start)
+        local_end = min(placement.duration, end - placement.start)
+        if local_end <= local_start:
+            continue
+        results[placement.index].append({"word": word["word"], "start": local_start, "end": local_end})
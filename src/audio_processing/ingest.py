@@ -0,0 +1,127 @@
+"""
+Canonical PCM ingest for TTS output.
+
+Providers return different containers (Speechify WAV, OpenAI MP3). Each TTS
+result is converted exactly once into a canonical WAV - 48 kHz, mono, signed
+16-bit little-endian - whose length in samples is the scene's exact
+duration. Everything downstream (loudness analysis, alignment, ASR, the mixer,
+moviepy) reads that file; the mixer and loudness analysis memory-map its
+sample data directly instead of running a decoder again.
+"""
+import logging
+import os
+import struct
+import subprocess
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+CANONICAL_SAMPLE_RATE = 48000
+CANONICAL_CHANNELS = 1
+CANONICAL_SAMPLE_WIDTH = 2  # s16le
+CANONICAL_SUFFIX = ".pcm.wav"
+
+@dataclass(frozen=True)
+class IngestedAudio:
+    path: str
+    sample_count: int
+    sample_rate: int = CANONICAL_SAMPLE_RATE
+
+    @property
+    def duration(self) -> float:
+        return self.sample_count / self.sample_rate
+
+def _wav_layout(path: str) -> Optional[Tuple[int, int, int, int, int]]:
+    """
+    (channels, sample_rate, sample_width, data_offset, data_bytes) of a PCM WAV.
+
+    Walks the RIFF chunks, so headers with extra chunks (LIST, fact) are fine.
+    Returns None for anything that isn't uncompressed PCM WAV.
+    """
+    try:
+        with open(path, "rb") as f:
+            riff, _, wave_id = struct.unpack("<4sI4s", f.read(12))
+            if riff != b"RIFF" or wave_id != b"WAVE":
+                return None
+            fmt = None
+            while True:
+                header = f.read(8)
+                if len(header) < 8:
+                    return None
+                chunk_id, size = struct.unpack("<4sI", header)
+                if chunk_id == b"fmt ":
+                    fmt = struct.unpack("<HHIIHH", f.read(16))
+                    f.seek(size - 16 + (size & 1), os.SEEK_CUR)
+                elif chunk_id == b"data":
+                    if not fmt or fmt[0] != 1:  # WAVE_FORMAT_PCM
+                        return None
+                    available = os.path.getsize(path) - f.tell()
+                    return fmt[1], fmt[2], fmt[5] // 8, f.tell(), min(size, available)
+                else:
+                    f.seek(size + (size & 1), os.SEEK_CUR)
+    except (OSError, struct.error):
+        return None
+
+def is_canonical(path: str) -> bool:
+    layout = _wav_layout(path)
+    return bool(layout) and layout[:3] == (CANONICAL_CHANNELS, CANONICAL_SAMPLE_RATE, CANONICAL_SAMPLE_WIDTH)
+
+def load_canonical_pcm(path: str) -> Optional[np.memmap]:
+    """
+    Memory-map the samples of a canonical WAV as int16 (no decode, no copy).
+
+    Returns:
+        The sample array, or None if `path` is not in the canonical format
+    """
+    layout = _wav_layout(path)
+    if not layout or layout[:3] != (CANONICAL_CHANNELS, CANONICAL_SAMPLE_RATE, CANONICAL_SAMPLE_WIDTH):
+        return None
+    _, _, _, offset, data_bytes = layout
+    count = data_bytes // CANONICAL_SAMPLE_WIDTH
+    if count == 0:
+        return np.zeros(0, dtype="<i2")
+    return np.memmap(path, dtype="<i2", mode="r", offset=offset, shape=(count,))
+
+def ingest_audio(src_path: str, dest_path: Optional[str] = None, ffmpeg_binary: str = "ffmpeg") -> Optional[IngestedAudio]:
+    """
+    Convert `src_path` to the canonical PCM WAV once.
+
+    Args:
+        src_path: Provider output in any format ffmpeg reads
+        dest_path: Canonical file to write (default: next to the source with CANONICAL_SUFFIX)
+        ffmpeg_binary: ffmpeg used for the conversion
+
+    Returns:
+        The ingested file with its exact sample count, or None if conversion failed
+    """
+    if is_canonical(src_path):
+        layout = _wav_layout(src_path)
+        return IngestedAudio(src_path, layout[4] // CANONICAL_SAMPLE_WIDTH)
+
+    dest_path = dest_path or os.path.splitext(src_path)[0] + CANONICAL_SUFFIX
+    tmp_path = f"{dest_path}.tmp.wav"
+    try:
+        subprocess.run(
+            [ffmpeg_binary, "-hide_banner", "-loglevel", "error", "-y", "-i", src_path, "-vn",
+             "-map_metadata", "-1", "-fflags", "+bitexact", "-flags:a", "+bitexact",
+             "-ac", str(CANONICAL_CHANNELS), "-ar", str(CANONICAL_SAMPLE_RATE),
+             "-c:a", "pcm_s16le", tmp_path],
+            capture_output=True, timeout=120, check=True
+        )
+        os.replace(tmp_path, dest_path)
+    except (subprocess.SubprocessError, OSError) as e:
+        log.warning(f"⚠️ Audio ingest failed for {os.path.basename(src_path)}: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return None
+
+    layout = _wav_layout(dest_path)
+    if not layout or layout[4] == 0:
+        log.warning(f"⚠️ Audio ingest produced no samples for {os.path.basename(src_path)}")
+        return None
+    return IngestedAudio(dest_path, layout[4] // CANONICAL_SAMPLE_WIDTH)
@@ -0,0 +1,206 @@
+"""
+Loudness analysis of audio assets, computed once per file content.
+
+For every narration segment and music track we measure integrated loudness
+(EBU R128, via ffmpeg's loudnorm analysis), true peak, and a 10ms RMS
+envelope. Profiles are stored in a DiskCache keyed by the SHA-256 of the file
+bytes, so a TTS segment served from cache or a music track reused across
+videos is never analysed twice, and the mixer only reads numbers: it levels
+Speechify and OpenAI narration to one target and normalizes the music bed
+without scanning the file again.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from audio_processing.ingest import CANONICAL_SAMPLE_RATE, load_canonical_pcm
+from cache import DiskCache, make_cache_key
+
+log = logging.getLogger(__name__)
+
+ANALYSIS_VERSION = 1
+ANALYSIS_SAMPLE_RATE = CANONICAL_SAMPLE_RATE
+ENVELOPE_FRAME_SECONDS = 0.01
+MAX_NORMALIZATION_GAIN_DB = 12.0
+TRUE_PEAK_CEILING_DB = -1.0
+_HASH_CHUNK = 1024 * 1024
+
+@dataclass
+class LoudnessProfile:
+    integrated_lufs: float
+    true_peak_db: float
+    duration: float
+    envelope_frame_seconds: float = ENVELOPE_FRAME_SECONDS
+    rms_envelope_db: List[float] = field(default_factory=list)
+
+    def envelope(self) -> np.ndarray:
+        return np.asarray(self.rms_envelope_db, dtype=np.float32)
+
+# --- Signal helpers ---
+def decode_pcm(
+    path: str, sample_rate: int = ANALYSIS_SAMPLE_RATE, channels: int = 1, ffmpeg_binary: str = "ffmpeg"
+) -> Optional[np.ndarray]:
+    """
+    Decode any audio file to float32 PCM.
+
+    Canonical ingested WAVs (see ingest.py) are memory-mapped instead of decoded
+    when mono output at the canonical rate is requested.
+
+    Returns:
+        Array of shape (samples, channels), or None if ffmpeg could not decode it
+    """
+    if channels == 1 and sample_rate == CANONICAL_SAMPLE_RATE:
+        pcm = load_canonical_pcm(path)
+        if pcm is not None:
+            return (pcm.astype(np.float32) / 32768.0).reshape(-1, 1)
+    try:
+        result = subprocess.run(
+            [ffmpeg_binary, "-hide_banner", "-loglevel", "error", "-i", path, "-vn",
+             "-ac", str(channels), "-ar", str(sample_rate), "-f", "f32le", "-"],
+            capture_output=True, timeout=300, check=True
+        )
+    except (subprocess.SubprocessError, OSError) as e:
+        log.debug(f"Audio decode failed for {path}: {e}")
+        return None
+    return np.frombuffer(result.stdout, dtype=np.float32).reshape(-1, channels)
+
+def frame_levels_db(samples: np.ndarray, sample_rate: int, frame_seconds: float = ENVELOPE_FRAME_SECONDS) -> np.ndarray:
+    """RMS level in dBFS of consecutive frames of mono `samples` (last frame zero-padded)."""
+    frame = max(1, int(sample_rate * frame_seconds))
+    n_frames = -(-samples.size // frame)
+    padded = np.zeros(n_frames * frame, dtype=np.float32)
+    padded[:samples.size] = samples
+    rms = np.sqrt(np.mean(padded.reshape(n_frames, frame) ** 2, axis=1))
+    return (20 * np.log10(rms + 1e-9)).astype(np.float32)
+
+def normalization_gain_db(
+    profile: LoudnessProfile, target_lufs: float,
+    max_gain_db: float = MAX_NORMALIZATION_GAIN_DB, peak_ceiling_db: float = TRUE_PEAK_CEILING_DB
+) -> float:
+    """Gain that brings `profile` to `target_lufs`, bounded and kept under the true-peak ceiling."""
+    gain = float(np.clip(target_lufs - profile.integrated_lufs, -max_gain_db, max_gain_db))
+    return min(gain, peak_ceiling_db - profile.true_peak_db)
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _ebur128_stats(path: str, ffmpeg_binary: str) -> Optional[Tuple[float, float]]:
+    """(integrated LUFS, true peak dBTP) from ffmpeg's loudnorm analysis pass."""
+    try:
+        result = subprocess.run(
+            [ffmpeg_binary, "-hide_banner", "-nostats", "-i", path, "-vn",
+             "-af", "loudnorm=print_format=json", "-f", "null", "-"],
+            capture_output=True, text=True, timeout=300, check=True
+        )
+        match = re.search(r"\{[^{}]*\"input_i\"[^{}]*\}", result.stderr)
+        stats = json.loads(match.group(0)) if match else {}
+        return float(stats["input_i"]), float(stats["input_tp"])
+    except (subprocess.SubprocessError, OSError, ValueError, KeyError) as e:
+        log.debug(f"loudnorm analysis failed for {path}: {e}")
+        return None
+
+def measure_loudness(path: str, ffmpeg_binary: str = "ffmpeg") -> Optional[LoudnessProfile]:
+    """Analyse one file (two ffmpeg passes). Returns None if it cannot be decoded."""
+    samples = decode_pcm(path, ANALYSIS_SAMPLE_RATE, 1, ffmpeg_binary)
+    if samples is None or samples.size == 0:
+        return None
+    mono = samples[:, 0]
+    levels = frame_levels_db(mono, ANALYSIS_SAMPLE_RATE)
+
+    stats = _ebur128_stats(path, ffmpeg_binary)
+    if stats and np.isfinite(stats[0]) and np.isfinite(stats[1]):
+        integrated, true_peak = stats
+    else:
+        # Ungated RMS and sample peak are close enough for speech and music beds
+        integrated = float(10 * np.log10(np.mean(mono ** 2) + 1e-12) - 0.691)
+        true_peak = float(20 * np.log10(np.max(np.abs(mono)) + 1e-9))
+
+    return LoudnessProfile(
+        integrated_lufs=round(integrated, 2),
+        true_peak_db=round(true_peak, 2),
+        duration=mono.size / ANALYSIS_SAMPLE_RATE,
+        rms_envelope_db=[round(float(level), 1) for level in levels]
+    )
+
+class LoudnessAnalyzer:
+    """Loudness profiles cached by file content hash."""
+
+    def __init__(self, cache: DiskCache, ffmpeg_binary: str = "ffmpeg", max_workers: int = 4):
+        """
+        Args:
+            cache: Where profiles are stored (JSON entries keyed by content hash)
+            ffmpeg_binary: ffmpeg used for decoding and loudness measurement
+            max_workers: Parallel ffmpeg analyses in analyse_many
+        """
+        self.cache = cache
+        self.ffmpeg_binary = ffmpeg_binary
+        self.max_workers = max_workers
+        self.stats = {"analysed": 0, "cached": 0}
+        # path -> (size, mtime, content hash): skips rehashing unchanged files in-process
+        self._hashes: Dict[str, Tuple[int, float, str]] = {}
+        self._lock = threading.Lock()
+
+    def _content_key(self, path: str) -> str:
+        st = os.stat(path)
+        with self._lock:
+            known = self._hashes.get(path)
+        if known and known[:2] == (st.st_size, st.st_mtime):
+            content_hash = known[2]
+        else:
+            content_hash = _file_sha256(path)
+            with self._lock:
+                self._hashes[path] = (st.st_size, st.st_mtime, content_hash)
+        return make_cache_key("loudness", ANALYSIS_VERSION, content_hash)
+
+    def analyse(self, path: str) -> Optional[LoudnessProfile]:
+        """Profile for `path`, measured on first sight of its content and cached after."""
+        try:
+            key = self._content_key(path)
+        except OSError as e:
+            log.debug(f"Cannot hash {path} for loudness analysis: {e}")
+            return None
+
+        cached = self.cache.get(key, ".json")
+        if cached:
+            try:
+                with open(cached, "r", encoding="utf-8") as f:
+                    profile = LoudnessProfile(**json.load(f))
+                with self._lock:
+                    self.stats["cached"] += 1
+                return profile
+            except (OSError, TypeError, json.JSONDecodeError):
+                self.cache.delete(key, ".json")
+
+        profile = measure_loudness(path, self.ffmpeg_binary)
+        if profile is None:
+            return None
+        try:
+            self.cache.put_bytes(key, json.dumps(asdict(profile)).encode("utf-8"), ".json")
+        except OSError as e:
+            log.debug(f"Could not store loudness profile for {path}: {e}")
+        with self._lock:
+            self.stats["analysed"] += 1
+        return profile
+
+    def analyse_many(self, paths: Sequence[str]) -> List[Optional[LoudnessProfile]]:
+        """Profiles for `paths` in order; misses are measured in parallel."""
+        if len(paths) <= 1:
+            return [self.analyse(path) for path in paths]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            return list(pool.map(self.analyse, paths))
+
+    def summary(self) -> str:
+        return f"loudness: {self.stats['analysed']} analysed, {self.stats['cached']} from cache"
@@ -0,0 +1,181 @@
+"""
+Final soundtrack mixing in numpy.
+
+Narration segments and the music bed are each decoded once by ffmpeg into
+float32 PCM at a canonical sample rate; looping/trimming, peak normalization
+and voice-driven ducking are then plain array operations, and the result is
+written as one WAV the renderers only have to mux.
+
+With loudness profiles (see loudness.py) every narration segment is levelled
+to one target loudness and the music is normalized from its stored
+loudness/true peak, all as per-sample gains applied in a single pass; without
+them the music bed is peak-normalized from the decoded samples.
+
+Ducking follows the narration's envelope: the music sits at the job's ducking
+level under speech and rises by MUSIC_GAP_BOOST_DB in pauses, with smooth
+ramps that start slightly before the voice (the whole track is known up
+front, so the "sidechain" can look ahead). There is no randomness or dither,
+so the same inputs always produce the same bytes.
+"""
+import logging
+import os
+import time
+import wave
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from config import NARRATION_TARGET_LUFS
+from audio_processing.ingest import CANONICAL_SAMPLE_RATE
+from audio_processing.loudness import (
+    ENVELOPE_FRAME_SECONDS, LoudnessProfile, decode_pcm, frame_levels_db, normalization_gain_db
+)
+
+log = logging.getLogger(__name__)
+
+MIX_SAMPLE_RATE = CANONICAL_SAMPLE_RATE  # Ingested narration needs no resampling
+MIX_CHANNELS = 2
+VOICE_THRESHOLD_DB = -40.0     # Narration frames above this count as speech
+DUCK_HOLD_SECONDS = 0.25       # Bridge gaps between words so music doesn't pump
+DUCK_RAMP_SECONDS = 0.3        # Length of the fade down/up around speech
+MUSIC_GAP_BOOST_DB = 6.0       # Music level in pauses, relative to under-voice level
+PEAK_CEILING = 0.98
+
+def _ducking_envelope(levels_db: np.ndarray, centers: np.ndarray, length: int) -> np.ndarray:
+    """Per-sample speech presence in [0, 1] from frame levels at sample positions `centers`."""
+    active = (levels_db > VOICE_THRESHOLD_DB).astype(np.float32)
+    hold = int(DUCK_HOLD_SECONDS / ENVELOPE_FRAME_SECONDS)
+    active = (np.convolve(active, np.ones(2 * hold + 1), mode="same") > 0).astype(np.float32)
+    ramp = max(1, int(DUCK_RAMP_SECONDS / ENVELOPE_FRAME_SECONDS))
+    envelope = np.clip(np.convolve(active, np.ones(ramp) / ramp, mode="same"), 0.0, 1.0)
+    return np.interp(np.arange(length), centers, envelope).astype(np.float32)
+
+def voice_envelope(voice: np.ndarray, sample_rate: int = MIX_SAMPLE_RATE) -> np.ndarray:
+    """
+    Per-sample speech presence in [0, 1], smoothed into ramps.
+
+    Args:
+        voice: Mono narration, shape (samples,)
+    """
+    levels = frame_levels_db(voice, sample_rate)
+    frame = max(1, int(sample_rate * ENVELOPE_FRAME_SECONDS))
+    return _ducking_envelope(levels, (np.arange(levels.size) + 0.5) * frame, voice.size)
+
+def _profile_envelope(
+    profiles: Sequence[LoudnessProfile], offsets: Sequence[int], gains_db: Sequence[float],
+    length: int, sample_rate: int
+) -> np.ndarray:
+    """Ducking envelope from the stored RMS envelopes of consecutive narration segments."""
+    levels, centers = [], []
+    for profile, offset, gain_db in zip(profiles, offsets, gains_db):
+        segment_levels = profile.envelope() + gain_db
+        frame = profile.envelope_frame_seconds * sample_rate
+        levels.append(segment_levels)
+        centers.append(offset + (np.arange(segment_levels.size) + 0.5) * frame)
+    return _ducking_envelope(np.concatenate(levels), np.concatenate(centers), length)
+
+def fit_to_length(music: np.ndarray, length: int) -> np.ndarray:
+    """Loop or trim `music` (samples, channels) to exactly `length` samples."""
+    if music.shape[0] >= length:
+        return music[:length]
+    repeats = -(-length // music.shape[0])
+    return np.tile(music, (repeats, 1))[:length]
+
+def _write_wav(path: str, samples: np.ndarray, sample_rate: int) -> None:
+    pcm = np.round(np.clip(samples, -1.0, 1.0) * 32767).astype("<i2")
+    with wave.open(path, "wb") as f:
+        f.setnchannels(samples.shape[1])
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(pcm.tobytes())
+
+def mix_narration_with_music(
+    narration_paths: Sequence[str],
+    music_path: Optional[str],
+    output_path: str,
+    ducking_level: float = 0.15,
+    sample_rate: int = MIX_SAMPLE_RATE,
+    ffmpeg_binary: str = "ffmpeg",
+    narration_profiles: Optional[Sequence[Optional[LoudnessProfile]]] = None,
+    music_profile: Optional[LoudnessProfile] = None,
+    narration_target_lufs: float = NARRATION_TARGET_LUFS
+) -> Optional[str]:
+    """
+    Concatenate narration segments, mix the ducked music bed under them and write a WAV.
+
+    Args:
+        narration_paths: Narration files in timeline order
+        music_path: Optional background music (looped or trimmed to the narration)
+        output_path: Destination WAV
+        ducking_level: Music gain under speech, relative to a normalized bed
+        sample_rate: Output sample rate
+        narration_profiles: Loudness profiles per narration path; when all are
+            present, segments are levelled to `narration_target_lufs`
+        music_profile: Loudness profile of the music; normalizes the bed to the
+            narration target without scanning the samples
+
+    Returns:
+        `output_path`, or None if no narration could be decoded
+    """
+    started = time.perf_counter()
+    profiles = list(narration_profiles or [None] * len(narration_paths))
+    segments: List[np.ndarray] = []
+    segment_profiles: List[Optional[LoudnessProfile]] = []
+    for path, profile in zip(narration_paths, profiles):
+        samples = decode_pcm(path, sample_rate, 1, ffmpeg_binary)
+        if samples is None:
+            log.warning(f"Could not decode narration {path} - skipped in mix")
+            continue
+        segments.append(samples[:, 0])
+        segment_profiles.append(profile)
+    if not segments:
+        return None
+    voice = np.concatenate(segments)
+    offsets = np.cumsum([0] + [segment.size for segment in segments[:-1]])
+
+    levelled = all(segment_profiles)
+    if levelled:
+        gains_db = [normalization_gain_db(p, narration_target_lufs) for p in segment_profiles]
+        voice_gain = np.repeat(
+            (10 ** (np.asarray(gains_db) / 20)).astype(np.float32), [s.size for s in segments]
+        )
+        envelope = _profile_envelope(segment_profiles, offsets, gains_db, voice.size, sample_rate)
+    else:
+        voice_gain = np.float32(1.0)
+        envelope = None
+
+    music = None
+    if music_path and os.path.exists(music_path):
+        music = decode_pcm(music_path, sample_rate, MIX_CHANNELS, ffmpeg_binary)
+        if music is None or music.size == 0:
+            log.warning(f"Could not decode background music {music_path}. Mixing narration only.")
+            music = None
+    else:
+        log.warning("Background music path not found or not provided. Skipping audio mix.")
+
+    if music is not None:
+        bed = fit_to_length(music, voice.size)
+        if music_profile:
+            bed_gain = 10 ** (normalization_gain_db(music_profile, narration_target_lufs) / 20)
+        else:
+            peak = float(np.max(np.abs(bed)))
+            bed_gain = 1.0 / peak if peak > 0 else 1.0
+        if envelope is None:
+            envelope = voice_envelope(voice, sample_rate)
+        gap_level = min(1.0, ducking_level * 10 ** (MUSIC_GAP_BOOST_DB / 20))
+        music_gain = bed_gain * (gap_level + (ducking_level - gap_level) * envelope)
+        mix = (voice * voice_gain)[:, None] + bed * music_gain[:, None].astype(np.float32)
+    else:
+        mix = np.repeat((voice * voice_gain)[:, None], MIX_CHANNELS, axis=1)
+
+    peak = float(np.max(np.abs(mix)))
+    if peak > PEAK_CEILING:
+        mix *= PEAK_CEILING / peak
+
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    _write_wav(output_path, mix, sample_rate)
+    log.info(f"🎚️ Mixed {voice.size / sample_rate:.1f}s soundtrack "
+             f"({len(segments)} narration segments{', levelled' if levelled else ''}"
+             f"{', ducked music' if music is not None else ''}) "
+             f"in {time.perf_counter() - started:.2f}s")
+    return output_path
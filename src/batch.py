@@ -0,0 +1,244 @@
+"""
+Batch Render Mode - many plan files, one process, shared resource budget.
+
+Plans matching a directory or glob are rendered concurrently on a small pool
+of job threads. Each job gets an isolated workspace under TEMP_ASSETS_DIR, so
+TTS files, downloads, mezzanines and mixes of different jobs never collide;
+the on-disk TTS/media/loudness caches stay shared. A ResourceScheduler caps
+what running jobs may hold at once:
+
+    CPU slots  - encoder processes across all renders
+    RAM (GB)   - estimated peak of the TTS/ASR phase and of each render
+    network    - the process-wide HTTP client's concurrency limit
+
+At the end the per-job status and the batch throughput (videos/hour) are
+logged and written as a JSON report next to the videos.
+"""
+# --- Standard Library Imports ---
+import asyncio
+import glob
+import json
+import logging
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+# --- Third-Party Imports ---
+from openai import OpenAI
+
+# --- Local Application Imports ---
+import config
+from http_client import get_http_client
+from models import VideoPlan
+from resource_monitor import get_resource_monitor
+from resource_scheduler import ResourceScheduler
+from services import AudioService, GenerativeAssemblyService, MediaService
+from utils import sanitize_filename
+from video_processing.editor import VideoEditor
+from video_processing.parallel_renderer import SEGMENT_RAM_ESTIMATE_GB
+from video_processing.render_plan import PROFILE_FULL, RenderProfile
+
+log = logging.getLogger(__name__)
+
+STATUS_OK = "ok"
+STATUS_FAILED = "failed"
+STATUS_SKIPPED = "skipped"
+
+def find_plan_files(pattern: str) -> List[str]:
+    """Plan JSONs in a directory, or matching a glob, sorted by path."""
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, "*.json")
+    return sorted(path for path in glob.glob(pattern) if os.path.isfile(path))
+
+# --- Resource Scheduling ---
+def default_ram_budget_gb() -> float:
+    """80% of system RAM, from the shared resource monitor."""
+    return get_resource_monitor().latest().total_ram_gb * 0.8
+
+# --- Batch Runner ---
+@dataclass
+class BatchJobResult:
+    plan_path: str
+    status: str = STATUS_FAILED
+    title: Optional[str] = None
+    output_path: Optional[str] = None
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+class BatchRunner:
+    """Renders a list of generative plan files under one ResourceScheduler."""
+
+    def __init__(
+        self,
+        openai_client: OpenAI,
+        speechify_client: Optional[Any],
+        persona: Dict[str, Any],
+        render_backend: Optional[str] = None,
+        profile: RenderProfile = PROFILE_FULL,
+        max_jobs: int = config.BATCH_JOBS,
+        cpu_slots: int = config.BATCH_CPU_SLOTS,
+        ram_gb: float = config.BATCH_RAM_GB,
+        net_concurrency: int = config.BATCH_NET_CONCURRENCY,
+        keep_workspaces: bool = False
+    ):
+        """
+        Args:
+            openai_client: Shared by every job (TTS, ASR)
+            speechify_client: Shared Speechify client, if configured
+            persona: Brand persona applied to every plan
+            render_backend: Backend override (default: RENDER_BACKEND)
+            profile: Render profile of every job
+            max_jobs: Jobs in flight at once
+            cpu_slots: Encoder slots across all renders (0 = one per core)
+            ram_gb: RAM budget across all jobs (0 = 80% of system RAM)
+            net_concurrency: Concurrent HTTP requests across all jobs
+            keep_workspaces: Leave each job's workspace on disk for inspection
+        """
+        self.openai_client = openai_client
+        self.speechify_client = speechify_client
+        self.persona = persona
+        self.render_backend = render_backend
+        self.profile = profile
+        self.max_jobs = max(1, max_jobs)
+        self.scheduler = ResourceScheduler(cpu_slots or os.cpu_count() or 1, ram_gb or default_ram_budget_gb())
+        self.keep_workspaces = keep_workspaces
+        # First caller sets the limits of the process-wide client, so this must precede any MediaService
+        self.http = get_http_client(config.HTTP_MAX_CONNECTIONS, config.HTTP_MAX_PER_HOST, net_concurrency)
+        self.batch_dir = os.path.join(
+            config.TEMP_ASSETS_DIR, f"batch-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        )
+
+    def _render_slots(self) -> int:
+        """Encoder slots one render asks for: an even share of the budget."""
+        return max(1, self.scheduler.cpu_slots // min(self.max_jobs, self.scheduler.cpu_slots))
+
+    def run(self, plan_paths: List[str]) -> List[BatchJobResult]:
+        """Render every plan; returns one result per plan, in input order."""
+        log.info(f"🚀 Batch of {len(plan_paths)} plans: {self.max_jobs} concurrent jobs, "
+                 f"{self.scheduler.cpu_slots} CPU slots, {self.scheduler.ram_gb:.1f}GB RAM, "
+                 f"{self.http.max_concurrency} concurrent requests")
+        with ThreadPoolExecutor(max_workers=self.max_jobs, thread_name_prefix="batch-job") as pool:
+            results = list(pool.map(self._run_job, range(len(plan_paths)), plan_paths))
+        if not self.keep_workspaces:
+            shutil.rmtree(self.batch_dir, ignore_errors=True)
+        return results
+
+    def _run_job(self, index: int, plan_path: str) -> BatchJobResult:
+        result = BatchJobResult(plan_path=plan_path)
+        started = time.monotonic()
+        workspace = os.path.join(
+            self.batch_dir, f"{index:03d}_{sanitize_filename(os.path.splitext(os.path.basename(plan_path))[0])}"
+        )
+        try:
+            with open(plan_path, "r") as f:
+                data = json.load(f)
+            if not ("video_title" in data and "sections" in data):
+                result.status = STATUS_SKIPPED
+                result.error = "not a generative plan (VideoPlan)"
+                log.warning(f"⏭️ Skipping {plan_path}: {result.error}")
+                return result
+
+            plan = VideoPlan.parse_obj(data)
+            result.title = plan.video_title
+            os.makedirs(workspace, exist_ok=True)
+            result.output_path = self.render_plan(plan, workspace)
+            if result.output_path:
+                result.status = STATUS_OK
+            else:
+                result.error = "render produced no output"
+        except Exception as e:
+            result.error = str(e) or type(e).__name__
+            log.error(f"❌ Batch job {plan_path} failed: {result.error}")
+        finally:
+            result.seconds = round(time.monotonic() - started, 1)
+            if not self.keep_workspaces:
+                shutil.rmtree(workspace, ignore_errors=True)
+        log.info(f"{'✅' if result.status == STATUS_OK else '⚠️'} [{index + 1}] {result.status}: "
+                 f"{result.title or plan_path} in {result.seconds:.1f}s")
+        return result
+
+    def render_plan(
+        self, plan: VideoPlan, workspace: str, checkpoint: Optional[Callable[[], None]] = None,
+        profile: Optional[RenderProfile] = None, persona: Optional[Dict[str, Any]] = None
+    ) -> Optional[str]:
+        """
+        TTS + downloads, then the render, each under its own reservation.
+
+        Args:
+            plan: Generative plan to render
+            workspace: Scratch directory of this job
+            checkpoint: Called before each phase; may raise to abandon the job
+            profile: Render profile override for this plan (default: the runner's)
+            persona: Brand persona override for this plan (default: the runner's)
+
+        Returns:
+            Path to the rendered video, or None if nothing could be assembled
+        """
+        checkpoint = checkpoint or (lambda: None)
+        profile = profile or self.profile
+        persona = persona or self.persona
+        label = f"'{plan.video_title}'"
+        render_slots = self._render_slots()
+        # A placeholder clip is not a result: let the job fail (and be retried) instead
+        editor = VideoEditor(profile=profile, emergency_fallback=False)
+        audio_service = AudioService(self.openai_client, self.speechify_client, workspace_dir=workspace)
+        media_service = MediaService(render_profile=profile, workspace_dir=workspace)
+        assembly_service = GenerativeAssemblyService(
+            editor, media_service, audio_service, self.render_backend,
+            workspace_dir=workspace, render_workers=render_slots
+        )
+
+        async def prepare():
+            return await asyncio.gather(
+                audio_service.generate_and_process_audio(plan, persona),
+                media_service.get_assets_for_plan(plan)
+            )
+
+        try:
+            # One slot covers ASR/loudness/mezzanine work; network is capped by the shared client
+            with self.scheduler.reserve(1, config.BATCH_PREPARE_RAM_GB, label):
+                checkpoint()
+                processed_audio, media_assets = asyncio.run(prepare())
+            checkpoint()
+            with self.scheduler.reserve(render_slots, render_slots * SEGMENT_RAM_ESTIMATE_GB, label):
+                return asyncio.run(assembly_service.assemble_video(plan, processed_audio, media_assets))
+        finally:
+            if media_service.mezzanine:
+                media_service.mezzanine.shutdown(wait=False)
+
+# --- Reporting ---
+def report_batch(results: List[BatchJobResult], elapsed: float, scheduler: ResourceScheduler) -> Optional[str]:
+    """Log per-job status and throughput; write the JSON report. Returns its path."""
+    done = [r for r in results if r.status == STATUS_OK]
+    failed = [r for r in results if r.status == STATUS_FAILED]
+    per_hour = len(done) / elapsed * 3600 if elapsed > 0 else 0.0
+
+    log.info("📋 Batch report:")
+    for r in results:
+        log.info(f"  {r.status:<7} {r.seconds:>7.1f}s  {r.title or os.path.basename(r.plan_path)}"
+                 + (f" -> {r.output_path}" if r.output_path else "")
+                 + (f" ({r.error})" if r.error else ""))
+    log.info(f"📊 {len(done)} rendered, {len(failed)} failed, {len(results) - len(done) - len(failed)} skipped "
+             f"in {elapsed:.1f}s — {per_hour:.1f} videos/hour")
+    log.info(f"📊 {scheduler.summary()}")
+
+    report = {
+        "finished_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "elapsed_seconds": round(elapsed, 1),
+        "videos_per_hour": round(per_hour, 2),
+        "scheduler": {"cpu_slots": scheduler.cpu_slots, "ram_gb": round(scheduler.ram_gb, 1), **scheduler.stats},
+        "jobs": [asdict(r) for r in results],
+    }
+    report_path = os.path.join(config.OUTPUT_DIR, f"batch_report_{time.strftime('%Y%m%d-%H%M%S')}.json")
+    try:
+        os.makedirs(config.OUTPUT_DIR, exist_ok=True)
+        with open(report_path, "w") as f:
+            json.dump(report, f, indent=2)
+    except OSError as e:
+        log.warning(f"⚠️ Could not write batch report: {e}")
+        return None
+    log.info(f"Batch report saved to '{report_path}'")
+    return report_path
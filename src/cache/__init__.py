@@ -0,0 +1,15 @@
+"""
+Cache Package Initializer
+
+Persistent caches that survive between runs (unlike TEMP_ASSETS_DIR, which is
+wiped on every start).
+"""
+from .disk_cache import DiskCache, make_cache_key
+from .media_cache import MediaCache, SearchCache
+
+__all__ = [
+    "DiskCache",
+    "MediaCache",
+    "SearchCache",
+    "make_cache_key",
+]
@@ -0,0 +1,239 @@
+"""
+Content-addressed on-disk blob cache with size-based LRU eviction.
+
+Entries are plain files addressed by a hex key (usually a SHA-256 of the
+inputs that produced them), sharded into two-character subdirectories.
+Writes are atomic (temp file + os.replace), recency is tracked through file
+mtimes so several processes can share one cache directory without a central
+index, and hit/miss counters are kept per instance. Temp files left behind by
+interrupted writers are swept once they are older than STALE_TEMP_SECONDS.
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional
+
+log = logging.getLogger(__name__)
+
+META_SUFFIX = ".meta.json"
+STALE_TEMP_SECONDS = 24 * 3600  # In-progress files untouched this long belong to dead writers
+
+def make_cache_key(*parts: Any) -> str:
+    """Stable SHA-256 key over JSON-serializable parts."""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class DiskCache:
+    """
+    Size-bounded, content-addressed file cache.
+
+    Attributes:
+        stats: Counters for hits, misses, writes, evictions and swept temp files
+    """
+
+    def __init__(self, root: str, max_bytes: int, name: str = "cache"):
+        """
+        Args:
+            root: Directory holding the cache (created if missing)
+            max_bytes: Total size budget; least recently used entries are evicted beyond it
+            name: Label used in log messages
+        """
+        self.root = root
+        self.max_bytes = max_bytes
+        self.name = name
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0, "temp_swept": 0}
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    # --- Paths ---
+    def path_for(self, key: str, suffix: str = "") -> str:
+        return os.path.join(self.root, key[:2], f"{key}{suffix}")
+
+    # --- Reads ---
+    def get(self, key: str, suffix: str = "") -> Optional[str]:
+        """
+        Return the cached file path for `key`, or None on a miss.
+        A hit refreshes the entry's recency.
+        """
+        path = self.path_for(key, suffix)
+        if os.path.isfile(path):
+            try:
+                os.utime(path, None)
+            except OSError:
+                pass
+            with self._lock:
+                self.stats["hits"] += 1
+            return path
+        self.count_miss()
+        return None
+
+    def count_miss(self) -> None:
+        """Record a miss decided by the caller (e.g. an entry past its TTL)."""
+        with self._lock:
+            self.stats["misses"] += 1
+
+    def get_metadata(self, key: str, suffix: str = "") -> Optional[Dict[str, Any]]:
+        meta_path = self.path_for(key, suffix) + META_SUFFIX
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def materialize(self, key: str, dest_path: str, suffix: str = "") -> bool:
+        """
+        Place the cached file for `key` at `dest_path` (hardlink, else copy).
+
+        Returns:
+            True on a hit, False on a miss
+        """
+        cached = self.get(key, suffix)
+        if not cached:
+            return False
+        os.makedirs(os.path.dirname(dest_path) or ".", exist_ok=True)
+        tmp_path = f"{dest_path}.tmp"
+        try:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            try:
+                os.link(cached, tmp_path)
+            except OSError:
+                shutil.copyfile(cached, tmp_path)
+            os.replace(tmp_path, dest_path)
+            return True
+        except OSError as e:
+            log.warning(f"[{self.name}] Could not materialize cache entry {key[:12]}: {e}")
+            return False
+
+    # --- Writes ---
+    def _atomic_write_json(self, path: str, data: Dict[str, Any]) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    def put_file(self, key: str, src_path: str, suffix: str = "",
+                 metadata: Optional[Dict[str, Any]] = None, move: bool = False) -> str:
+        """
+        Store a copy of `src_path` (or move it) under `key` atomically.
+
+        Returns:
+            Path of the cached entry
+        """
+        dest = self.path_for(key, suffix)
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(dest), suffix=".tmp")
+        os.close(fd)
+        try:
+            if move:
+                shutil.move(src_path, tmp_path)
+            else:
+                shutil.copyfile(src_path, tmp_path)
+            os.replace(tmp_path, dest)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        if metadata is not None:
+            self._atomic_write_json(dest + META_SUFFIX, metadata)
+
+        with self._lock:
+            self.stats["writes"] += 1
+        self.evict_if_needed()
+        return dest
+
+    def put_bytes(self, key: str, data: bytes, suffix: str = "",
+                  metadata: Optional[Dict[str, Any]] = None) -> str:
+        dest = self.path_for(key, suffix)
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(dest), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, dest)
+        if metadata is not None:
+            self._atomic_write_json(dest + META_SUFFIX, metadata)
+        with self._lock:
+            self.stats["writes"] += 1
+        self.evict_if_needed()
+        return dest
+
+    def delete(self, key: str, suffix: str = "") -> None:
+        path = self.path_for(key, suffix)
+        for p in (path, path + META_SUFFIX):
+            try:
+                os.remove(p)
+            except FileNotFoundError:
+                pass
+
+    # --- Eviction ---
+    def evict_if_needed(self) -> int:
+        """
+        Delete least recently used entries until the cache fits `max_bytes`,
+        sweeping stale temp files on the way.
+
+        Returns:
+            Number of entries evicted
+        """
+        entries = []
+        total = 0
+        stale_before = time.time() - STALE_TEMP_SECONDS
+        swept = 0
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            # Only shard directories hold entries; the root only holds in-progress
+            # downloads (.download/.part) and lock dirs are skipped
+            dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+            for filename in filenames:
+                if filename.endswith(META_SUFFIX):
+                    continue
+                path = os.path.join(dirpath, filename)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                if dirpath == self.root or filename.endswith(".tmp"):
+                    if st.st_mtime < stale_before:
+                        try:
+                            os.remove(path)
+                            swept += 1
+                        except OSError:
+                            pass
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+                total += st.st_size
+
+        if swept:
+            with self._lock:
+                self.stats["temp_swept"] += swept
+            log.debug(f"[{self.name}] Swept {swept} stale temp files")
+
+        if total <= self.max_bytes:
+            return 0
+
+        evicted = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            for p in (path, path + META_SUFFIX):
+                try:
+                    os.remove(p)
+                except FileNotFoundError:
+                    pass
+            total -= size
+            evicted += 1
+
+        with self._lock:
+            self.stats["evictions"] += evicted
+        log.debug(f"[{self.name}] Evicted {evicted} entries to stay under {self.max_bytes / 1024**2:.0f}MB")
+        return evicted
+
+    def summary(self) -> str:
+        s = self.stats
+        lookups = s["hits"] + s["misses"]
+        rate = (s["hits"] / lookups * 100) if lookups else 0.0
+        return f"{self.name}: {s['hits']} hits / {s['misses']} misses ({rate:.0f}% hit rate), {s['evictions']} evicted"
@@ -0,0 +1,199 @@
+"""
+Stock media caches shared by MediaService across scenes, jobs and runs.
+
+SearchCache stores provider search responses with a TTL. MediaCache stores
+downloaded files keyed by (provider, asset id, rendition) together with their
+probed metadata, under a disk quota with LRU eviction. Concurrent requests for
+the same asset are single-flighted: within a process through a shared future,
+across processes through a lock file, so each asset is downloaded once.
+Downloads are probed before they enter the cache, so truncated or corrupt
+files are rejected here rather than failing later inside the editor.
+"""
+import asyncio
+import json
+import logging
+import os
+import shutil
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from cache.disk_cache import DiskCache, make_cache_key
+from media_probe import probe_media
+
+try:
+    import fcntl
+except ImportError:  # Non-POSIX platforms: in-process single-flight only
+    fcntl = None
+
+log = logging.getLogger(__name__)
+
+LOCK_POLL_INTERVAL = 0.25
+LOCK_TIMEOUT = 600.0
+
+class SearchCache:
+    """TTL cache for JSON search responses."""
+
+    def __init__(self, root: str, ttl_seconds: float, max_bytes: int = 64 * 1024 * 1024):
+        self.ttl_seconds = ttl_seconds
+        self.cache = DiskCache(root, max_bytes, name="search-cache")
+
+    @staticmethod
+    def key(provider: str, endpoint: str, params: Dict[str, Any]) -> str:
+        # API keys never become part of the cache key
+        safe_params = {k: v for k, v in params.items() if k.lower() not in ("key", "token", "api_key")}
+        return make_cache_key(provider, endpoint, safe_params)
+
+    def get(self, key: str) -> Optional[Any]:
+        meta = self.cache.get_metadata(key, ".json")
+        if not meta or time.time() - meta.get("stored_at", 0) > self.ttl_seconds:
+            # Expired (or missing) entries are misses, or the hit rate overstates the cache
+            self.cache.count_miss()
+            return None
+        path = self.cache.get(key, ".json")
+        if not path:
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, data: Any) -> None:
+        try:
+            self.cache.put_bytes(
+                key, json.dumps(data).encode("utf-8"), ".json",
+                metadata={"stored_at": time.time()}
+            )
+        except OSError as e:
+            log.debug(f"Search cache write failed: {e}")
+
+class MediaCache:
+    """Quota-bounded cache of downloaded media with single-flight fetching."""
+
+    def __init__(self, root: str, max_bytes: int):
+        self.cache = DiskCache(root, max_bytes, name="media-cache")
+        self._lock_dir = os.path.join(root, ".locks")
+        os.makedirs(self._lock_dir, exist_ok=True)
+        self._inflight: Dict[Tuple[int, str], asyncio.Future] = {}
+
+    @staticmethod
+    def key(provider: str, asset_id: Any, rendition: str) -> str:
+        return make_cache_key(provider, str(asset_id), rendition)
+
+    def contains(self, provider: str, asset_id: Any, rendition: str, suffix: str) -> bool:
+        return os.path.isfile(self.cache.path_for(self.key(provider, asset_id, rendition), suffix))
+
+    def metadata(self, provider: str, asset_id: Any, rendition: str, suffix: str) -> Optional[Dict[str, Any]]:
+        return self.cache.get_metadata(self.key(provider, asset_id, rendition), suffix)
+
+    async def fetch(
+        self,
+        provider: str,
+        asset_id: Any,
+        rendition: str,
+        suffix: str,
+        downloader: Callable[[str], Awaitable[bool]],
+        dest_path: str,
+        extra_metadata: Optional[Dict[str, Any]] = None,
+        expect_video: bool = False
+    ) -> Optional[str]:
+        """
+        Return `dest_path` holding the asset, downloading it at most once.
+
+        Args:
+            provider, asset_id, rendition: Identity of the asset
+            suffix: File extension of the cached entry (e.g. '.mp4')
+            downloader: Coroutine writing the asset to the given temp path, returns success
+            dest_path: Where the caller wants the file (hardlinked from the cache)
+            extra_metadata: Stored alongside probed metadata (e.g. source URL)
+            expect_video: Reject downloads without a decodable video stream
+
+        Returns:
+            dest_path on success, None if the download failed
+        """
+        key = self.key(provider, asset_id, rendition)
+        if await asyncio.to_thread(self.cache.materialize, key, dest_path, suffix):
+            return dest_path
+
+        loop = asyncio.get_running_loop()
+        flight_key = (id(loop), key)
+        if (existing := self._inflight.get(flight_key)) is not None:
+            cached_ok = await asyncio.shield(existing)
+            if cached_ok and await asyncio.to_thread(self.cache.materialize, key, dest_path, suffix):
+                return dest_path
+            return None
+
+        future = loop.create_future()
+        self._inflight[flight_key] = future
+        stored = False
+        try:
+            stored = await self._fetch_with_process_lock(key, suffix, downloader, extra_metadata, expect_video)
+        finally:
+            future.set_result(stored)
+            self._inflight.pop(flight_key, None)
+
+        if stored and await asyncio.to_thread(self.cache.materialize, key, dest_path, suffix):
+            return dest_path
+        return None
+
+    @staticmethod
+    def _validate(path: str, probe: Optional[Dict[str, Any]], expect_video: bool) -> Optional[str]:
+        """Reason the file is unusable, or None if it looks sound."""
+        if os.path.getsize(path) == 0:
+            return "empty file"
+        if probe is None:
+            # None also means ffprobe is missing; only reject when it could have answered
+            return "container could not be probed" if shutil.which("ffprobe") else None
+        if probe.get("duration", 0.0) <= 0:
+            return "no duration"
+        if expect_video and not probe.get("width"):
+            return "no video stream"
+        return None
+
+    async def _fetch_with_process_lock(
+        self, key: str, suffix: str,
+        downloader: Callable[[str], Awaitable[bool]],
+        extra_metadata: Optional[Dict[str, Any]],
+        expect_video: bool
+    ) -> bool:
+        lock_file = open(os.path.join(self._lock_dir, f"{key}.lock"), "w")
+        try:
+            if fcntl:
+                deadline = time.monotonic() + LOCK_TIMEOUT
+                while True:
+                    try:
+                        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                        break
+                    except BlockingIOError:
+                        if time.monotonic() > deadline:
+                            log.warning(f"Timed out waiting for another process to fetch {key[:12]}")
+                            return False
+                        await asyncio.sleep(LOCK_POLL_INTERVAL)
+
+            # Another process may have finished the download while we waited
+            if os.path.isfile(self.cache.path_for(key, suffix)):
+                return True
+
+            # Stable name under the lock, so an interrupted download's .part is resumed next time
+            tmp_path = os.path.join(self.cache.root, f"{key}.download{suffix}")
+            if not await downloader(tmp_path) or not os.path.isfile(tmp_path):
+                return False
+            try:
+                probe = await asyncio.to_thread(probe_media, tmp_path)
+                if reason := self._validate(tmp_path, probe, expect_video):
+                    log.warning(f"⚠️ Rejected downloaded media {key[:12]}: {reason}")
+                    return False
+                metadata = {**(extra_metadata or {}), "probe": probe,
+                            "size_bytes": os.path.getsize(tmp_path), "stored_at": time.time()}
+                await asyncio.to_thread(self.cache.put_file, key, tmp_path, suffix, metadata, True)
+                return True
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+        finally:
+            if fcntl:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+                except OSError:
+                    pass
+            lock_file.close()
@@ -14,6 +14,8 @@ load_dotenv()
 OUTPUT_DIR: str = "generated_videos"
 TEMP_ASSETS_DIR: str = "temp_video_assets"
 PLANS_DIR: str = "video_plans"
+# Persistent caches live outside TEMP_ASSETS_DIR so they survive between runs
+CACHE_DIR: str = os.getenv("CACHE_DIR", ".cache")
 
 # --- API Keys ---
 OPENAI_API_KEY: Optional[str] = os.getenv("OPENAI_API_KEY")
@@ -25,15 +27,117 @@ PIXABAY_API_KEY: Optional[str] = os.getenv("PIXABAY_API_KEY")
 VIDEO_DIMS: Tuple[int, int] = (1080, 1920)
 FPS: int = 30
 
+# --- Caption & Text Rendering Settings ---
+# Path to a .ttf/.otf font; falls back to the bundled NotoSans font when unset.
+CAPTIONS_FONT_PATH: Optional[str] = os.getenv("CAPTIONS_FONT_PATH")
+TEXT_SPRITE_CACHE_SIZE: int = 2048
+
+# --- Render Settings ---
+# "moviepy" (default), "ffmpeg" (single native filtergraph), "parallel"
+# (per-segment encodes in a process pool) or "streaming" (one open segment at a
+# time, memory-bounded). The alternatives fall back to moviepy on failure, and
+# moviepy switches to streaming by itself for timelines too large for RAM.
+RENDER_BACKEND: str = os.getenv("RENDER_BACKEND", "moviepy")
+# Worker processes for the parallel backend; 0 means one per CPU core.
+RENDER_WORKERS: int = int(os.getenv("RENDER_WORKERS", "0"))
+# With the parallel backend, run Generative Mode as a per-scene pipeline: each
+# scene's captions and segment encode start as soon as its own TTS and stock
+# video land, instead of waiting for every scene at each stage.
+SCENE_PIPELINE: bool = os.getenv("SCENE_PIPELINE", "true").lower() in ("1", "true", "yes")
+# Transcode each stock clip in the background, as soon as it downloads, to a
+# short-GOP mezzanine at the target size and segment frame rate, trimmed to the
+# scene's duration, so renders skip per-frame crop/resize. Scenes (or clips of
+# unknown use) longer than MEZZANINE_MAX_SECONDS keep the original download.
+MEZZANINE: bool = os.getenv("MEZZANINE", "true").lower() in ("1", "true", "yes")
+MEZZANINE_WORKERS: int = int(os.getenv("MEZZANINE_WORKERS", "2"))
+MEZZANINE_MAX_SECONDS: float = 30.0
+# --preview renders a quarter-resolution, 12fps proxy (cached TTS and media are
+# reused) and, optionally, a storyboard contact sheet with one frame per scene.
+PREVIEW_CONTACT_SHEET: bool = os.getenv("PREVIEW_CONTACT_SHEET", "true").lower() in ("1", "true", "yes")
+
+# --- Batch Settings ---
+# `main.py --batch <dir|glob>` renders many plans concurrently. Renders share
+# BATCH_CPU_SLOTS encoder slots (0 = one per core) and a RAM budget
+# (0 = 80% of system RAM); network requests share one HTTP concurrency cap.
+BATCH_JOBS: int = int(os.getenv("BATCH_JOBS", "2"))
+BATCH_CPU_SLOTS: int = int(os.getenv("BATCH_CPU_SLOTS", "0"))
+BATCH_RAM_GB: float = float(os.getenv("BATCH_RAM_GB", "0"))
+BATCH_NET_CONCURRENCY: int = int(os.getenv("BATCH_NET_CONCURRENCY", "8"))
+# RAM reserved for a job's TTS/ASR/download phase (renders reserve per encoder slot)
+BATCH_PREPARE_RAM_GB: float = float(os.getenv("BATCH_PREPARE_RAM_GB", "1.5"))
+
+# --- Worker Daemon Settings ---
+# `python -m worker serve` keeps clients, models and fonts loaded and drains a
+# SQLite job queue shared by all worker processes, the HTTP endpoint and the CLI.
+WORKER_DB_PATH: str = os.getenv("WORKER_DB_PATH", os.path.join(CACHE_DIR, "jobs.sqlite3"))
+WORKER_HOST: str = os.getenv("WORKER_HOST", "127.0.0.1")
+WORKER_PORT: int = int(os.getenv("WORKER_PORT", "8765"))
+WORKER_PROCESSES: int = int(os.getenv("WORKER_PROCESSES", "1"))
+WORKER_POLL_SECONDS: float = float(os.getenv("WORKER_POLL_SECONDS", "2.0"))
+# A running job whose worker hasn't heartbeated for this long is requeued
+WORKER_LEASE_SECONDS: float = float(os.getenv("WORKER_LEASE_SECONDS", "120"))
+WORKER_MAX_ATTEMPTS: int = int(os.getenv("WORKER_MAX_ATTEMPTS", "3"))
+
 # --- Text-to-Speech (TTS) Settings ---
 SPEECHIFY_DEFAULT_VOICE_ID: str = os.getenv("SPEECHIFY_DEFAULT_VOICE_ID", "Matthew")
 OPENAI_TTS_MODEL: str = "tts-1-hd"
 OPENAI_TTS_VOICE: str = "shimmer"
 MAX_SEGMENT_DURATION: float = 15.0
+TTS_CACHE_DIR: str = os.path.join(CACHE_DIR, "tts")
+TTS_CACHE_MAX_BYTES: int = int(os.getenv("TTS_CACHE_MAX_MB", "1024")) * 1024 * 1024
+# Per-provider request budgets, shared by all render jobs in the process.
+# 429 responses pause the provider for Retry-After (or a jittered backoff).
+OPENAI_TTS_RPS: float = float(os.getenv("OPENAI_TTS_RPS", "3"))
+OPENAI_TTS_CONCURRENCY: int = int(os.getenv("OPENAI_TTS_CONCURRENCY", "4"))
+SPEECHIFY_RPS: float = float(os.getenv("SPEECHIFY_RPS", "2"))
+SPEECHIFY_CONCURRENCY: int = int(os.getenv("SPEECHIFY_CONCURRENCY", "3"))
+TTS_BACKOFF_BASE: float = 1.0
+TTS_BACKOFF_MAX: float = 30.0
+
+# --- Caption Timing Settings ---
+# Known narration is force-aligned to its TTS audio; below this confidence the
+# segment falls back to Whisper transcription.
+ALIGNMENT_MIN_CONFIDENCE: float = float(os.getenv("ALIGNMENT_MIN_CONFIDENCE", "0.6"))
+# ASR engine for the fallback: "auto" (faster-whisper int8 if installed, else
+# whisper), "whisper" or "faster-whisper". Models are loaded once per process.
+ASR_BACKEND: str = os.getenv("ASR_BACKEND", "auto")
+ASR_MODEL: str = os.getenv("ASR_MODEL", "base")
+# CPU threads for ASR inference; 0 means a quarter of the cores, leaving the rest to the encoder.
+ASR_CPU_THREADS: int = int(os.getenv("ASR_CPU_THREADS", "0"))
+# Transcribe all fallback segments as one concatenated buffer (single ASR pass).
+ASR_BATCH: bool = os.getenv("ASR_BATCH", "true").lower() in ("1", "true", "yes")
+ASR_BATCH_MAX_SECONDS: float = 600.0
+# Load the ASR model in the background at startup instead of on first fallback.
+ASR_PREWARM: bool = os.getenv("ASR_PREWARM", "false").lower() in ("1", "true", "yes")
+
+# --- Loudness Settings ---
+# Loudness profiles (integrated LUFS, true peak, RMS envelope) of narration and
+# music, keyed by file content hash so each asset is analysed once.
+LOUDNESS_CACHE_DIR: str = os.path.join(CACHE_DIR, "loudness")
+LOUDNESS_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+# Every narration segment is levelled to this loudness before mixing.
+NARRATION_TARGET_LUFS: float = float(os.getenv("NARRATION_TARGET_LUFS", "-16"))
 
 # --- Transformative Mode Settings ---
 SCENE_DETECT_THRESHOLD: int = 27
 
 # --- Network Settings ---
 REQUEST_TIMEOUT: int = 45
-MAX_RETRIES: int = 3
\ No newline at end of file
+MAX_RETRIES: int = 3
+# Shared pooled HTTP client (see http_client.py)
+HTTP_MAX_CONNECTIONS: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "32"))
+HTTP_MAX_PER_HOST: int = int(os.getenv("HTTP_MAX_PER_HOST", "8"))
+HTTP_MAX_CONCURRENCY: int = int(os.getenv("HTTP_MAX_CONCURRENCY", "16"))
+# Delay before the next (more generic) music query is hedged alongside a slow one
+MUSIC_SEARCH_STAGGER: float = float(os.getenv("MUSIC_SEARCH_STAGGER", "1.5"))
+
+# --- Stock Media Cache Settings ---
+MEDIA_CACHE_DIR: str = os.path.join(CACHE_DIR, "media")
+MEDIA_CACHE_MAX_BYTES: int = int(os.getenv("MEDIA_CACHE_MAX_MB", "10240")) * 1024 * 1024
+SEARCH_CACHE_DIR: str = os.path.join(CACHE_DIR, "search")
+SEARCH_CACHE_TTL: int = int(os.getenv("SEARCH_CACHE_TTL_HOURS", "24")) * 3600
+
+# --- Local Music Library ---
+# Directory of tracks (optional JSON sidecars) consulted before Pixabay; unset disables it.
+MUSIC_LIBRARY_DIR: Optional[str] = os.getenv("MUSIC_LIBRARY_DIR")
+MUSIC_LIBRARY_INDEX: str = os.path.join(CACHE_DIR, "music_library.json")
\ No newline at end of file
@@ -0,0 +1,249 @@
+"""
+Shared, pooled HTTP client for all media fetching.
+
+One aiohttp session per process, owned by a dedicated event-loop thread, so
+connections and TLS sessions are reused across scenes, services and the legacy
+synchronous helpers alike. Concurrency is bounded twice: per host by the
+connector and globally by a semaphore. Downloads are streamed to disk in
+chunks without blocking the loop, resumed with Range requests after
+interruptions, and renamed into place atomically once complete.
+
+This module deliberately does not import config (the legacy root scripts use
+it too); limits are passed to get_http_client().
+"""
+import asyncio
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional
+
+import aiofiles
+import aiohttp
+
+log = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 45.0
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+PART_SUFFIX = ".part"
+
+class HttpClientError(Exception):
+    """Raised for transport failures and non-2xx responses."""
+
+    def __init__(self, message: str, status: Optional[int] = None, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+def _expected_total(response: aiohttp.ClientResponse, offset: int) -> Optional[int]:
+    """Full size of the resource from Content-Range / Content-Length, if the server says."""
+    content_range = response.headers.get("Content-Range", "")
+    if "/" in content_range:
+        total = content_range.rsplit("/", 1)[1]
+        if total.isdigit():
+            return int(total)
+    # Content-Length counts encoded bytes, which differ from what lands on disk when compressed
+    if response.content_length is not None and not response.headers.get("Content-Encoding"):
+        return offset + response.content_length
+    return None
+
+class HttpClient:
+    """
+    Pooled async HTTP client running on its own event-loop thread.
+
+    Coroutines may be awaited from any event loop; they are executed on the
+    client's loop and the result is handed back. The *_sync variants block the
+    calling thread instead and are meant for code without a running loop.
+
+    Attributes:
+        stats: Counters for requests, failures and downloaded bytes
+    """
+
+    def __init__(self, max_connections: int = 32, max_per_host: int = 8, max_concurrency: int = 16):
+        """
+        Args:
+            max_connections: Total pooled connections
+            max_per_host: Pooled connections per host
+            max_concurrency: Requests in flight at once across all hosts
+        """
+        self.max_connections = max_connections
+        self.max_per_host = max_per_host
+        self.max_concurrency = max_concurrency
+        self.stats = {"requests": 0, "failures": 0, "bytes_downloaded": 0, "resumed": 0}
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="http-client", daemon=True)
+        self._thread.start()
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    # --- Loop plumbing ---
+    async def _ensure_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_per_host,
+                ttl_dns_cache=300,
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._session
+
+    async def _on_client_loop(self, coro):
+        """Run `coro` on the client loop and await it from the caller's loop."""
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, self._loop))
+
+    def _run_sync(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    # --- Requests ---
+    async def _get_json(self, url: str, params: Optional[Dict[str, Any]],
+                        headers: Optional[Dict[str, str]], timeout: float) -> Any:
+        session = await self._ensure_session()
+        async with self._semaphore:
+            self.stats["requests"] += 1
+            try:
+                async with session.get(url, params=params, headers=headers,
+                                       timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                    if response.status >= 400:
+                        raise HttpClientError(
+                            f"GET {url} returned HTTP {response.status}",
+                            status=response.status,
+                            retry_after=_parse_retry_after(response.headers.get("Retry-After"))
+                        )
+                    return await response.json(content_type=None)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self.stats["failures"] += 1
+                raise HttpClientError(f"GET {url} failed: {e}") from e
+            except HttpClientError:
+                self.stats["failures"] += 1
+                raise
+
+    async def _download(self, url: str, dest_path: str, headers: Optional[Dict[str, str]],
+                        timeout: float, chunk_size: int) -> int:
+        session = await self._ensure_session()
+        part_path = dest_path + PART_SUFFIX
+        os.makedirs(os.path.dirname(dest_path) or ".", exist_ok=True)
+        resume_from = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        request_headers = dict(headers or {})
+        if resume_from:
+            request_headers["Range"] = f"bytes={resume_from}-"
+
+        async with self._semaphore:
+            self.stats["requests"] += 1
+            written = 0
+            try:
+                # Total timeout would cap large files; bound connect and idle reads instead
+                client_timeout = aiohttp.ClientTimeout(total=None, sock_connect=timeout, sock_read=timeout)
+                async with session.get(url, headers=request_headers, timeout=client_timeout) as response:
+                    if response.status == 416 and resume_from:
+                        # Range not satisfiable: the partial file is stale, start over next attempt
+                        os.remove(part_path)
+                        raise HttpClientError(f"GET {url} rejected resume at byte {resume_from}", status=416)
+                    if response.status >= 400:
+                        raise HttpClientError(
+                            f"GET {url} returned HTTP {response.status}",
+                            status=response.status,
+                            retry_after=_parse_retry_after(response.headers.get("Retry-After"))
+                        )
+
+                    resumed = resume_from > 0 and response.status == 206
+                    if resume_from and not resumed:
+                        log.debug(f"Server ignored Range for {url}; restarting download")
+                    offset = resume_from if resumed else 0
+                    expected = _expected_total(response, offset)
+
+                    async with aiofiles.open(part_path, "ab" if resumed else "wb") as f:
+                        async for chunk in response.content.iter_chunked(chunk_size):
+                            await f.write(chunk)
+                            written += len(chunk)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self.stats["failures"] += 1
+                self.stats["bytes_downloaded"] += written
+                raise HttpClientError(f"Download of {url} failed after {written} bytes: {e}") from e
+            except HttpClientError:
+                self.stats["failures"] += 1
+                raise
+            self.stats["bytes_downloaded"] += written
+            if resumed:
+                self.stats["resumed"] += 1
+
+            total = offset + written
+            if expected is not None and total != expected:
+                self.stats["failures"] += 1
+                raise HttpClientError(f"Download of {url} incomplete: {total}/{expected} bytes")
+            os.replace(part_path, dest_path)
+            return total
+
+    async def get_json(self, url: str, params: Optional[Dict[str, Any]] = None,
+                       headers: Optional[Dict[str, str]] = None, timeout: float = DEFAULT_TIMEOUT) -> Any:
+        """
+        GET `url` and decode the JSON body.
+
+        Raises:
+            HttpClientError: On transport errors or HTTP status >= 400
+        """
+        return await self._on_client_loop(self._get_json(url, params, headers, timeout))
+
+    async def download(self, url: str, dest_path: str, headers: Optional[Dict[str, str]] = None,
+                       timeout: float = DEFAULT_TIMEOUT, chunk_size: int = DOWNLOAD_CHUNK_SIZE) -> int:
+        """
+        Stream `url` into `dest_path` chunk by chunk.
+
+        Bytes land in `dest_path + '.part'` first. If a partial file is left
+        from an interrupted attempt, only the missing bytes are requested via
+        a Range header. The file is renamed into place only once its size
+        matches what the server announced, so `dest_path` is never truncated.
+
+        Returns:
+            Size of the completed file in bytes
+
+        Raises:
+            HttpClientError: On transport errors or HTTP status >= 400
+        """
+        return await self._on_client_loop(self._download(url, dest_path, headers, timeout, chunk_size))
+
+    def get_json_sync(self, url: str, params: Optional[Dict[str, Any]] = None,
+                      headers: Optional[Dict[str, str]] = None, timeout: float = DEFAULT_TIMEOUT) -> Any:
+        """Blocking get_json() for callers without an event loop."""
+        return self._run_sync(self._get_json(url, params, headers, timeout))
+
+    def download_sync(self, url: str, dest_path: str, headers: Optional[Dict[str, str]] = None,
+                      timeout: float = DEFAULT_TIMEOUT, chunk_size: int = DOWNLOAD_CHUNK_SIZE) -> int:
+        """Blocking download() for callers without an event loop."""
+        return self._run_sync(self._download(url, dest_path, headers, timeout, chunk_size))
+
+    def close(self) -> None:
+        """Close the session and stop the client loop."""
+        if self._session is not None and not self._session.closed:
+            self._run_sync(self._session.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+
+_client: Optional[HttpClient] = None
+_client_lock = threading.Lock()
+
+def get_http_client(max_connections: int = 32, max_per_host: int = 8, max_concurrency: int = 16) -> HttpClient:
+    """
+    Process-wide shared client. Limits only apply to the first call, which creates it.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient(max_connections, max_per_host, max_concurrency)
+            log.debug(f"HTTP client started ({max_connections} connections, "
+                      f"{max_per_host}/host, {max_concurrency} concurrent)")
+        return _client
@@ -12,7 +12,9 @@ import logging
 import os
 import shutil
 import sys
+import time
 import traceback
+from dataclasses import replace
 from typing import Optional
 
 # --- Third-Party Imports ---
@@ -22,13 +24,18 @@ from tqdm import tqdm
 
 # --- Local Application Imports ---
 import config
+from audio_processing import get_asr_registry
+from batch import BatchRunner, find_plan_files, report_batch
 from services import (
     PlanningService, AudioService, MediaService,
-    GenerativeAssemblyService, RemixAssemblyService, VideoAnalysisService
+    GenerativeAssemblyService, RemixAssemblyService, VideoAnalysisService, ScenePipeline
 )
 from models import VideoPlan, RemixPlan
 from utils import sanitize_filename
-from video_processing.editor import VideoEditor
+from video_processing.editor import VideoEditor, VideoProcessingError
+from video_processing.render_plan import (
+    BACKEND_PARALLEL, PROFILE_FULL, PROFILE_PREVIEW, RENDER_BACKENDS, RenderProfile
+)
 
 # ======================================================================================
 # --- 1. Core Setup: Logging and Dependency Checks ---
@@ -51,7 +58,6 @@ def check_dependencies():
         import moviepy.editor
         import scenedetect
         import mutagen
-        import whisper
         import cv2
         import numpy
         import tqdm
@@ -74,7 +80,8 @@ def check_dependencies():
 # --- 2. Mode-Specific Workflows ---
 # ======================================================================================
 
-async def run_generative_mode(persona_file: str):
+async def run_generative_mode(persona_file: str, render_backend: Optional[str] = None,
+                              profile: RenderProfile = PROFILE_FULL):
     log.info("🚀 Starting Generative Mode...")
     openai_client, speechify_client = initialize_clients()
     planner = PlanningService(openai_client)
@@ -88,10 +95,18 @@ async def run_generative_mode(persona_file: str):
     with open(plan_path, 'w') as f: f.write(final_plan.json(indent=2))
     log.info(f"Plan saved to '{plan_path}'")
     
-    editor = VideoEditor()
+    editor = VideoEditor(profile=profile)
     audio_service = AudioService(openai_client, speechify_client)
-    media_service = MediaService()
-    assembly_service = GenerativeAssemblyService(editor, media_service, audio_service)
+    media_service = MediaService(render_profile=profile)
+    assembly_service = GenerativeAssemblyService(editor, media_service, audio_service, render_backend)
+
+    if assembly_service.render_backend == BACKEND_PARALLEL and config.SCENE_PIPELINE:
+        try:
+            await ScenePipeline(editor, media_service, audio_service, assembly_service).run(final_plan, brand_persona)
+            return
+        except VideoProcessingError as e:
+            # TTS and media are cached on disk, so the staged path below mostly reuses them
+            log.warning(f"⚠️ Scene pipeline failed ({e}). Falling back to staged assembly.")
 
     processed_audio, media_assets = await asyncio.gather(
         audio_service.generate_and_process_audio(final_plan, brand_persona),
@@ -136,7 +151,8 @@ async def run_transformative_mode(persona_file: str):
     except Exception as e:
         log.critical(f"Fatal error in Transformative Mode: {e}"); traceback.print_exc()
 
-async def run_render_from_file_mode():
+async def run_render_from_file_mode(render_backend: Optional[str] = None,
+                                    profile: RenderProfile = PROFILE_FULL):
     log.info("🚀 Starting Render From Plan File Mode...")
     try:
         plan_path = input("\nEnter the full path to your plan JSON file: ").strip()
@@ -147,9 +163,9 @@ async def run_render_from_file_mode():
             data = json.load(f)
 
         openai_client, speechify_client = initialize_clients()
-        editor = VideoEditor()
+        editor = VideoEditor(profile=profile)
         audio_service = AudioService(openai_client, speechify_client)
-        media_service = MediaService()
+        media_service = MediaService(render_profile=profile)
         planner = PlanningService(openai_client)
 
         if 'video_title' in data and 'sections' in data:
@@ -159,7 +175,7 @@ async def run_render_from_file_mode():
             if not brand_persona: 
                 log.error("Could not load default brand persona 'brand_persona.json'."); return
 
-            assembly_service = GenerativeAssemblyService(editor, media_service, audio_service)
+            assembly_service = GenerativeAssemblyService(editor, media_service, audio_service, render_backend)
             processed_audio, media_assets = await asyncio.gather(
                 audio_service.generate_and_process_audio(final_plan, brand_persona),
                 media_service.get_assets_for_plan(final_plan)
@@ -182,14 +198,46 @@ async def run_render_from_file_mode():
     except Exception as e:
         log.critical(f"Fatal error during render from file: {e}"); traceback.print_exc()
 
+def run_batch_mode(plans_pattern: str, persona_file: str, render_backend: Optional[str] = None,
+                   profile: RenderProfile = PROFILE_FULL, max_jobs: int = config.BATCH_JOBS,
+                   keep_workspaces: bool = False):
+    """Non-interactive: render every generative plan matching `plans_pattern`."""
+    log.info("🚀 Starting Batch Mode...")
+    plan_paths = find_plan_files(plans_pattern)
+    if not plan_paths:
+        log.error(f"No plan files found for '{plans_pattern}'."); return
+
+    openai_client, speechify_client = initialize_clients()
+    if not (brand_persona := PlanningService(openai_client).load_brand_persona(persona_file)): return
+
+    runner = BatchRunner(
+        openai_client, speechify_client, brand_persona, render_backend, profile,
+        max_jobs=max_jobs, keep_workspaces=keep_workspaces
+    )
+    started = time.monotonic()
+    results = runner.run(plan_paths)
+    report_batch(results, time.monotonic() - started, runner.scheduler)
+
 
 # ======================================================================================
 # --- 3. Main Orchestrator and Execution ---
 # ======================================================================================
 
-def setup_directories():
+# Workspaces of batch runs and worker processes; they may be live, and each removes its own
+ISOLATED_WORKSPACE_PREFIXES = ("batch-", "worker-")
+
+def setup_directories(wipe_temp: bool = True):
+    """
+    Create the working directories. Interactive runs clear their leftovers
+    from TEMP_ASSETS_DIR first; batch runs don't touch it at all.
+    """
     log.info("Setting up project directories...")
-    if os.path.exists(config.TEMP_ASSETS_DIR): shutil.rmtree(config.TEMP_ASSETS_DIR)
+    if wipe_temp and os.path.isdir(config.TEMP_ASSETS_DIR):
+        for entry in os.scandir(config.TEMP_ASSETS_DIR):
+            if entry.name.startswith(ISOLATED_WORKSPACE_PREFIXES):
+                continue
+            if entry.is_dir(follow_symlinks=False): shutil.rmtree(entry.path, ignore_errors=True)
+            else: os.remove(entry.path)
     dirs_to_create = [config.OUTPUT_DIR, config.TEMP_ASSETS_DIR, config.PLANS_DIR]
     for path in dirs_to_create:
         os.makedirs(path, exist_ok=True)
@@ -208,13 +256,14 @@ def initialize_clients() -> tuple[OpenAI, Optional['Speechify']]:
         log.warning(f"Speechify client failed to initialize: {e}")
     return openai_client, speechify_client
 
-async def main_orchestrator(persona_file: str):
+async def main_orchestrator(persona_file: str, render_backend: Optional[str] = None,
+                            profile: RenderProfile = PROFILE_FULL):
     while True:
         print("\nSelect Mode: [1] Generative [2] Transformative [3] Render From File [q] Quit")
         choice = input("> ").strip().lower()
-        if choice == '1': await run_generative_mode(persona_file); break
+        if choice == '1': await run_generative_mode(persona_file, render_backend, profile); break
         elif choice == '2': await run_transformative_mode(persona_file); break
-        elif choice == '3': await run_render_from_file_mode(); break
+        elif choice == '3': await run_render_from_file_mode(render_backend, profile); break
         elif choice in ['q', 'quit']: break
         else: log.warning("Invalid choice.")
 
@@ -223,13 +272,26 @@ if __name__ == "__main__":
     
     parser = argparse.ArgumentParser(description="AI-powered video creation orchestrator.")
     parser.add_argument("-p", "--persona", default="brand_persona.json", help="Path to brand persona JSON file (relative to src).")
+    parser.add_argument("--render-backend", choices=RENDER_BACKENDS, default=None, help="Render backend for this run (default: RENDER_BACKEND from config).")
+    parser.add_argument("--preview", action="store_true", help="Render a fast low-resolution proxy for plan review (reuses cached audio/media).")
+    parser.add_argument("--batch", metavar="PLANS", default=None, help="Render every plan in a directory or glob (e.g. 'video_plans/*.json') without prompts.")
+    parser.add_argument("--jobs", type=int, default=config.BATCH_JOBS, help="Concurrent jobs in batch mode (default: BATCH_JOBS from config).")
+    parser.add_argument("--keep-workspaces", action="store_true", help="Keep each batch job's temporary workspace for inspection.")
     args = parser.parse_args()
     
     try:
-        setup_directories()
+        setup_directories(wipe_temp=not args.batch)
+        if config.ASR_PREWARM:
+            get_asr_registry().prewarm(config.ASR_BACKEND, config.ASR_MODEL, config.ASR_CPU_THREADS or None)
         script_dir = os.path.dirname(__file__)
         persona_path = os.path.join(script_dir, args.persona)
-        asyncio.run(main_orchestrator(persona_path))
+        profile = (
+            replace(PROFILE_PREVIEW, contact_sheet=config.PREVIEW_CONTACT_SHEET) if args.preview else PROFILE_FULL
+        )
+        if args.batch:
+            run_batch_mode(args.batch, persona_path, args.render_backend, profile, args.jobs, args.keep_workspaces)
+        else:
+            asyncio.run(main_orchestrator(persona_path, args.render_backend, profile))
     except (KeyboardInterrupt, asyncio.CancelledError):
         log.info("\nProcess interrupted.")
     except Exception as e:
@@ -0,0 +1,65 @@
+"""
+Lightweight media inspection helpers built on ffprobe.
+
+These avoid opening a full moviepy reader when only container metadata
+(duration, dimensions, frame rate) is needed.
+"""
+import json
+import logging
+import shutil
+import subprocess
+from typing import Any, Dict, Optional
+
+log = logging.getLogger(__name__)
+
+PROBE_TIMEOUT: int = 30
+
+def probe_media(path: str) -> Optional[Dict[str, Any]]:
+    """
+    Probe a media file with ffprobe.
+
+    Returns:
+        Dict with 'duration', 'format_name' and, when present, 'width', 'height',
+        'fps', 'video_codec', 'audio_codec', 'sample_rate', 'channels';
+        None if the file cannot be probed.
+    """
+    if not shutil.which("ffprobe"):
+        log.debug("ffprobe not found in PATH - media probing unavailable")
+        return None
+    try:
+        result = subprocess.run(
+            ["ffprobe", "-v", "error", "-print_format", "json",
+             "-show_format", "-show_streams", path],
+            capture_output=True, text=True, timeout=PROBE_TIMEOUT, check=True
+        )
+        data = json.loads(result.stdout or "{}")
+    except (subprocess.SubprocessError, json.JSONDecodeError, OSError) as e:
+        log.debug(f"ffprobe failed for {path}: {e}")
+        return None
+
+    fmt = data.get("format", {})
+    info: Dict[str, Any] = {
+        "duration": float(fmt.get("duration", 0.0) or 0.0),
+        "format_name": fmt.get("format_name", ""),
+    }
+    for stream in data.get("streams", []):
+        codec_type = stream.get("codec_type")
+        if codec_type == "video" and "width" not in info:
+            info["width"] = int(stream.get("width", 0))
+            info["height"] = int(stream.get("height", 0))
+            info["video_codec"] = stream.get("codec_name")
+            num, _, den = str(stream.get("avg_frame_rate", "0/1")).partition("/")
+            try:
+                info["fps"] = float(num) / float(den or 1)
+            except (ValueError, ZeroDivisionError):
+                info["fps"] = 0.0
+        elif codec_type == "audio" and "audio_codec" not in info:
+            info["audio_codec"] = stream.get("codec_name")
+            info["sample_rate"] = int(stream.get("sample_rate", 0) or 0)
+            info["channels"] = int(stream.get("channels", 0) or 0)
+    return info
+
+def probe_duration(path: str) -> float:
+    """Container duration in seconds, or 0.0 if unknown."""
+    info = probe_media(path)
+    return info["duration"] if info else 0.0
@@ -0,0 +1,179 @@
+"""
+Background Resource Monitor
+
+A single daemon thread samples process RSS, system RAM and CPU usage on a fixed
+interval into a rolling window. Readers get the latest snapshot without
+blocking, so hot paths never pay for `psutil.cpu_percent(interval=...)` sleeps.
+Forced garbage collection is gated on real memory-pressure signals.
+"""
+import gc
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, List, Optional
+
+import psutil
+
+log = logging.getLogger(__name__)
+
+GB = 1024 ** 3
+
+@dataclass(frozen=True)
+class ResourceSnapshot:
+    """One point-in-time resource sample."""
+    timestamp: float
+    rss_gb: float
+    total_ram_gb: float
+    used_ram_gb: float
+    available_ram_gb: float
+    cpu_percent: float
+
+    @property
+    def available_fraction(self) -> float:
+        return self.available_ram_gb / self.total_ram_gb if self.total_ram_gb else 1.0
+
+class ResourceMonitor:
+    """
+    Rolling-window sampler of process and system resources.
+
+    Attributes:
+        peak_rss_gb: Highest process RSS seen since start
+        peak_used_ram_gb: Highest system RAM usage seen since start
+    """
+
+    def __init__(self,
+                 interval: float = 0.5,
+                 window: int = 120,
+                 pressure_available_fraction: float = 0.15,
+                 gc_cooldown: float = 2.0):
+        """
+        Args:
+            interval: Seconds between samples
+            window: Number of samples kept in the rolling window
+            pressure_available_fraction: Below this share of free RAM we are under pressure
+            gc_cooldown: Minimum seconds between pressure-triggered collections
+        """
+        self.interval = interval
+        self.pressure_available_fraction = pressure_available_fraction
+        self.gc_cooldown = gc_cooldown
+        self.peak_rss_gb = 0.0
+        self.peak_used_ram_gb = 0.0
+
+        self._samples: Deque[ResourceSnapshot] = deque(maxlen=window)
+        self._process = psutil.Process()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_gc = 0.0
+
+        # Prime cpu_percent so the first non-blocking reading is meaningful
+        psutil.cpu_percent(interval=None)
+        self._record(self._sample())
+
+    # --- Sampling ---
+    def _sample(self) -> ResourceSnapshot:
+        memory = psutil.virtual_memory()
+        return ResourceSnapshot(
+            timestamp=time.time(),
+            rss_gb=self._process.memory_info().rss / GB,
+            total_ram_gb=memory.total / GB,
+            used_ram_gb=memory.used / GB,
+            available_ram_gb=memory.available / GB,
+            cpu_percent=psutil.cpu_percent(interval=None),  # Since previous call; never sleeps
+        )
+
+    def _record(self, snapshot: ResourceSnapshot) -> None:
+        with self._lock:
+            self._samples.append(snapshot)
+            self.peak_rss_gb = max(self.peak_rss_gb, snapshot.rss_gb)
+            self.peak_used_ram_gb = max(self.peak_used_ram_gb, snapshot.used_ram_gb)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self._record(self._sample())
+            except Exception as e:  # Never let the sampler die silently mid-render
+                log.debug(f"Resource sampling failed: {e}")
+
+    def start(self) -> "ResourceMonitor":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="resource-monitor", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.interval * 2)
+
+    # --- Non-blocking Reads ---
+    def latest(self) -> ResourceSnapshot:
+        """Most recent sample (never blocks on CPU measurement)."""
+        with self._lock:
+            return self._samples[-1]
+
+    def window(self) -> List[ResourceSnapshot]:
+        with self._lock:
+            return list(self._samples)
+
+    def average_cpu_percent(self) -> float:
+        """Mean CPU usage over the rolling window."""
+        samples = self.window()
+        return sum(s.cpu_percent for s in samples) / len(samples) if samples else 0.0
+
+    def is_under_pressure(self) -> bool:
+        """True when free system RAM has dropped below the pressure threshold."""
+        return self.latest().available_fraction < self.pressure_available_fraction
+
+    def collect_if_pressure(self, reason: str = "", force_signal: bool = False) -> bool:
+        """
+        Run `gc.collect()` only on a real pressure signal, rate-limited.
+
+        Args:
+            reason: Label for the debug log
+            force_signal: Caller-detected pressure (e.g. an editor's own threshold)
+
+        Returns:
+            True if a collection ran
+        """
+        if not (force_signal or self.is_under_pressure()):
+            return False
+        now = time.monotonic()
+        if now - self._last_gc < self.gc_cooldown:
+            return False
+        self._last_gc = now
+        collected = gc.collect()
+        log.debug(f"Memory pressure{f' ({reason})' if reason else ''}: gc collected {collected} objects")
+        # Refresh immediately so callers see the effect
+        self._record(self._sample())
+        return True
+
+# --- Process-wide Monitor ---
+_monitor: Optional[ResourceMonitor] = None
+_monitor_lock = threading.Lock()
+
+def get_resource_monitor() -> ResourceMonitor:
+    """Return the shared, already-started monitor for this process."""
+    global _monitor
+    with _monitor_lock:
+        if _monitor is None:
+            _monitor = ResourceMonitor().start()
+        elif _monitor._thread is None or not _monitor._thread.is_alive():
+            _monitor.start()  # Sampler died; never serve a frozen snapshot
+        return _monitor
+
+def _reset_after_fork() -> None:
+    """
+    A forked child inherits the parent's monitor without its sampler thread,
+    a psutil handle on the parent's pid and possibly a held lock: start over.
+    """
+    global _monitor, _monitor_lock
+    _monitor = None
+    _monitor_lock = threading.Lock()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
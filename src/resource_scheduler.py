@@ -0,0 +1,63 @@
+"""
+Resource Scheduler - admission control for concurrent jobs in one process.
+
+Jobs reserve CPU slots and an estimated RAM footprint before a heavy phase
+(TTS/ASR, a render) and give them back afterwards; a reservation that does
+not fit blocks until enough is released. Used by batch mode and the worker.
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+log = logging.getLogger(__name__)
+
+class ResourceScheduler:
+    """
+    Counting admission control for CPU slots and RAM shared by concurrent jobs.
+
+    Requests larger than the whole budget are clamped to it, so a single big
+    job still runs (alone) instead of waiting forever.
+    """
+
+    def __init__(self, cpu_slots: int, ram_gb: float):
+        self.cpu_slots = max(1, cpu_slots)
+        self.ram_gb = max(0.5, ram_gb)
+        self._cpu_free = self.cpu_slots
+        self._ram_free = self.ram_gb
+        self._cond = threading.Condition()
+        self.stats = {"reservations": 0, "waits": 0, "wait_seconds": 0.0}
+
+    @contextmanager
+    def reserve(self, cpu: int, ram_gb: float, label: str = "") -> Iterator[None]:
+        """Block until `cpu` slots and `ram_gb` are free, hold them for the block."""
+        cpu = min(max(0, cpu), self.cpu_slots)
+        ram_gb = min(max(0.0, ram_gb), self.ram_gb)
+        started = time.monotonic()
+        with self._cond:
+            waited = False
+            while self._cpu_free < cpu or self._ram_free < ram_gb - 1e-9:
+                if not waited:
+                    log.info(f"⏳ {label or 'job'} waiting for {cpu} CPU slots / {ram_gb:.1f}GB "
+                             f"({self._cpu_free} slots / {self._ram_free:.1f}GB free)")
+                    waited = True
+                self._cond.wait()
+            self._cpu_free -= cpu
+            self._ram_free -= ram_gb
+            self.stats["reservations"] += 1
+            if waited:
+                self.stats["waits"] += 1
+                self.stats["wait_seconds"] += time.monotonic() - started
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._cpu_free += cpu
+                self._ram_free += ram_gb
+                self._cond.notify_all()
+
+    def summary(self) -> str:
+        return (f"scheduler: {self.cpu_slots} CPU slots, {self.ram_gb:.1f}GB RAM, "
+                f"{self.stats['reservations']} reservations, {self.stats['waits']} waited "
+                f"({self.stats['wait_seconds']:.1f}s total)")
@@ -9,6 +9,8 @@ from .generative_assembly_service import GenerativeAssemblyService
 from .media_service import MediaService
 from .planning_service import PlanningService
 from .remix_assembly_service import RemixAssemblyService
+from .scene_pipeline import ScenePipeline
+from .tts_scheduler import TTSScheduler, get_tts_scheduler
 from .video_analysis_service import VideoAnalysisService
 
 __all__ = [
@@ -17,5 +19,8 @@ __all__ = [
     "MediaService",
     "PlanningService",
     "RemixAssemblyService",
+    "ScenePipeline",
+    "TTSScheduler",
     "VideoAnalysisService",
+    "get_tts_scheduler",
 ]
\ No newline at end of file
@@ -7,11 +7,10 @@ Fixed to ensure reliable subtitle generation while maintaining memory efficiency
 # --- Standard Library Imports ---
 import asyncio
 import base64
-import gc
 import html
 import logging
 import os
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 # --- Third-Party Imports ---
 from openai import OpenAI
@@ -20,11 +19,19 @@ from mutagen.wave import WAVE
 from tqdm.asyncio import tqdm as asyncio_tqdm
 from moviepy.editor import AudioFileClip, CompositeAudioClip, afx
 # --- Local Application Imports ---
+from audio_processing import (
+    LoudnessAnalyzer, align_text_to_audio, get_asr_registry, ingest_audio, transcribe_batched
+)
+from cache import DiskCache, make_cache_key
 from config import (
     OPENAI_TTS_MODEL, OPENAI_TTS_VOICE, SPEECHIFY_DEFAULT_VOICE_ID,
-    TEMP_ASSETS_DIR
+    TEMP_ASSETS_DIR, TTS_CACHE_DIR, TTS_CACHE_MAX_BYTES, ALIGNMENT_MIN_CONFIDENCE,
+    ASR_BACKEND, ASR_MODEL, ASR_CPU_THREADS, ASR_BATCH, ASR_BATCH_MAX_SECONDS,
+    LOUDNESS_CACHE_DIR, LOUDNESS_CACHE_MAX_BYTES
 )
 from models import VideoPlan
+from resource_monitor import get_resource_monitor
+from services.tts_scheduler import TTSRateLimitError, get_tts_scheduler, rate_limit_from_exception
 from utils import sanitize_filename
 
 log = logging.getLogger(__name__)
@@ -40,10 +47,20 @@ except ImportError:
     Speechify = None
 
 class AudioService:
-    def __init__(self, openai_client: OpenAI, speechify_client: Optional[Speechify]):
+    def __init__(self, openai_client: OpenAI, speechify_client: Optional[Speechify],
+                 workspace_dir: str = TEMP_ASSETS_DIR):
         self.openai_client = openai_client
         self.speechify_client = speechify_client
-        self.asr_model = None  # Lazy load when needed
+        # Per-job scratch directory (batch jobs each get their own)
+        self.workspace_dir = workspace_dir
+        # Persistent narration cache - identical TTS requests are never paid for twice
+        self.tts_cache = DiskCache(TTS_CACHE_DIR, TTS_CACHE_MAX_BYTES, name="tts-cache")
+        # Process-wide rate limits - shared with every other job in this process
+        self.tts_scheduler = get_tts_scheduler()
+        # Loudness profiles by content hash - narration is measured once, right after TTS
+        self.loudness = LoudnessAnalyzer(
+            DiskCache(LOUDNESS_CACHE_DIR, LOUDNESS_CACHE_MAX_BYTES, name="loudness-cache")
+        )
 
     def mix_audio_with_narration(
         self,
@@ -81,28 +98,8 @@ class AudioService:
                         pass
 
     def _get_or_load_asr_model(self) -> Optional[Any]:
-        """Get ASR model, loading it if necessary."""
-        if self.asr_model is not None:
-            return self.asr_model
-            
-        if not whisper:
-            log.warning("Whisper not available - subtitles will be disabled")
-            return None
-            
-        log.info("Loading Whisper ASR model for subtitles...")
-        try:
-            # Use 'base' model for better accuracy while keeping memory reasonable
-            self.asr_model = whisper.load_model("base", device="cpu")
-            log.info("✅ Whisper model loaded successfully - subtitles enabled")
-            return self.asr_model
-        except Exception as e:
-            log.error(f"❌ Failed to load Whisper model: {e} - subtitles disabled")
-            return None
-
-    def _unload_asr_model_if_needed(self):
-        """Unload ASR model only when we're completely done with all transcription."""
-        # Keep model loaded during processing - only unload at the very end
-        pass
+        """Get the shared ASR backend from the process-wide registry, loading it on first use."""
+        return get_asr_registry().get(ASR_BACKEND, ASR_MODEL, ASR_CPU_THREADS or None)
 
     def get_audio_duration(self, filepath: str) -> float:
         try:
@@ -116,30 +113,63 @@ class AudioService:
         except Exception:
             return 0.0
 
+    def select_tts_provider(self) -> str:
+        """Pick the single TTS provider used for a whole video."""
+        # STRICT SINGLE PROVIDER: Choose once and NEVER switch
+        if self.speechify_client:
+            log.info("🎤 LOCKED to Speechify for entire video - no fallbacks allowed")
+            return "speechify"
+        log.info("🎤 LOCKED to OpenAI TTS for entire video - no fallbacks allowed")
+        return "openai"
+
+    async def synthesize_scene(
+        self, scene_data: Dict, base_filename: str, tts_provider: str, persona: Dict[str, Any]
+    ) -> Optional[Dict]:
+        """
+        Generate one scene's narration.
+        
+        The provider's output is ingested once into canonical PCM (see
+        audio_processing.ingest); 'filepath' points at that file and 'duration'
+        is its exact sample count over the sample rate.
+
+        Returns:
+            The scene dict extended with 'filepath', 'duration' and 'source_filepath', or None on failure
+        """
+        filepath = await self._generate_single_tts_segment_with_retries(
+            scene_data,
+            os.path.join(self.workspace_dir, f"tts_{base_filename}_{scene_data['id']}"),
+            tts_provider,
+            persona,
+        )
+        if not filepath:
+            return None
+        ingested = await asyncio.to_thread(ingest_audio, filepath)
+        if ingested:
+            await asyncio.to_thread(self.loudness.analyse, ingested.path)
+            return {**scene_data, "filepath": os.path.abspath(ingested.path),
+                    "duration": ingested.duration, "source_filepath": os.path.abspath(filepath)}
+        # No ffmpeg to ingest with: hand on the provider file as before
+        if (duration := self.get_audio_duration(filepath)) > 0:
+            return {**scene_data, "filepath": os.path.abspath(filepath),
+                    "duration": duration, "source_filepath": os.path.abspath(filepath)}
+        return None
+
+    def time_scene(self, segment: Dict) -> None:
+        """Fill one synthesized scene's `asr_word_timings` (alignment, ASR fallback)."""
+        self._transcribe_audio_segments_reliably([segment], log_summary=False)
+
     async def generate_and_process_audio(
         self, plan: VideoPlan, persona: Dict[str, Any]
     ) -> Dict[str, Dict]:
         base_filename = sanitize_filename(plan.video_title)
-        
-        # STRICT SINGLE PROVIDER: Choose once and NEVER switch
-        if self.speechify_client:
-            tts_provider = "speechify"
-            log.info("🎤 LOCKED to Speechify for entire video - no fallbacks allowed")
-        else:
-            tts_provider = "openai"
-            log.info("🎤 LOCKED to OpenAI TTS for entire video - no fallbacks allowed")
+        tts_provider = self.select_tts_provider()
         
         all_sub_scenes_with_ids = self._get_all_sub_scenes_with_ids(plan)
         log.info(f"Processing {len(all_sub_scenes_with_ids)} segments with SINGLE provider: {tts_provider}")
 
         # Generate TTS for all segments with SAME provider - FAIL if provider fails
         coroutines = [
-            self._generate_single_tts_segment_with_retries(
-                scene,
-                os.path.join(TEMP_ASSETS_DIR, f"tts_{base_filename}_{scene['id']}"),
-                tts_provider,
-                persona,
-            )
+            self.synthesize_scene(scene, base_filename, tts_provider, persona)
             for scene in all_sub_scenes_with_ids
         ]
         results = await asyncio_tqdm.gather(*coroutines, desc=f"Generating TTS with {tts_provider}")
@@ -148,14 +178,10 @@ class AudioService:
         processed_segments = {}
         failed_segments = 0
         
-        for seg_data, filepath in zip(all_sub_scenes_with_ids, results):
+        for seg_data, segment in zip(all_sub_scenes_with_ids, results):
             scene_id = seg_data["id"]
-            if filepath and (duration := self.get_audio_duration(filepath)) > 0:
-                processed_segments[scene_id] = {
-                    **seg_data,
-                    "filepath": os.path.abspath(filepath),
-                    "duration": duration,
-                }
+            if segment:
+                processed_segments[scene_id] = segment
             else:
                 failed_segments += 1
                 log.error(f"❌ Scene {scene_id} FAILED - no audio generated with {tts_provider}")
@@ -165,6 +191,8 @@ class AudioService:
         success_segments = len(processed_segments)
         
         log.info(f"🎤 TTS Results: {success_segments}/{total_segments} segments successful with {tts_provider}")
+        log.info(f"♻️ {self.tts_cache.summary()}")
+        log.info(f"🚦 {self.tts_scheduler.summary(tts_provider)}")
         
         if failed_segments > 0:
             log.warning(f"⚠️ {failed_segments} segments failed with {tts_provider} - NO FALLBACK USED")
@@ -218,6 +246,39 @@ class AudioService:
         ssml_body = f'<prosody rate="{default_rate}" pitch="{pitch}">{html.escape(script_text)}</prosody>'
         return f"<speak>{ssml_body}</speak>"
 
+    def _tts_cache_request(
+        self, scene_data: Dict, output_base: str, tts_provider: str, persona: Dict[str, Any]
+    ) -> Optional[Tuple[str, str, str]]:
+        """
+        Build the cache key for a TTS request.
+        
+        The key covers provider, voice, model, output format and the exact text
+        or SSML sent, so any change to the request produces a different entry.
+        
+        Returns:
+            (cache_key, output_filename, file_suffix), or None for unknown providers
+        """
+        narration_text = scene_data.get("narration")
+        if tts_provider == "speechify":
+            ssml_input = self._construct_consistent_ssml(
+                narration_text, scene_data.get("emotion", "neutral"), persona
+            )
+            key = make_cache_key("speechify", SPEECHIFY_DEFAULT_VOICE_ID, "default", "wav", ssml_input)
+            return key, f"{output_base}_speechify.wav", ".wav"
+        if tts_provider == "openai":
+            key = make_cache_key("openai", OPENAI_TTS_VOICE, OPENAI_TTS_MODEL, "mp3", narration_text)
+            return key, f"{output_base}_openai.mp3", ".mp3"
+        return None
+
+    async def _store_tts_in_cache(self, cache_request: Optional[Tuple[str, str, str]], output_filename: str):
+        if not cache_request:
+            return
+        cache_key, _, suffix = cache_request
+        try:
+            await asyncio.to_thread(self.tts_cache.put_file, cache_key, output_filename, suffix)
+        except OSError as e:
+            log.warning(f"⚠️ Could not store TTS output in cache: {e}")
+
     async def _generate_single_tts_segment_with_retries(
         self, scene_data: Dict, output_base: str, tts_provider: str, persona: Dict[str, Any]
     ) -> Optional[str]:
@@ -229,6 +290,14 @@ class AudioService:
         scene_id = scene_data.get("id", "unknown")
         max_retries = 3
         
+        # Serve from the persistent cache before any network call
+        cache_request = self._tts_cache_request(scene_data, output_base, tts_provider, persona)
+        if cache_request:
+            cache_key, cached_output, suffix = cache_request
+            if await asyncio.to_thread(self.tts_cache.materialize, cache_key, cached_output, suffix):
+                log.debug(f"♻️ {scene_id}: TTS served from cache")
+                return cached_output
+        
         log.debug(f"🎙️ Generating TTS for {scene_id} using ONLY {tts_provider} (max {max_retries} attempts)")
         
         for attempt in range(max_retries):
@@ -245,7 +314,8 @@ class AudioService:
                         narration_text, scene_data.get("emotion", "neutral"), persona
                     )
                     
-                    success = await asyncio.to_thread(
+                    success = await self.tts_scheduler.call(
+                        "speechify",
                         self._speechify_tts_sync_with_retries, 
                         ssml_input, 
                         SPEECHIFY_DEFAULT_VOICE_ID, 
@@ -255,6 +325,7 @@ class AudioService:
                     
                     if success:
                         log.debug(f"✅ {scene_id}: Speechify TTS succeeded on attempt {attempt + 1}")
+                        await self._store_tts_in_cache(cache_request, output_filename)
                         return output_filename
                     else:
                         log.warning(f"⚠️ {scene_id}: Speechify attempt {attempt + 1} failed")
@@ -262,7 +333,8 @@ class AudioService:
                 elif tts_provider == "openai":
                     output_filename = f"{output_base}_openai.mp3"
                     
-                    success = await asyncio.to_thread(
+                    success = await self.tts_scheduler.call(
+                        "openai",
                         self._openai_tts_sync_with_retries,
                         narration_text,
                         output_filename,
@@ -271,6 +343,7 @@ class AudioService:
                     
                     if success:
                         log.debug(f"✅ {scene_id}: OpenAI TTS succeeded on attempt {attempt + 1}")
+                        await self._store_tts_in_cache(cache_request, output_filename)
                         return output_filename
                     else:
                         log.warning(f"⚠️ {scene_id}: OpenAI attempt {attempt + 1} failed")
@@ -278,16 +351,20 @@ class AudioService:
                     log.error(f"❌ {scene_id}: Unknown TTS provider '{tts_provider}' - FAILING")
                     return None
                 
-                # Wait before retry (exponential backoff)
+                # Wait before retry (jittered exponential backoff)
                 if attempt < max_retries - 1:
-                    wait_time = 2 ** attempt  # 1s, 2s, 4s
-                    log.debug(f"⏳ {scene_id}: Waiting {wait_time}s before retry...")
+                    wait_time = self.tts_scheduler.backoff_delay(attempt)
+                    log.debug(f"⏳ {scene_id}: Waiting {wait_time:.1f}s before retry...")
                     await asyncio.sleep(wait_time)
-                    
+
+            except TTSRateLimitError:
+                # The scheduler already paused the provider for everyone; this
+                # caller just queues up behind that pause on its next attempt.
+                log.warning(f"🚦 {scene_id}: {tts_provider} rate limited on attempt {attempt + 1}")
             except Exception as e:
                 log.error(f"❌ {scene_id}: TTS attempt {attempt + 1} error: {e}")
                 if attempt < max_retries - 1:
-                    await asyncio.sleep(2 ** attempt)
+                    await asyncio.sleep(self.tts_scheduler.backoff_delay(attempt))
         
         # All retries failed - NO FALLBACK TO OTHER PROVIDER
         log.error(f"❌ {scene_id}: All {max_retries} attempts FAILED with {tts_provider} - NO FALLBACK, SEGMENT FAILED")
@@ -319,6 +396,9 @@ class AudioService:
                 return False
                 
         except Exception as e:
+            rate_limited = rate_limit_from_exception(e)
+            if rate_limited:
+                raise rate_limited from e
             log.warning(f"⚠️ Speechify API error on attempt {attempt_num}: {e}")
             return False
 
@@ -347,37 +427,74 @@ class AudioService:
                 return False
                 
         except Exception as e:
+            rate_limited = rate_limit_from_exception(e)
+            if rate_limited:
+                raise rate_limited from e
             log.warning(f"⚠️ OpenAI API error on attempt {attempt_num}: {e}")
             return False
 
-    def _transcribe_audio_segments_reliably(self, audio_segments: List[Dict]):
+    def _align_known_narration(self, seg: Dict) -> Optional[List[Dict]]:
+        """
+        Word timings from forced alignment of the segment's known narration.
+        
+        Returns:
+            Timings when alignment is confident enough, else None (use ASR)
+        """
+        narration = seg.get("narration")
+        if not narration:
+            return None
+        try:
+            result = align_text_to_audio(narration, seg["filepath"])
+        except Exception as e:
+            log.debug(f"Alignment failed for {seg.get('id')}: {e}")
+            return None
+        if result.confidence < ALIGNMENT_MIN_CONFIDENCE:
+            log.debug(f"Alignment confidence {result.confidence:.2f} for {seg.get('id')} "
+                      f"below {ALIGNMENT_MIN_CONFIDENCE}{f' ({result.reason})' if result.reason else ''}")
+            return None
+        return result.word_timings
+
+    def _clean_word_timings(self, raw_words: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Normalize ASR output into validated `asr_word_timings` entries."""
+        word_timings = []
+        for word in raw_words:
+            # Clean and validate word data
+            word_data = {
+                "word": str(word["word"]).strip(),
+                "start": float(word["start"]),
+                "end": float(word["end"])
+            }
+            # Basic validation
+            if (word_data["word"] and 
+                0 <= word_data["start"] < word_data["end"] <= 30.0):  # Reasonable bounds
+                word_timings.append(word_data)
+        return word_timings
+
+    def _transcribe_audio_segments_reliably(self, audio_segments: List[Dict], log_summary: bool = True):
         """
         Transcribe audio segments with reliable subtitle generation.
         
         This method ensures every segment gets word timings for subtitles,
-        with smart memory management and error recovery.
+        with smart memory management and error recovery. The known narration
+        is force-aligned first; the ASR model only runs (and is only loaded)
+        for segments where alignment confidence is low. Those are transcribed
+        together in a single batched pass when ASR_BATCH is enabled.
         """
         if not audio_segments:
             log.warning("No audio segments to transcribe")
             return
 
-        # Load ASR model
-        model = self._get_or_load_asr_model()
-        if not model:
-            log.error("❌ Cannot generate subtitles - Whisper model unavailable")
-            # Set empty timings to prevent crashes
-            for seg in audio_segments:
-                seg["asr_word_timings"] = []
-            return
-
-        log.info(f"🎙️ Transcribing {len(audio_segments)} audio files for subtitles...")
+        if log_summary:
+            log.info(f"🎙️ Timing {len(audio_segments)} audio files for subtitles...")
         
         successful_transcriptions = 0
         failed_transcriptions = 0
+        aligned_segments = 0
+        needs_asr: List[Dict] = []
         
         for i, seg in enumerate(audio_segments):
             filepath = seg.get("filepath")
-            scene_id = seg.get("id", f"segment_{i}")
+            scene_id = seg.setdefault("id", f"segment_{i}")
             
             if not filepath or not os.path.exists(filepath):
                 log.warning(f"⚠️ Audio file missing for {scene_id} - no subtitles for this segment")
@@ -385,34 +502,34 @@ class AudioService:
                 failed_transcriptions += 1
                 continue
             
+            if (word_timings := self._align_known_narration(seg)) is not None:
+                seg["asr_word_timings"] = word_timings
+                successful_transcriptions += 1
+                aligned_segments += 1
+                log.debug(f"✅ {scene_id}: Aligned {len(word_timings)} subtitle words")
+                continue
+            needs_asr.append(seg)
+        
+        if needs_asr:
+            # Load ASR model only once a segment actually needs it
+            model = self._get_or_load_asr_model()
+            if not model:
+                log.error(f"❌ Cannot generate subtitles for {len(needs_asr)} segments - ASR model unavailable")
+                for seg in needs_asr:
+                    # Set empty timings to prevent crashes
+                    seg["asr_word_timings"] = []
+                failed_transcriptions += len(needs_asr)
+                needs_asr = []
+            elif ASR_BATCH and len(needs_asr) > 1:
+                needs_asr, batched_ok = self._transcribe_batch(model, needs_asr)
+                successful_transcriptions += batched_ok
+        
+        for seg in needs_asr:
+            scene_id = seg["id"]
             try:
-                log.debug(f"Transcribing {scene_id}: {os.path.basename(filepath)}")
-                
-                # Transcribe with optimized settings for subtitle generation
-                result = model.transcribe(
-                    filepath,
-                    word_timestamps=True,
-                    fp16=False,  # More stable on CPU
-                    language='en',  # Specify language for better performance
-                    condition_on_previous_text=False  # Each segment independent
-                )
-                
-                # Extract word-level timings
-                word_timings = []
-                for segment in result.get("segments", []):
-                    for word in segment.get("words", []):
-                        if all(key in word for key in ["word", "start", "end"]):
-                            # Clean and validate word data
-                            word_data = {
-                                "word": str(word["word"]).strip(),
-                                "start": float(word["start"]),
-                                "end": float(word["end"])
-                            }
-                            # Basic validation
-                            if (word_data["word"] and 
-                                0 <= word_data["start"] < word_data["end"] <= 30.0):  # Reasonable bounds
-                                word_timings.append(word_data)
+                log.debug(f"Transcribing {scene_id}: {os.path.basename(seg['filepath'])}")
                 
+                word_timings = self._clean_word_timings(model.transcribe(seg["filepath"], language='en'))
                 seg["asr_word_timings"] = word_timings
                 successful_transcriptions += 1
                 
@@ -421,9 +538,8 @@ class AudioService:
                 else:
                     log.warning(f"⚠️ {scene_id}: Transcription succeeded but no word timings extracted")
                 
-                # Periodic memory cleanup during long transcription sessions
-                if i % 3 == 0:  # Every 3 transcriptions
-                    gc.collect()
+                # Memory cleanup during long transcription sessions, only under real pressure
+                get_resource_monitor().collect_if_pressure(f"transcribe {scene_id}")
                     
             except Exception as e:
                 log.error(f"❌ Transcription failed for {scene_id}: {e}")
@@ -432,14 +548,40 @@ class AudioService:
                 continue
         
         # Final transcription summary
+        if not log_summary:
+            return
         total_segments = len(audio_segments)
-        log.info(f"🎬 Subtitle generation complete: {successful_transcriptions}/{total_segments} successful")
+        log.info(f"🎬 Subtitle generation complete: {successful_transcriptions}/{total_segments} successful "
+                 f"({aligned_segments} force-aligned, {successful_transcriptions - aligned_segments} via ASR)")
         
         if failed_transcriptions > 0:
             log.warning(f"⚠️ {failed_transcriptions} segments have no subtitles")
         
         if successful_transcriptions == 0:
             log.error("❌ No subtitles generated - all transcriptions failed")
+
+    def _transcribe_batch(self, model: Any, segments: List[Dict]) -> Tuple[List[Dict], int]:
+        """
+        Transcribe `segments` in one batched ASR pass.
+        
+        Returns:
+            (segments still needing per-file transcription, number transcribed here)
+        """
+        try:
+            batched = transcribe_batched(
+                model, [seg["filepath"] for seg in segments],
+                max_batch_seconds=ASR_BATCH_MAX_SECONDS, workdir=self.workspace_dir
+            )
+        except Exception as e:
+            log.warning(f"⚠️ Batched transcription failed ({e}) - transcribing files individually")
+            return segments, 0
         
-        # Keep the model loaded for potential future use in the same session
-        # It will be cleaned up when the service is destroyed
\ No newline at end of file
+        leftovers = []
+        for seg, raw_words in zip(segments, batched):
+            if raw_words is None:
+                leftovers.append(seg)
+                continue
+            seg["asr_word_timings"] = self._clean_word_timings(raw_words)
+            log.debug(f"✅ {seg['id']}: Generated {len(seg['asr_word_timings'])} subtitle words (batched)")
+        get_resource_monitor().collect_if_pressure("batched transcription")
+        return leftovers, len(segments) - len(leftovers)
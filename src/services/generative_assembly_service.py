@@ -4,36 +4,67 @@ It uses the re-architected VideoEditor to compose and render the video reliably.
 """
 # --- Standard Library Imports ---
 import logging
-from typing import Dict, Any, Optional
+import os
+from typing import Dict, Any, List, Optional
 
 # --- Third-Party Imports ---
 from moviepy.editor import AudioFileClip, concatenate_audioclips
 
 # --- Local Application Imports ---
+from audio_processing import mix_narration_with_music
 # We now need SubScene and TextOverlay to manually build the CTA scene
+from config import NARRATION_TARGET_LUFS, RENDER_BACKEND, TEMP_ASSETS_DIR
 from models import VideoPlan, SubScene, TextOverlay
-from video_processing.editor import VideoEditor
+from video_processing.contact_sheet import write_contact_sheet
+from video_processing.editor import VideoEditor, VideoProcessingError
+from video_processing.ffmpeg_backend import FFmpegRenderBackend
+from video_processing.parallel_renderer import ParallelSegmentRenderer
+from video_processing.render_plan import (
+    BACKEND_FFMPEG, BACKEND_MOVIEPY, BACKEND_PARALLEL, BACKEND_STREAMING, RenderJob, SegmentSpec
+)
+from video_processing.streaming_renderer import StreamingTimelineRenderer
+from utils import sanitize_filename
 from services.media_service import MediaService
 from services.audio_service import AudioService
 
 log = logging.getLogger(__name__)
 
 class GenerativeAssemblyService:
-    def __init__(self, editor: VideoEditor, media_service: MediaService, audio_service: AudioService):
+    def __init__(
+        self,
+        editor: VideoEditor,
+        media_service: MediaService,
+        audio_service: AudioService,
+        render_backend: Optional[str] = None,
+        workspace_dir: str = TEMP_ASSETS_DIR,
+        render_workers: Optional[int] = None
+    ):
         self.editor = editor
         self.media_service = media_service
         self.audio_service = audio_service
+        self.render_backend = render_backend or RENDER_BACKEND
+        # Scratch directory for the mix, and the encoder process cap of the parallel backend
+        self.workspace_dir = workspace_dir
+        self.render_workers = render_workers
 
-    async def assemble_video(
+    @staticmethod
+    def cta_overlay(plan: VideoPlan) -> Optional[TextOverlay]:
+        """Overlay shown on the Call to Action scene, if the plan has one."""
+        if not plan.call_to_action_text:
+            return None
+        # **THE FIX**: Use integer 999 instead of string "cta" for scene_id
+        return TextOverlay(
+            text_content=plan.call_to_action_text,
+            scene_id=999
+        )
+
+    def build_render_job(
         self, plan: VideoPlan, processed_audio: Dict, media_assets: Dict
-    ):
+    ) -> RenderJob:
         """
-        Assembles the video using the re-architected VideoEditor.
-        This method processes each scene into a uniform clip, mixes the final audio,
-        and then renders the complete video.
+        Describe the video as a backend-neutral RenderJob.
+        Scenes without both a visual and a narration file are skipped.
         """
-        log.info(f"🚀 Starting generative assembly for '{plan.video_title}'...")
-
         # --- 1. Create a flattened list of all scenes to process ---
         scene_map = []
         for i, section in enumerate(plan.sections):
@@ -41,12 +72,8 @@ class GenerativeAssemblyService:
                 scene_map.append({"scene": sub_scene, "id": f"{i}_{j}"})
 
         # Manually create the Call to Action scene object
+        cta_overlay = self.cta_overlay(plan)
         if plan.call_to_action_text:
-            # **THE FIX**: Use integer 999 instead of string "cta" for scene_id
-            cta_overlay = TextOverlay(
-                text_content=plan.call_to_action_text,
-                scene_id=999
-            )
             cta_scene = SubScene(
                 narration_text=plan.call_to_action_text,
                 visual_search_query="abstract background",
@@ -54,50 +81,172 @@ class GenerativeAssemblyService:
             )
             scene_map.append({"scene": cta_scene, "id": "cta"})
 
-        # --- 2. Process all video segments into a uniform list ---
-        processed_segments = []
-        narration_clips = []
+        # --- 2. Collect the inputs of every segment ---
+        job = RenderJob(
+            title=self.editor.profile.output_title(plan.video_title), music_path=media_assets.get("music")
+        )
         for scene_item in scene_map:
-            scene_obj = scene_item["scene"]
             scene_id = scene_item["id"]
+            audio_data = processed_audio.get(scene_id, {})
 
             video_path = media_assets.get("visuals", {}).get(scene_id)
-            audio_path = processed_audio.get(scene_id, {}).get("filepath")
-            
+            audio_path = audio_data.get("filepath")
+
             if not video_path or not audio_path:
                 log.warning(f"Missing video or audio asset for scene {scene_id}. Skipping.")
                 continue
-            
+
+            job.segments.append(SegmentSpec(
+                scene_id=scene_id,
+                source_path=video_path,
+                duration=audio_data.get("duration", 0.0),
+                overlay_plan=cta_overlay if scene_id == "cta" else None,
+                caption_data=audio_data.get("asr_word_timings")
+            ))
+            job.narration_paths.append(audio_path)
+        return job
+
+    async def assemble_video(
+        self, plan: VideoPlan, processed_audio: Dict, media_assets: Dict
+    ):
+        """
+        Assembles the video using the configured render backend.
+        The selected backend is tried first; the in-memory moviepy path is the
+        fallback for anything the others cannot render. Timelines with more
+        segments than fit in RAM are streamed rather than truncated.
+        """
+        log.info(f"🚀 Starting generative assembly for '{plan.video_title}'...")
+
+        job = self.build_render_job(plan, processed_audio, media_assets)
+        if not job.segments:
+            log.error("No clips were assembled. Aborting render.")
+            return
+
+        output_path = self._render_job(job)
+        if output_path and self.editor.profile.contact_sheet:
+            self.write_contact_sheet(job, output_path)
+        return output_path
+
+    def write_contact_sheet(self, job: RenderJob, video_path: str) -> Optional[str]:
+        """Storyboard of `video_path` with one frame from the middle of each segment."""
+        scenes, cursor = [], 0.0
+        for spec in job.segments:
+            scenes.append((spec.scene_id, cursor + spec.duration / 2))
+            cursor += spec.duration
+        try:
+            return write_contact_sheet(video_path, scenes, f"{os.path.splitext(video_path)[0]}_storyboard.jpg")
+        except (OSError, ValueError) as e:
+            log.warning(f"⚠️ Contact sheet failed: {e}")
+            return None
+
+    def _render_job(self, job: RenderJob) -> Optional[str]:
+        """Render with the configured backend, falling back to moviepy."""
+        if self.render_backend == BACKEND_FFMPEG:
+            backend = FFmpegRenderBackend(self.editor, workspace_dir=self.workspace_dir)
+            supported, reason = backend.supports(job)
+            if supported:
+                try:
+                    return backend.render(job, self._write_mixed_audio(job))
+                except VideoProcessingError as e:
+                    log.warning(f"⚠️ ffmpeg backend failed ({e}). Falling back to moviepy.")
+            else:
+                log.warning(f"⚠️ ffmpeg backend unsupported for this job ({reason}). Falling back to moviepy.")
+
+        elif self.render_backend == BACKEND_PARALLEL:
+            try:
+                audio_path = self._write_mixed_audio(job)
+                renderer = ParallelSegmentRenderer(self.editor, self.render_workers, self.workspace_dir)
+                return renderer.render(job, audio_path)
+            except VideoProcessingError as e:
+                log.warning(f"⚠️ Parallel render failed ({e}). Falling back to moviepy.")
+
+        max_clips = self.editor._update_system_metrics().recommended_max_clips
+        if self.render_backend == BACKEND_STREAMING or (
+            self.render_backend == BACKEND_MOVIEPY and len(job.segments) > max_clips
+        ):
+            if self.render_backend == BACKEND_MOVIEPY:
+                log.info(f"{len(job.segments)} segments exceed the in-memory budget ({max_clips}). "
+                         f"Switching to streaming render.")
+            try:
+                audio_path = self._write_mixed_audio(job)
+                return StreamingTimelineRenderer(self.editor).render(job, audio_path)
+            except VideoProcessingError as e:
+                log.warning(f"⚠️ Streaming render failed ({e}). Falling back to moviepy.")
+
+        return self._render_with_moviepy(job)
+
+    def _write_mixed_audio(self, job: RenderJob) -> Optional[str]:
+        """Mix narration and music once into a WAV that every renderer just muxes."""
+        if not job.narration_paths:
+            return None
+        audio_path = os.path.join(self.workspace_dir, f"mix_{sanitize_filename(job.title)}.wav")
+        try:
+            # Profiles are normally cached already (narration right after TTS)
+            loudness = self.audio_service.loudness
+            narration_profiles = loudness.analyse_many(job.narration_paths)
+            music_profile = loudness.analyse(job.music_path) if job.music_path else None
+            mixed = mix_narration_with_music(
+                job.narration_paths, job.music_path, audio_path, job.ducking_level,
+                narration_profiles=narration_profiles,
+                music_profile=music_profile,
+                narration_target_lufs=NARRATION_TARGET_LUFS
+            )
+            log.debug(loudness.summary())
+        except (OSError, ValueError, MemoryError) as e:
+            log.warning(f"⚠️ numpy audio mix failed ({e}). Falling back to moviepy mix.")
+            mixed = None
+        return mixed or self._write_mixed_audio_with_moviepy(job, audio_path)
+
+    def _write_mixed_audio_with_moviepy(self, job: RenderJob, audio_path: str) -> Optional[str]:
+        """Fallback mix through moviepy clips (slow, but needs no ffmpeg binary of our own)."""
+        narration_clips = [AudioFileClip(path) for path in job.narration_paths]
+        if not narration_clips:
+            return None
+        full_narration = concatenate_audioclips(narration_clips)
+        final_audio_track = self.audio_service.mix_audio_with_narration(
+            full_narration, job.music_path, job.ducking_level
+        )
+        try:
+            final_audio_track.write_audiofile(audio_path, fps=44100, logger=None)
+            return audio_path
+        finally:
+            final_audio_track.close()
+            full_narration.close()
+            for clip in narration_clips:
+                clip.close()
+
+    def _render_with_moviepy(self, job: RenderJob) -> Optional[str]:
+        """
+        This method processes each scene into a uniform clip, mixes the final audio,
+        and then renders the complete video.
+        """
+        # --- 1. Process all video segments into a uniform list ---
+        processed_segments = []
+        narration_clips: List[AudioFileClip] = []
+        for spec, audio_path in zip(job.segments, job.narration_paths):
             narration_clip = AudioFileClip(audio_path)
             narration_clips.append(narration_clip)
-            
-            # Don't pass text_overlay since SubScene doesn't have that attribute
+
             segment = self.editor.process_segment(
-                source_path=video_path,
+                source_path=spec.source_path,
                 duration=narration_clip.duration,
-                overlay_plan=cta_overlay if scene_id == "cta" else None,
-                caption_data=processed_audio.get(scene_id, {}).get("asr_word_timings")
+                overlay_plan=spec.overlay_plan,
+                caption_data=spec.caption_data
             )
             processed_segments.append(segment)
-        
-        if not processed_segments:
-            log.error("No clips were assembled. Aborting render.")
-            return
 
-        # --- 3. Create the final audio track ---
-        full_narration = concatenate_audioclips(narration_clips)
-        music_path = media_assets.get("music")
-        final_audio_track = self.audio_service.mix_audio_with_narration(full_narration, music_path)
-        
-        # --- 4. Render the final video ---
-        self.editor.render_video(
+        # --- 2. Create the final audio track (mixed once to a WAV) ---
+        final_audio_track = AudioFileClip(self._write_mixed_audio(job))
+
+        # --- 3. Render the final video ---
+        output_path = self.editor.render_video(
             clips=processed_segments,
             audio_track=final_audio_track,
-            title=plan.video_title
+            title=job.title
         )
 
         # Clean up audio clips to free memory
-        full_narration.close()
         final_audio_track.close()
         for clip in narration_clips:
-            clip.close()
\ No newline at end of file
+            clip.close()
+        return output_path
@@ -9,50 +9,157 @@ import asyncio
 import logging
 import os
 import random
-from typing import Any, Dict, Optional, Tuple
+import shutil
+import time
+from typing import Any, Dict, List, Optional, Tuple
 
 # --- Third-Party Imports ---
-import requests
 from tqdm.asyncio import tqdm as asyncio_tqdm
 
 # --- Local Application Imports ---
+from cache import MediaCache, SearchCache
 from config import (
     PEXELS_API_KEY, PIXABAY_API_KEY, MAX_RETRIES,
-    REQUEST_TIMEOUT, TEMP_ASSETS_DIR
+    REQUEST_TIMEOUT, TEMP_ASSETS_DIR, MEDIA_CACHE_DIR, MEDIA_CACHE_MAX_BYTES,
+    SEARCH_CACHE_DIR, SEARCH_CACHE_TTL, VIDEO_DIMS,
+    HTTP_MAX_CONNECTIONS, HTTP_MAX_PER_HOST, HTTP_MAX_CONCURRENCY, MUSIC_SEARCH_STAGGER,
+    MUSIC_LIBRARY_DIR, MUSIC_LIBRARY_INDEX, MEZZANINE, MEZZANINE_WORKERS, MEZZANINE_MAX_SECONDS
 )
+from http_client import HttpClientError, get_http_client
 from models import VideoPlan
+from services.music_library import MusicLibrary
 from utils import sanitize_filename
+from video_processing.mezzanine import MezzaninePool
+from video_processing.render_plan import PROFILE_FULL, RenderProfile
 
 log = logging.getLogger(__name__)
 
+# --- Pexels Rendition Selection ---
+def _rendition_coverage(video_file: Dict[str, Any], target_dims: Tuple[int, int]) -> float:
+    """
+    Scale factor of the centre crop to the target aspect relative to the target size.
+    >= 1.0 means the rendition can be cropped and downscaled without upscaling.
+    """
+    width, height = video_file.get("width") or 0, video_file.get("height") or 0
+    return min(width / target_dims[0], height / target_dims[1])
+
+def _rendition_bytes(video_file: Dict[str, Any]) -> Tuple[int, bool]:
+    """(size in bytes, exact) - Pexels omits `size` for some files, so fall back to pixel rate."""
+    if video_file.get("size"):
+        return int(video_file["size"]), True
+    width, height = video_file.get("width") or 0, video_file.get("height") or 0
+    fps = video_file.get("fps") or 30
+    # ~0.1 bits per pixel per frame, a typical stock H.264 rate; 10s assumed clip length
+    return int(width * height * fps * 0.1 / 8 * 10), False
+
+def select_pexels_rendition(
+    video_files: List[Dict[str, Any]], target_dims: Tuple[int, int]
+) -> Optional[Dict[str, Any]]:
+    """
+    Pick the smallest MP4 rendition that still covers `target_dims` after the editor's crop.
+
+    Portrait renditions are preferred among those that cover the target. If none
+    covers it, the rendition closest to covering it (largest crop) is returned.
+
+    Args:
+        video_files: The `video_files` list of a Pexels video
+        target_dims: (width, height) the editor renders at
+
+    Returns:
+        The chosen video file dict, or None if there is no MP4 rendition
+    """
+    mp4_files = [
+        vf for vf in video_files
+        if ".mp4" in vf.get("link", "") and vf.get("width") and vf.get("height")
+    ]
+    if not mp4_files:
+        return None
+
+    covering = [vf for vf in mp4_files if _rendition_coverage(vf, target_dims) >= 1.0]
+    if covering:
+        return min(covering, key=lambda vf: (vf["height"] < vf["width"], _rendition_bytes(vf)[0]))
+    return max(mp4_files, key=lambda vf: (_rendition_coverage(vf, target_dims), vf["height"] >= vf["width"]))
+
 class MediaService:
-    def __init__(self):
-        """Initialize with API key validation."""
+    def __init__(self, target_dims: Tuple[int, int] = VIDEO_DIMS, render_profile: RenderProfile = PROFILE_FULL,
+                 workspace_dir: str = TEMP_ASSETS_DIR):
+        """
+        Initialize with API key validation.
+
+        Renditions are always chosen for the full `target_dims`, so preview
+        renders reuse the same cached downloads; only the mezzanines follow
+        the render profile. Downloads are materialized into `workspace_dir`.
+        """
+        self.workspace_dir = workspace_dir
         self.has_pixabay = bool(PIXABAY_API_KEY)
         self.has_pexels = bool(PEXELS_API_KEY)
+        self.target_dims = target_dims
+        self.http = get_http_client(HTTP_MAX_CONNECTIONS, HTTP_MAX_PER_HOST, HTTP_MAX_CONCURRENCY)
+        self.rendition_stats = {"downloads": 0, "bytes": 0, "largest_bytes": 0}
+        self.music_search_stats: Dict[str, Any] = {"searches_launched": 0}
+        self.music_library = (
+            MusicLibrary(MUSIC_LIBRARY_DIR, MUSIC_LIBRARY_INDEX)
+            if MUSIC_LIBRARY_DIR and os.path.isdir(MUSIC_LIBRARY_DIR) else None
+        )
+        # Persistent caches shared across scenes, jobs and runs
+        self.search_cache = SearchCache(SEARCH_CACHE_DIR, SEARCH_CACHE_TTL)
+        self.media_cache = MediaCache(MEDIA_CACHE_DIR, MEDIA_CACHE_MAX_BYTES)
+        # Background transcodes to render-ready mezzanines, overlapping with downloads and TTS
+        self.mezzanine = (
+            MezzaninePool(render_profile.frame_size(target_dims), os.path.join(workspace_dir, "mezzanine"),
+                          MEZZANINE_WORKERS, MEZZANINE_MAX_SECONDS, fps=render_profile.fps)
+            if MEZZANINE and shutil.which("ffmpeg") else None
+        )
         
         log.info(f"MediaService initialized - Pexels: {'✅' if self.has_pexels else '❌'}, Pixabay: {'✅' if self.has_pixabay else '❌'}")
         
-        if not self.has_pixabay:
+        if not self.has_pixabay and not self.music_library:
             log.warning("⚠️ PIXABAY_API_KEY not configured - background music will be unavailable")
 
+    @staticmethod
+    def scene_video_queries(plan: VideoPlan) -> Dict[str, str]:
+        """Stock video search query per scene id, including the CTA scene."""
+        queries = {
+            f"{i}_{j}": sub_scene.visual_search_query
+            for i, section in enumerate(plan.sections)
+            for j, sub_scene in enumerate(section.sub_scenes)
+        }
+        if plan.call_to_action_text:
+            queries["cta"] = "motivational hopeful background"
+        return queries
+
+    async def fetch_scene_video(self, query: str, scene_id: str) -> Optional[str]:
+        """Absolute path of the downloaded stock video for one scene, or None."""
+        result = await self._fetch_video_from_pexels(query, scene_id)
+        return os.path.abspath(result[1]) if result else None
+
+    async def scene_mezzanine(self, video_path: str, duration: Optional[float] = None) -> str:
+        """Mezzanine of a downloaded clip covering `duration` seconds, or the clip itself if none was made."""
+        if not self.mezzanine:
+            return video_path
+        mezzanine_path = await self.mezzanine.transcode(video_path, duration)
+        return os.path.abspath(mezzanine_path) if mezzanine_path else video_path
+
+    async def _fetch_scene_visual(self, query: str, scene_id: str) -> Optional[Tuple[str, str]]:
+        """Download a scene's clip, then swap in its mezzanine (whole clips only: the duration is unknown)."""
+        result = await self._fetch_video_from_pexels(query, scene_id)
+        if not result:
+            return result
+        return scene_id, await self.scene_mezzanine(result[1])
+
+    async def fetch_background_music(self, plan: VideoPlan) -> Optional[str]:
+        """Absolute path of the plan's background music, or None."""
+        music_path = await self._fetch_background_music_reliably(plan.background_music_suggestion)
+        return os.path.abspath(music_path) if music_path else None
+
     async def get_assets_for_plan(self, plan: VideoPlan) -> Dict[str, Any]:
         """Fetch all media assets with parallel processing."""
-        # Prepare video download tasks
+        # Prepare video download tasks (CTA included)
         video_tasks = [
-            self._fetch_video_from_pexels(
-                sub_scene.visual_search_query, f"{i}_{j}"
-            )
-            for i, section in enumerate(plan.sections)
-            for j, sub_scene in enumerate(section.sub_scenes)
+            self._fetch_scene_visual(query, scene_id)
+            for scene_id, query in self.scene_video_queries(plan).items()
         ]
         
-        # Add CTA video task
-        if plan.call_to_action_text:
-            video_tasks.append(
-                self._fetch_video_from_pexels("motivational hopeful background", "cta")
-            )
-        
         # Create music download task
         music_task = asyncio.create_task(
             self._fetch_background_music_reliably(plan.background_music_suggestion)
@@ -75,6 +182,13 @@ class MediaService:
         # Log final results
         log.info(f"📹 Videos: {len(visuals)}/{len(video_tasks)} successful")
         log.info(f"🎵 Music: {'✅ Available' if music_path else '❌ Failed'}")
+        log.info(f"♻️ {self.media_cache.cache.summary()}; {self.search_cache.cache.summary()}")
+        if self.mezzanine:
+            log.info(f"🎞️ {self.mezzanine.summary()}")
+        if self.rendition_stats["downloads"]:
+            saved_mb = (self.rendition_stats["largest_bytes"] - self.rendition_stats["bytes"]) / (1024 * 1024)
+            log.info(f"📉 Rendition selection saved ~{saved_mb:.0f}MB over "
+                     f"{self.rendition_stats['downloads']} video downloads vs largest-first")
         
         return {
             "music": os.path.abspath(music_path) if music_path else None,
@@ -85,11 +199,35 @@ class MediaService:
         """
         Fetch background music with multiple fallback strategies.
         
-        This method tries multiple approaches to ensure music is always found:
+        The strategies run as hedged searches, from specific to generic:
         1. Exact search query
         2. Simplified search terms  
         3. Generic fallback searches
+        
+        Each strategy starts MUSIC_SEARCH_STAGGER seconds after the previous one,
+        or immediately once the previous one comes back empty. The first usable
+        hit wins, the remaining searches are cancelled and only the winning
+        track is downloaded.
+        
+        A configured local music library is consulted first; the network is
+        only used when nothing in it matches the suggestion.
         """
+        # Stats describe this plan's music lookup only, not the service's lifetime
+        self.music_search_stats = {"searches_launched": 0}
+        if self.music_library:
+            started = time.monotonic()
+            try:
+                track = await asyncio.to_thread(self.music_library.find, music_suggestion)
+            except Exception as e:
+                log.warning(f"⚠️ Local music library lookup failed: {e}")
+                track = None
+            if track:
+                latency = time.monotonic() - started
+                self.music_search_stats.update(strategy="library", latency_s=round(latency, 3))
+                log.info(f"✅ Music from local library: '{track.title}' ({track.duration:.0f}s, "
+                         f"{track.tempo_bpm:.0f} BPM) in {latency * 1000:.0f}ms")
+                return track.path
+        
         if not self.has_pixabay:
             log.error("❌ Cannot fetch music - PIXABAY_API_KEY not configured")
             return None
@@ -104,28 +242,67 @@ class MediaService:
             "instrumental",  # Even more generic
             "music"  # Last resort
         ]
+        queries = list(dict.fromkeys(q for q in search_strategies if q))  # Drop empties and repeats
         
-        for attempt, query in enumerate(search_strategies, 1):
-            if not query or query == music_suggestion and attempt > 1:
-                continue  # Skip if same as previous or empty
-                
-            log.debug(f"🎵 Music search attempt {attempt}: '{query}'")
+        started = time.monotonic()
+        while queries:
+            winner = await self._hedged_music_search(queries)
+            latency = time.monotonic() - started
+            if not winner:
+                break
             
-            try:
-                music_path = await self._fetch_music_from_pixabay_with_query(query)
-                if music_path:
-                    log.info(f"✅ Music found with query '{query}' on attempt {attempt}")
-                    return music_path
-                else:
-                    log.debug(f"⚠️ No music found for '{query}'")
-                    
-            except Exception as e:
-                log.warning(f"⚠️ Music search failed for '{query}': {e}")
-                continue
+            attempt, query, track = winner
+            self.music_search_stats.update(strategy=query, latency_s=round(latency, 2))
+            log.info(f"✅ Music found with query '{query}' (strategy {attempt}/{len(queries)}) in {latency:.1f}s")
+            music_path = await self._download_pixabay_track(track, query)
+            if music_path:
+                return music_path
+            # Winner's download failed: fall back to the strategies after it
+            queries = queries[attempt:]
         
+        self.music_search_stats.update(strategy=None, latency_s=round(time.monotonic() - started, 2))
         log.error("❌ All music search strategies failed - no background music available")
         return None
 
+    async def _hedged_music_search(self, queries: List[str]) -> Optional[Tuple[int, str, Dict[str, Any]]]:
+        """
+        Run Pixabay searches for `queries` as staggered hedged requests.
+        
+        Returns:
+            (1-based strategy number, query, selected track) of the first hit, or None
+        """
+        pending: Dict[asyncio.Task, Tuple[int, str]] = {}
+        remaining = list(enumerate(queries, 1))
+        try:
+            while remaining or pending:
+                if remaining:
+                    attempt, query = remaining.pop(0)
+                    log.debug(f"🎵 Music search attempt {attempt}: '{query}'")
+                    pending[asyncio.create_task(self._search_pixabay_track(query))] = (attempt, query)
+                    self.music_search_stats["searches_launched"] += 1
+                
+                done, _ = await asyncio.wait(
+                    pending, timeout=MUSIC_SEARCH_STAGGER if remaining else None,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                # Prefer the most specific strategy when several land together
+                for task in sorted(done, key=lambda t: pending[t][0]):
+                    attempt, query = pending.pop(task)
+                    try:
+                        track = task.result()
+                    except Exception as e:
+                        log.warning(f"⚠️ Music search failed for '{query}': {e}")
+                        continue
+                    if track:
+                        return attempt, query, track
+                    log.debug(f"⚠️ No music found for '{query}'")
+            return None
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
     def _simplify_music_query(self, original_query: str) -> str:
         """
         Simplify music search query to increase chances of finding results.
@@ -158,8 +335,8 @@ class MediaService:
         else:
             return "background music"
 
-    async def _fetch_music_from_pixabay_with_query(self, query: str) -> Optional[str]:
-        """Fetch music from Pixabay with a specific query."""
+    async def _search_pixabay_track(self, query: str) -> Optional[Dict[str, Any]]:
+        """Search Pixabay with a specific query and pick a suitable track (no download)."""
         if not self.has_pixabay or not query:
             return None
             
@@ -174,121 +351,161 @@ class MediaService:
             "category": "music"
         }
         
+        tracks = await self._cached_search("pixabay", url, params)
+        if tracks is None:
+            log.warning(f"⚠️ All {MAX_RETRIES} attempts failed for music query '{query}'")
+            return None
+        tracks = tracks.get("hits", [])
+        
+        if not tracks:
+            log.debug(f"No tracks found for '{query}'")
+            return None
+        
+        # Filter tracks for better quality
+        suitable_tracks = []
+        for track in tracks:
+            duration = track.get("duration", 0)
+            download_url = track.get("downloadURL")
+            
+            if download_url and duration >= 30:  # At least 30 seconds
+                suitable_tracks.append(track)
+        
+        if not suitable_tracks:
+            log.debug(f"No suitable tracks found for '{query}' (duration/download issues)")
+            return None
+        
+        # Select random track from suitable options, preferring ones already cached
+        return self._prefer_cached(
+            suitable_tracks, lambda t: ("pixabay", t.get("id"), "mp3", ".mp3")
+        )
+
+    async def _download_pixabay_track(self, selected_track: Dict[str, Any], query: str) -> Optional[str]:
+        """Download (or reuse from the media cache) the chosen Pixabay track."""
+        track_id = selected_track.get("id")
+        download_url = selected_track["downloadURL"]
+        duration = selected_track.get("duration", 0)
+        
+        log.debug(f"📥 Fetching track {track_id} ({duration}s) from Pixabay...")
+        
+        filename = f"pixabay_music_{track_id}.mp3"
+        filepath = await self.media_cache.fetch(
+            "pixabay", track_id, "mp3", ".mp3",
+            downloader=lambda tmp_path: self._download_file(
+                download_url, tmp_path, min_bytes=10000, timeout=REQUEST_TIMEOUT * 2
+            ),
+            dest_path=os.path.join(self.workspace_dir, filename),
+            extra_metadata={"source_url": download_url, "query": query, "duration": duration}
+        )
+        
+        # Verify file was downloaded
+        if filepath:
+            file_size_mb = os.path.getsize(filepath) / (1024 * 1024)
+            log.info(f"✅ Music ready: {filename} ({file_size_mb:.1f}MB, {duration}s)")
+            return filepath
+        log.warning(f"⚠️ Music download failed for track {track_id} ('{query}')")
+        return None
+
+    # --- Shared HTTP helpers ---
+    async def _cached_search(
+        self, provider: str, url: str, params: Dict[str, Any], headers: Optional[Dict[str, str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """GET a JSON search endpoint through the TTL search cache, with retries."""
+        cache_key = self.search_cache.key(provider, url, params)
+        if (cached := await asyncio.to_thread(self.search_cache.get, cache_key)) is not None:
+            log.debug(f"♻️ {provider} search served from cache")
+            return cached
+        
         for attempt in range(MAX_RETRIES):
             try:
-                log.debug(f"🔍 Pixabay API call for '{query}' (attempt {attempt + 1})")
-                
-                response = await asyncio.to_thread(
-                    requests.get, url, params=params, timeout=REQUEST_TIMEOUT
-                )
-                response.raise_for_status()
-                
-                data = response.json()
-                tracks = data.get("hits", [])
-                
-                if not tracks:
-                    log.debug(f"No tracks found for '{query}'")
-                    return None
-                
-                # Filter tracks for better quality
-                suitable_tracks = []
-                for track in tracks:
-                    duration = track.get("duration", 0)
-                    download_url = track.get("downloadURL")
-                    
-                    if download_url and duration >= 30:  # At least 30 seconds
-                        suitable_tracks.append(track)
-                
-                if not suitable_tracks:
-                    log.debug(f"No suitable tracks found for '{query}' (duration/download issues)")
-                    return None
-                
-                # Select random track from suitable options
-                selected_track = random.choice(suitable_tracks)
-                track_id = selected_track.get("id")
-                download_url = selected_track["downloadURL"]
-                duration = selected_track.get("duration", 0)
-                
-                log.debug(f"📥 Downloading track {track_id} ({duration}s) from Pixabay...")
-                
-                # Download the music file
-                music_response = await asyncio.to_thread(
-                    requests.get, download_url, stream=True, timeout=REQUEST_TIMEOUT * 2
-                )
-                music_response.raise_for_status()
-                
-                # Save to file
-                filename = f"pixabay_music_{track_id}.mp3"
-                filepath = os.path.join(TEMP_ASSETS_DIR, filename)
-                
-                with open(filepath, "wb") as f:
-                    for chunk in music_response.iter_content(chunk_size=1024 * 1024):
-                        if chunk:
-                            f.write(chunk)
-                
-                # Verify file was downloaded
-                if os.path.exists(filepath) and os.path.getsize(filepath) > 10000:  # At least 10KB
-                    file_size_mb = os.path.getsize(filepath) / (1024 * 1024)
-                    log.info(f"✅ Music downloaded: {filename} ({file_size_mb:.1f}MB, {duration}s)")
-                    return filepath
-                else:
-                    log.warning(f"⚠️ Downloaded file is too small or missing: {filepath}")
-                    return None
-                    
-            except requests.RequestException as e:
-                log.warning(f"⚠️ Pixabay API error for '{query}' on attempt {attempt + 1}: {e}")
+                log.debug(f"🔍 {provider} API call (attempt {attempt + 1})")
+                data = await self.http.get_json(url, params=params, headers=headers, timeout=REQUEST_TIMEOUT)
+                await asyncio.to_thread(self.search_cache.put, cache_key, data)
+                return data
+            except HttpClientError as e:
+                log.warning(f"⚠️ {provider} API error on attempt {attempt + 1}: {e}")
                 if attempt < MAX_RETRIES - 1:
                     await asyncio.sleep(2)  # Wait before retry
-            except Exception as e:
-                log.error(f"❌ Unexpected error downloading music for '{query}': {e}")
+            except ValueError as e:
+                log.error(f"❌ {provider} returned invalid JSON: {e}")
                 return None
-        
-        log.warning(f"⚠️ All {MAX_RETRIES} attempts failed for music query '{query}'")
         return None
 
+    async def _download_file(self, url: str, dest_path: str, min_bytes: int = 1, timeout: int = REQUEST_TIMEOUT) -> bool:
+        """Stream `url` into `dest_path`; retries resume from the partial file. True if a plausible file was written."""
+        for attempt in range(MAX_RETRIES):
+            try:
+                written = await self.http.download(url, dest_path, timeout=timeout)
+                if written >= min_bytes:
+                    return True
+                log.warning(f"⚠️ Downloaded file is too small: {url}")
+                return False
+            except HttpClientError as e:
+                log.warning(f"⚠️ Download error on attempt {attempt + 1}: {e}")
+                if attempt < MAX_RETRIES - 1:
+                    await asyncio.sleep(2)
+        return False
+
+    def _prefer_cached(self, candidates: List[Dict[str, Any]], identity) -> Dict[str, Any]:
+        """Random choice among candidates, restricted to already-cached ones when any exist."""
+        cached = [c for c in candidates if self.media_cache.contains(*identity(c))]
+        return random.choice(cached or candidates)
+
     async def _fetch_video_from_pexels(
         self, query: str, scene_id: str
     ) -> Optional[Tuple[str, str]]:
-        """Fetch video from Pexels - unchanged from original."""
+        """Fetch video from Pexels through the search and media caches."""
         if not PEXELS_API_KEY:
             return None
         url, headers = "https://api.pexels.com/videos/search", {
             "Authorization": PEXELS_API_KEY
         }
         params = {"query": query, "per_page": 15, "orientation": "portrait", "size": "medium"}
-        for attempt in range(MAX_RETRIES):
-            try:
-                r = await asyncio.to_thread(
-                    requests.get, url, headers=headers, params=params, timeout=REQUEST_TIMEOUT
-                )
-                r.raise_for_status()
-                if not (videos := r.json().get("videos", [])):
-                    return None
-                video = random.choice(videos)
-                video_files = sorted(
-                    [
-                        vf
-                        for vf in video.get("video_files", [])
-                        if ".mp4" in vf.get("link", "")
-                    ],
-                    key=lambda x: x.get("height", 0),
-                    reverse=True,
-                )
-                if not video_files:
-                    return None
-                media_res = await asyncio.to_thread(
-                    requests.get, video_files[0]["link"], stream=True, timeout=REQUEST_TIMEOUT * 2
-                )
-                media_res.raise_for_status()
-                fpath = os.path.join(
-                    TEMP_ASSETS_DIR, f"pexels_{sanitize_filename(query)}_{scene_id}_{video['id']}.mp4"
-                )
-                with open(fpath, "wb") as f:
-                    for chunk in media_res.iter_content(chunk_size=1024 * 1024):
-                        f.write(chunk)
-                return (scene_id, fpath)
-            except requests.RequestException as e:
-                log.warning(f"Pexels API error for '{query}' on attempt {attempt + 1}: {e}")
-                if attempt < MAX_RETRIES - 1:
-                    await asyncio.sleep(2)
-        return None
\ No newline at end of file
+        data = await self._cached_search("pexels", url, params, headers=headers)
+        if not data or not (videos := data.get("videos", [])):
+            return None
+        
+        def best_rendition(video: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            return select_pexels_rendition(video.get("video_files", []), self.target_dims)
+        
+        def rendition_id(video_file: Dict[str, Any]) -> str:
+            return f"{video_file.get('id', '')}_{video_file.get('width', 0)}x{video_file.get('height', 0)}"
+        
+        candidates = [v for v in videos if best_rendition(v)]
+        if not candidates:
+            return None
+        video = self._prefer_cached(
+            candidates, lambda v: ("pexels", v["id"], rendition_id(best_rendition(v)), ".mp4")
+        )
+        video_file = best_rendition(video)
+        
+        cached = self.media_cache.contains("pexels", video["id"], rendition_id(video_file), ".mp4")
+        if not cached:
+            self._record_rendition_choice(video, video_file)
+        
+        fpath = await self.media_cache.fetch(
+            "pexels", video["id"], rendition_id(video_file), ".mp4",
+            downloader=lambda tmp_path: self._download_file(
+                video_file["link"], tmp_path, timeout=REQUEST_TIMEOUT * 2
+            ),
+            dest_path=os.path.join(
+                self.workspace_dir, f"pexels_{sanitize_filename(query)}_{scene_id}_{video['id']}.mp4"
+            ),
+            extra_metadata={"source_url": video_file["link"], "query": query},
+            expect_video=True
+        )
+        return (scene_id, fpath) if fpath else None
+
+    def _record_rendition_choice(self, video: Dict[str, Any], chosen: Dict[str, Any]) -> None:
+        """Log the chosen rendition against the previous largest-first policy."""
+        mp4_files = [vf for vf in video.get("video_files", []) if ".mp4" in vf.get("link", "")]
+        largest = max(mp4_files, key=lambda vf: vf.get("height", 0))
+        chosen_bytes, exact = _rendition_bytes(chosen)
+        largest_bytes, _ = _rendition_bytes(largest)
+        self.rendition_stats["downloads"] += 1
+        self.rendition_stats["bytes"] += chosen_bytes
+        self.rendition_stats["largest_bytes"] += largest_bytes
+        log.debug(
+            f"🎚️ Pexels {video['id']}: {chosen.get('width')}x{chosen.get('height')} instead of "
+            f"{largest.get('width')}x{largest.get('height')} "
+            f"({'' if exact else '~'}{(largest_bytes - chosen_bytes) / (1024 * 1024):.1f}MB saved)"
+        )
@@ -0,0 +1,281 @@
+"""
+Local music library - a zero-network source of background music.
+
+Point MUSIC_LIBRARY_DIR at a folder of tracks and this module keeps a
+persistent index of them: duration, loudness, a tempo estimate and mood tags
+taken from filenames, optional JSON sidecars and the tempo itself. Plans are
+matched against the index by keyword scoring on `background_music_suggestion`,
+so MediaService only goes to the network when nothing local fits.
+
+Sidecar format (`<track>.json`, all keys optional):
+    {"title": "Morning Run", "tags": ["upbeat", "inspiring"], "bpm": 124}
+"""
+import json
+import logging
+import os
+import random
+import re
+import subprocess
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from media_probe import probe_duration
+
+log = logging.getLogger(__name__)
+
+AUDIO_EXTENSIONS = (".mp3", ".wav", ".m4a", ".aac", ".ogg", ".flac")
+INDEX_VERSION = 1
+
+# Analysis decodes a mono excerpt at a low rate; enough for level and tempo
+ANALYSIS_SAMPLE_RATE = 11025
+ANALYSIS_SECONDS = 90
+HOP_SIZE = 256  # ~23ms frames, fine enough to resolve tempo to a few BPM
+
+# Words that say nothing about which track fits
+STOPWORDS = {
+    "and", "the", "with", "for", "music", "background", "track", "song",
+    "audio", "instrumental", "some", "that", "very", "bit",
+}
+
+@dataclass
+class MusicTrack:
+    """One indexed track."""
+    path: str
+    title: str
+    duration: float
+    loudness_db: float          # Mean RMS level in dBFS over the analysed excerpt
+    peak_db: float              # Sample peak in dBFS over the analysed excerpt
+    tempo_bpm: float            # 0.0 when no steady pulse was found
+    tags: List[str] = field(default_factory=list)          # From filename and sidecar
+    derived_tags: List[str] = field(default_factory=list)  # From tempo
+    size: int = 0
+    mtime: float = 0.0
+
+def _tokenize(text: str) -> List[str]:
+    return [w for w in re.findall(r"[a-z]+", text.lower()) if len(w) > 2 and w not in STOPWORDS]
+
+def _words_match(a: str, b: str) -> bool:
+    """Loose match so 'calm' meets 'calming' and 'inspire' meets 'inspiring'."""
+    if a == b:
+        return True
+    shorter, longer = sorted((a, b), key=len)
+    return len(shorter) >= 4 and longer.startswith(shorter[:max(4, len(shorter) - 1)])
+
+def _tempo_tags(bpm: float) -> List[str]:
+    if bpm >= 120:
+        return ["upbeat", "energetic", "fast", "motivational"]
+    if 0 < bpm <= 90:
+        return ["calm", "relaxing", "slow", "peaceful", "ambient"]
+    return []
+
+class MusicLibrary:
+    """
+    Persistent, incrementally refreshed index over a directory of music files.
+
+    Attributes:
+        root: Library directory
+        tracks: Indexed tracks by path
+    """
+
+    def __init__(self, root: str, index_path: str, ffmpeg_binary: str = "ffmpeg"):
+        """
+        Args:
+            root: Directory scanned (recursively) for audio files
+            index_path: JSON file the index is persisted to
+            ffmpeg_binary: ffmpeg used to decode excerpts for analysis
+        """
+        self.root = os.path.abspath(root)
+        self.index_path = index_path
+        self.ffmpeg_binary = ffmpeg_binary
+        self.tracks: Dict[str, MusicTrack] = {}
+        self._lock = threading.Lock()
+        self._refreshed = False
+        self._load_index()
+
+    # --- Index persistence ---
+    def _load_index(self) -> None:
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return
+        if data.get("version") != INDEX_VERSION or data.get("root") != self.root:
+            return
+        self.tracks = {t["path"]: MusicTrack(**t) for t in data.get("tracks", [])}
+
+    def _save_index(self) -> None:
+        os.makedirs(os.path.dirname(self.index_path) or ".", exist_ok=True)
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": INDEX_VERSION,
+                "root": self.root,
+                "tracks": [asdict(t) for t in self.tracks.values()],
+            }, f, indent=1)
+        os.replace(tmp_path, self.index_path)
+
+    # --- Scanning ---
+    def refresh(self) -> int:
+        """
+        Bring the index in line with the directory, analysing only new or changed files.
+
+        Returns:
+            Number of tracks (re)analysed
+        """
+        with self._lock:
+            started = time.monotonic()
+            seen = set()
+            analysed = 0
+            for dirpath, _, filenames in os.walk(self.root):
+                for filename in filenames:
+                    if not filename.lower().endswith(AUDIO_EXTENSIONS):
+                        continue
+                    path = os.path.join(dirpath, filename)
+                    seen.add(path)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    existing = self.tracks.get(path)
+                    sidecar_mtime = self._sidecar_mtime(path)
+                    if existing and existing.size == st.st_size and existing.mtime == max(st.st_mtime, sidecar_mtime):
+                        continue
+                    track = self._analyse(path, st.st_size, max(st.st_mtime, sidecar_mtime))
+                    if track:
+                        self.tracks[path] = track
+                        analysed += 1
+
+            removed = [p for p in self.tracks if p not in seen]
+            for path in removed:
+                del self.tracks[path]
+            if analysed or removed:
+                self._save_index()
+            self._refreshed = True
+            log.info(f"🎼 Music library: {len(self.tracks)} tracks indexed "
+                     f"({analysed} analysed, {len(removed)} removed) in {time.monotonic() - started:.1f}s")
+            return analysed
+
+    @staticmethod
+    def _sidecar_path(path: str) -> str:
+        return os.path.splitext(path)[0] + ".json"
+
+    def _sidecar_mtime(self, path: str) -> float:
+        try:
+            return os.stat(self._sidecar_path(path)).st_mtime
+        except OSError:
+            return 0.0
+
+    def _read_sidecar(self, path: str) -> Dict[str, Any]:
+        try:
+            with open(self._sidecar_path(path), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _analyse(self, path: str, size: int, mtime: float) -> Optional[MusicTrack]:
+        duration = probe_duration(path)
+        if duration <= 0:
+            log.debug(f"Skipping unreadable music file: {path}")
+            return None
+
+        sidecar = self._read_sidecar(path)
+        title = str(sidecar.get("title") or os.path.splitext(os.path.basename(path))[0])
+        raw_tags = sidecar.get("tags") or sidecar.get("mood") or []
+        if isinstance(raw_tags, str):
+            raw_tags = raw_tags.split(",")
+        tags = sorted(set(_tokenize(title) + _tokenize(" ".join(map(str, raw_tags)))))
+
+        loudness_db, peak_db, tempo_bpm = self._measure(path)
+        if sidecar.get("bpm"):
+            tempo_bpm = float(sidecar["bpm"])
+
+        return MusicTrack(
+            path=path, title=title, duration=duration,
+            loudness_db=round(loudness_db, 2), peak_db=round(peak_db, 2), tempo_bpm=round(tempo_bpm, 1),
+            tags=tags, derived_tags=_tempo_tags(tempo_bpm), size=size, mtime=mtime
+        )
+
+    def _measure(self, path: str) -> Tuple[float, float, float]:
+        """(loudness dBFS, peak dBFS, tempo BPM) of the first ANALYSIS_SECONDS."""
+        try:
+            result = subprocess.run(
+                [self.ffmpeg_binary, "-hide_banner", "-loglevel", "error", "-t", str(ANALYSIS_SECONDS),
+                 "-i", path, "-ac", "1", "-ar", str(ANALYSIS_SAMPLE_RATE), "-f", "s16le", "-"],
+                capture_output=True, timeout=120, check=True
+            )
+        except (subprocess.SubprocessError, OSError) as e:
+            log.debug(f"Music analysis decode failed for {path}: {e}")
+            return -20.0, 0.0, 0.0
+
+        samples = np.frombuffer(result.stdout, dtype=np.int16).astype(np.float32) / 32768.0
+        if samples.size < HOP_SIZE * 8:
+            return -20.0, 0.0, 0.0
+
+        rms = float(np.sqrt(np.mean(samples ** 2)))
+        peak = float(np.max(np.abs(samples)))
+        loudness_db = 20 * np.log10(max(rms, 1e-9))
+        peak_db = 20 * np.log10(max(peak, 1e-9))
+        return loudness_db, peak_db, self._estimate_tempo(samples)
+
+    @staticmethod
+    def _estimate_tempo(samples: np.ndarray) -> float:
+        """Autocorrelation of the onset envelope, searched between 60 and 180 BPM."""
+        frames = samples[: samples.size // HOP_SIZE * HOP_SIZE].reshape(-1, HOP_SIZE)
+        energy = np.log1p(np.sum(frames ** 2, axis=1) * 100)
+        onset = np.maximum(np.diff(energy), 0.0)
+        onset -= onset.mean()
+        if not onset.any():
+            return 0.0
+
+        frame_rate = ANALYSIS_SAMPLE_RATE / HOP_SIZE
+        min_lag = int(frame_rate * 60 / 180)
+        max_lag = int(frame_rate * 60 / 60)
+        if onset.size <= max_lag * 2:
+            return 0.0
+        spectrum = np.fft.rfft(onset, n=2 * onset.size)
+        autocorr = np.fft.irfft(spectrum * np.conj(spectrum))[: max_lag + 1]
+        if autocorr[0] <= 0:
+            return 0.0
+        lag = min_lag + int(np.argmax(autocorr[min_lag:max_lag + 1]))
+        # A weak peak means there is no steady pulse worth tagging
+        if autocorr[lag] / autocorr[0] < 0.1:
+            return 0.0
+        return 60.0 * frame_rate / lag
+
+    # --- Queries ---
+    def score(self, track: MusicTrack, query_words: List[str]) -> float:
+        """Keyword score: explicit tags count double, tempo-derived tags once."""
+        total = 0.0
+        for word in query_words:
+            if any(_words_match(word, tag) for tag in track.tags):
+                total += 2.0
+            elif any(_words_match(word, tag) for tag in track.derived_tags):
+                total += 1.0
+        return total
+
+    def find(self, suggestion: str, min_duration: float = 30.0) -> Optional[MusicTrack]:
+        """
+        Best-scoring track for a music suggestion, or None when nothing matches.
+
+        Ties are broken randomly so repeated plans don't all get the same track.
+        """
+        if not self._refreshed:
+            self.refresh()
+        query_words = _tokenize(suggestion or "")
+        if not query_words or not self.tracks:
+            return None
+
+        scored = [
+            (self.score(track, query_words), track)
+            for track in self.tracks.values()
+            if track.duration >= min_duration and os.path.exists(track.path)
+        ]
+        best = max((s for s, _ in scored), default=0.0)
+        if best <= 0:
+            return None
+        return random.choice([t for s, t in scored if s == best])
@@ -6,14 +6,14 @@ the VideoEditor API for the Transformative Mode.
 import asyncio
 import logging
 import os
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 # --- Third-Party Imports ---
-from moviepy.editor import AudioFileClip, concatenate_audioclips, concatenate_videoclips
+from moviepy.editor import AudioFileClip, VideoClip, VideoFileClip, concatenate_videoclips
 
 # --- Local Application Imports ---
 from config import TEMP_ASSETS_DIR
-from models import RemixPlan, AnalysedScene
+from models import RemixPlan, AnalysedScene, TextOverlay
 from services.media_service import MediaService
 from services.audio_service import AudioService
 from utils import sanitize_filename
@@ -22,10 +22,13 @@ from video_processing.editor import VideoEditor
 log = logging.getLogger(__name__)
 
 class RemixAssemblyService:
-    def __init__(self, media_service: MediaService, audio_service: AudioService, editor: VideoEditor):
+    def __init__(self, media_service: MediaService, audio_service: AudioService, editor: VideoEditor,
+                 workspace_dir: str = TEMP_ASSETS_DIR):
         self.media_service = media_service
         self.audio_service = audio_service
         self.editor = editor
+        # Per-job scratch directory for the voiceover files
+        self.workspace_dir = workspace_dir
 
     async def _generate_voiceovers(self, plan: RemixPlan) -> Dict[int, str]:
         if not plan.voiceover_segments:
@@ -41,9 +44,9 @@ class RemixAssemblyService:
                 "narration": vo_segment.narration_text,
                 "emotion": "neutral"
             }
-            output_base = os.path.join(TEMP_ASSETS_DIR, f"tts_{base_filename}_{scene_data['id']}")
+            output_base = os.path.join(self.workspace_dir, f"tts_{base_filename}_{scene_data['id']}")
             tasks.append(
-                self.audio_service._generate_single_tts_segment(scene_data, output_base, "openai", {})
+                self.audio_service._generate_single_tts_segment_with_retries(scene_data, output_base, "openai", {})
             )
             
         generated_paths = await asyncio.gather(*tasks)
@@ -54,55 +57,64 @@ class RemixAssemblyService:
                 vo_audio_paths[vo_segment.scene_id] = path
         return vo_audio_paths
 
-    async def assemble_and_render_remix(self, plan: RemixPlan, scenes: List[AnalysedScene]):
+    def _scene_clip(self, source: VideoFileClip, scene: AnalysedScene,
+                    overlay: Optional[TextOverlay], voiceover_path: Optional[str]) -> VideoClip:
+        """One source scene at the target format, with its overlay and voiceover (if any)."""
+        clip = source.subclip(scene.start_time_seconds, scene.end_time_seconds)
+        if tuple(clip.size) != tuple(self.editor.target_format):
+            clip = self.editor._smart_resize_to_target_format(clip)
+        clip.fps = self.editor.profile.fps
+        if overlay:
+            clip = self.editor._apply_overlays_safely(clip, overlay, None)
+        if voiceover_path:
+            # The voiceover replaces the scene's own sound, cut to the scene so the timeline stays in sync
+            voiceover = AudioFileClip(voiceover_path)
+            clip = clip.set_audio(voiceover.subclip(0, min(voiceover.duration, clip.duration)))
+        return clip
+
+    async def assemble_and_render_remix(self, plan: RemixPlan, scenes: List[AnalysedScene]) -> Optional[str]:
+        """
+        Cut the planned scenes from the source video and render the remix.
+
+        Returns:
+            Path to the rendered video, or None if no planned scene exists
+        """
         log.info(f"🚀 Starting hybrid remix assembly for '{plan.remix_video_title}'...")
         
         vo_audio_paths, music_path = await asyncio.gather(
             self._generate_voiceovers(plan),
-            self.media_service._fetch_music_from_pixabay(plan.background_music_suggestion)
+            self.media_service._fetch_background_music_reliably(plan.background_music_suggestion)
         )
 
         scene_map = {s.scene_id: s for s in scenes}
-        processed_clips = []
-        primary_audio_clips = []
-
-        for scene_id in plan.scene_ids_to_include:
-            if scene_id not in scene_map:
-                log.warning(f"Scene ID {scene_id} from plan not found. Skipping.")
-                continue
+        overlays = {overlay.scene_id: overlay for overlay in plan.text_overlays or []}
+        source = VideoFileClip(plan.source_video_path)
+        final_audio_track = None
+        try:
+            processed_clips = []
+            for scene_id in plan.scene_ids_to_include:
+                if scene_id not in scene_map:
+                    log.warning(f"Scene ID {scene_id} from plan not found. Skipping.")
+                    continue
+                processed_clips.append(self._scene_clip(
+                    source, scene_map[scene_id], overlays.get(scene_id), vo_audio_paths.get(scene_id)
+                ))
 
-            scene_info = scene_map[scene_id]
-            clip = self.editor.create_clip_from_source(
-                plan.source_video_path,
-                scene_info.start_time_seconds,
-                scene_info.end_time_seconds
-            )
-            
-            if plan.text_overlays:
-                for overlay in plan.text_overlays:
-                    if overlay.scene_id == scene_id:
-                        clip = self.editor.add_static_overlay(clip, overlay)
-            
-            processed_clips.append(clip)
+            if not processed_clips:
+                log.error("No valid scenes found to create a remix. Aborting."); return None
 
-            if scene_id in vo_audio_paths:
-                primary_audio_clips.append(AudioFileClip(vo_audio_paths[scene_id]))
-            elif clip.audio is not None:
-                primary_audio_clips.append(clip.audio)
+            # Source sound and voiceovers in timeline order, then the music bed under them
+            primary_audio_track = concatenate_videoclips(processed_clips).audio
+            if primary_audio_track is not None:
+                final_audio_track = self.audio_service.mix_audio_with_narration(primary_audio_track, music_path)
+            else:
+                final_audio_track = AudioFileClip(music_path) if music_path else None
 
-        if not processed_clips:
-            log.error("No valid scenes found to create a remix. Aborting."); return
-
-        final_video_track = concatenate_videoclips(processed_clips)
-        
-        primary_audio_track = None
-        if primary_audio_clips:
-            primary_audio_track = concatenate_audioclips(primary_audio_clips)
-
-        if music_path and primary_audio_track:
-            final_audio_track = self.editor.mix_audio(primary_audio_track, music_path)
-            final_video_track.audio = final_audio_track
-        elif primary_audio_track:
-            final_video_track.audio = primary_audio_track
-        
-        self.editor.render_video(final_video_track, plan.remix_video_title)
\ No newline at end of file
+            return await asyncio.to_thread(
+                self.editor.render_video, processed_clips, final_audio_track, plan.remix_video_title
+            )
+        finally:
+            # Subclips share the source's reader; workers must not leak it across jobs
+            self.editor.release_clip(source)
+            if final_audio_track is not None:
+                final_audio_track.close()
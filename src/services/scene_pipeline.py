@@ -0,0 +1,187 @@
+"""
+Streaming per-scene pipeline for the Generative Mode.
+
+Instead of stage barriers (all TTS, then all captions, then all downloads,
+then the render), every scene advances on its own:
+
+    TTS -> duration + caption timing ────────────┐
+    stock video download -> mezzanine (duration) ┴─> segment encode (worker process)
+
+Segments are encoded by the parallel renderer's worker as soon as both inputs
+of a scene are ready, and only the final concat + audio mux waits for the last
+scene. The critical path becomes the slowest scene rather than the sum of all
+stages.
+"""
+# --- Standard Library Imports ---
+import asyncio
+import logging
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import Executor
+from typing import Any, Dict, List, Optional, Tuple
+
+# --- Local Application Imports ---
+from config import OUTPUT_DIR
+from models import VideoPlan
+from services.audio_service import AudioService
+from services.generative_assembly_service import GenerativeAssemblyService
+from services.media_service import MediaService
+from utils import sanitize_filename
+from video_processing.editor import VideoEditor, VideoProcessingError
+from video_processing.parallel_renderer import ParallelSegmentRenderer, _encode_segment_worker, encoder_pool
+from video_processing.render_plan import RenderJob, SegmentSpec
+
+log = logging.getLogger(__name__)
+
+# (segment spec, narration path, encoded segment path) of a finished scene
+SceneResult = Tuple[SegmentSpec, str, str]
+
+class ScenePipeline:
+    """Runs TTS, caption timing, downloads and segment encodes per scene, as inputs land."""
+
+    def __init__(
+        self,
+        editor: VideoEditor,
+        media_service: MediaService,
+        audio_service: AudioService,
+        assembly_service: GenerativeAssemblyService
+    ):
+        self.editor = editor
+        self.media_service = media_service
+        self.audio_service = audio_service
+        self.assembly_service = assembly_service
+        self.renderer = ParallelSegmentRenderer(
+            editor, assembly_service.render_workers, assembly_service.workspace_dir
+        )
+        self.timings: Dict[str, Dict[str, float]] = {}
+
+    async def run(self, plan: VideoPlan, persona: Dict[str, Any]) -> str:
+        """
+        Produce the final video for `plan`.
+
+        Returns:
+            Path to the rendered video
+
+        Raises:
+            VideoProcessingError: If no scene could be produced or the final mux fails
+        """
+        if not shutil.which("ffmpeg"):
+            raise VideoProcessingError("ffmpeg executable not found")
+
+        started = time.monotonic()
+        scenes = self.audio_service._get_all_sub_scenes_with_ids(plan)
+        queries = self.media_service.scene_video_queries(plan)
+        tts_provider = self.audio_service.select_tts_provider()
+        base_filename = sanitize_filename(plan.video_title)
+        cta_overlay = self.assembly_service.cta_overlay(plan)
+
+        workspace = self.assembly_service.workspace_dir
+        os.makedirs(workspace, exist_ok=True)
+        workdir = tempfile.mkdtemp(prefix="scene_pipeline_", dir=workspace)
+        workers = self.renderer._worker_count(len(scenes))
+        codec_settings = self.renderer._codec_settings()
+        log.info(f"🚀 Streaming {len(scenes)} scenes through TTS → captions → encode "
+                 f"on {workers} encoder processes ({tts_provider})")
+
+        try:
+            music_task = asyncio.create_task(self.media_service.fetch_background_music(plan))
+            with encoder_pool(workers) as pool:
+                results = await asyncio.gather(*(
+                    self._run_scene(
+                        scene, queries.get(scene["id"]), base_filename, tts_provider, persona,
+                        cta_overlay if scene["id"] == "cta" else None,
+                        os.path.join(workdir, f"segment_{index:04d}.mp4"), pool, codec_settings
+                    )
+                    for index, scene in enumerate(scenes)
+                ))
+            music_path = await music_task
+
+            finished: List[SceneResult] = [r for r in results if r]
+            log.info(f"🎬 {len(finished)}/{len(scenes)} scenes ready after {time.monotonic() - started:.1f}s")
+            if not finished:
+                raise VideoProcessingError("No scene produced both narration and video")
+
+            job = RenderJob(
+                title=self.editor.profile.output_title(plan.video_title),
+                segments=[spec for spec, _, _ in finished],
+                narration_paths=[narration for _, narration, _ in finished],
+                music_path=music_path
+            )
+            audio_path = await asyncio.to_thread(self.assembly_service._write_mixed_audio, job)
+            output_path = os.path.join(OUTPUT_DIR, f"{sanitize_filename(job.title)}.mp4")
+            os.makedirs(OUTPUT_DIR, exist_ok=True)
+            await asyncio.to_thread(
+                self.renderer._concat_and_mux,
+                [segment for _, _, segment in finished], audio_path, workdir, output_path
+            )
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+        if not os.path.exists(output_path) or os.path.getsize(output_path) < 1000:
+            raise VideoProcessingError("Scene pipeline produced no usable output file")
+
+        self.editor.processing_stats["clips_processed"] += len(finished)
+        slowest = max(self.timings.items(), key=lambda item: item[1].get("encoded", 0.0), default=None)
+        log.info(f"✅ Video rendered successfully (scene pipeline): {output_path} "
+                 f"in {time.monotonic() - started:.1f}s"
+                 + (f", slowest scene {slowest[0]} at {slowest[1]['encoded']:.1f}s" if slowest else ""))
+        if self.editor.profile.contact_sheet:
+            await asyncio.to_thread(self.assembly_service.write_contact_sheet, job, output_path)
+        return output_path
+
+    async def _run_scene(
+        self, scene: Dict, query: Optional[str], base_filename: str, tts_provider: str,
+        persona: Dict[str, Any], overlay_plan: Optional[Any], segment_path: str,
+        pool: Executor, codec_settings: Dict[str, Any]
+    ) -> Optional[SceneResult]:
+        scene_id = scene["id"]
+        started = time.monotonic()
+        marks = self.timings.setdefault(scene_id, {})
+
+        async def narration() -> Optional[Dict]:
+            segment = await self.audio_service.synthesize_scene(scene, base_filename, tts_provider, persona)
+            marks["tts"] = time.monotonic() - started
+            if segment:
+                await asyncio.to_thread(self.audio_service.time_scene, segment)
+                marks["captions"] = time.monotonic() - started
+            return segment
+
+        narration_task = asyncio.ensure_future(narration())
+
+        async def visual() -> Optional[str]:
+            if not query:
+                return None
+            video_path = await self.media_service.fetch_scene_video(query, scene_id)
+            marks["video"] = time.monotonic() - started
+            # The mezzanine is trimmed to the narration, so it waits for the TTS duration
+            segment = await narration_task
+            if video_path and segment:
+                video_path = await self.media_service.scene_mezzanine(video_path, segment["duration"])
+                marks["mezzanine"] = time.monotonic() - started
+            return video_path
+
+        audio_segment, video_path = await asyncio.gather(narration_task, visual())
+        if not audio_segment or not video_path:
+            log.warning(f"Missing video or audio asset for scene {scene_id}. Skipping.")
+            return None
+
+        spec = SegmentSpec(
+            scene_id=scene_id,
+            source_path=video_path,
+            duration=audio_segment["duration"],
+            overlay_plan=overlay_plan,
+            caption_data=audio_segment.get("asr_word_timings")
+        )
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                pool, _encode_segment_worker, spec, segment_path,
+                self.editor.base_format, codec_settings, self.editor.profile
+            )
+        except Exception as e:
+            log.error(f"❌ Segment {scene_id} failed to encode: {e}. Skipping.")
+            return None
+        marks["encoded"] = time.monotonic() - started
+        log.debug(f"✅ Scene {scene_id} encoded at {marks['encoded']:.1f}s")
+        return spec, audio_segment["filepath"], segment_path
@@ -0,0 +1,241 @@
+"""
+Rate-limit-aware scheduler for TTS provider calls.
+
+Every TTS request goes through one process-wide scheduler, so concurrent
+scenes - and concurrent render jobs in the same process - share a single
+budget per provider instead of each firing everything at once:
+
+- a token bucket enforces requests/second (with a small burst),
+- a concurrency cap bounds requests in flight,
+- a 429 pauses the whole provider for its Retry-After (or a jittered
+  backoff), so waiting callers don't pile more 429s on top,
+- queue depth and wait times are tracked for the logs.
+
+The bookkeeping uses a thread lock and short sleeps rather than asyncio
+primitives, so callers on different event loops share the same budget.
+"""
+import asyncio
+import logging
+import random
+import threading
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+log = logging.getLogger(__name__)
+
+POLL_INTERVAL = 0.05  # Re-check cadence while waiting for a concurrency slot
+
+@dataclass(frozen=True)
+class ProviderLimits:
+    requests_per_second: float
+    max_concurrency: int
+    burst: int = 2
+
+class TTSRateLimitError(Exception):
+    """A provider rejected a request for rate limiting (HTTP 429)."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+def rate_limit_from_exception(error: Exception) -> Optional[TTSRateLimitError]:
+    """
+    Recognize a rate-limit error raised by a provider SDK.
+
+    Both the OpenAI and Speechify SDKs expose the HTTP status and response
+    headers on their exceptions, either directly or via `.response`.
+
+    Returns:
+        A TTSRateLimitError carrying Retry-After (seconds) if present, else None
+    """
+    response = getattr(error, "response", None)
+    status = getattr(error, "status_code", None) or getattr(response, "status_code", None)
+    if status != 429:
+        return None
+    headers = getattr(error, "headers", None) or getattr(response, "headers", None) or {}
+    retry_after = None
+    try:
+        if headers.get("retry-after-ms"):
+            retry_after = float(headers["retry-after-ms"]) / 1000
+        elif headers.get("retry-after"):
+            retry_after = float(headers["retry-after"])
+    except (TypeError, ValueError):
+        retry_after = None  # HTTP-date form: fall back to our own backoff
+    return TTSRateLimitError(str(error), retry_after)
+
+class _ProviderState:
+    def __init__(self, limits: ProviderLimits):
+        self.limits = limits
+        self.tokens = float(limits.burst)
+        self.refilled_at = time.monotonic()
+        self.in_flight = 0
+        self.waiting = 0
+        self.paused_until = 0.0
+        self.consecutive_rate_limits = 0
+        self.stats = {"requests": 0, "rate_limited": 0, "total_wait_s": 0.0, "max_wait_s": 0.0, "max_queue": 0}
+
+    def refill(self, now: float) -> None:
+        elapsed = now - self.refilled_at
+        self.tokens = min(float(self.limits.burst), self.tokens + elapsed * self.limits.requests_per_second)
+        self.refilled_at = now
+
+class TTSScheduler:
+    """Per-provider token buckets and concurrency limits shared process-wide."""
+
+    def __init__(self, limits: Dict[str, ProviderLimits], default_limits: ProviderLimits,
+                 backoff_base: float = 1.0, backoff_max: float = 30.0):
+        """
+        Args:
+            limits: Limits per provider name (e.g. "openai", "speechify")
+            default_limits: Limits for providers not listed
+            backoff_base: First backoff step in seconds
+            backoff_max: Backoff ceiling in seconds
+        """
+        self.default_limits = default_limits
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._lock = threading.Lock()
+        self._states: Dict[str, _ProviderState] = {
+            name: _ProviderState(provider_limits) for name, provider_limits in limits.items()
+        }
+
+    def _state(self, provider: str) -> _ProviderState:
+        with self._lock:
+            if provider not in self._states:
+                self._states[provider] = _ProviderState(self.default_limits)
+            return self._states[provider]
+
+    # --- Slots ---
+    async def acquire(self, provider: str) -> float:
+        """
+        Wait until `provider` has both a token and a free concurrency slot.
+
+        Returns:
+            Seconds spent waiting
+        """
+        state = self._state(provider)
+        started = time.monotonic()
+        with self._lock:
+            state.waiting += 1
+            state.stats["max_queue"] = max(state.stats["max_queue"], state.waiting)
+        try:
+            while True:
+                with self._lock:
+                    now = time.monotonic()
+                    state.refill(now)
+                    if now < state.paused_until:
+                        delay = state.paused_until - now
+                    elif state.in_flight >= state.limits.max_concurrency:
+                        delay = POLL_INTERVAL
+                    elif state.tokens < 1.0:
+                        delay = (1.0 - state.tokens) / state.limits.requests_per_second
+                    else:
+                        state.tokens -= 1.0
+                        state.in_flight += 1
+                        break
+                await asyncio.sleep(max(delay, 0.01))
+        finally:
+            with self._lock:
+                state.waiting -= 1
+
+        waited = time.monotonic() - started
+        with self._lock:
+            state.stats["requests"] += 1
+            state.stats["total_wait_s"] += waited
+            state.stats["max_wait_s"] = max(state.stats["max_wait_s"], waited)
+        return waited
+
+    def release(self, provider: str) -> None:
+        state = self._state(provider)
+        with self._lock:
+            state.in_flight = max(0, state.in_flight - 1)
+
+    @asynccontextmanager
+    async def slot(self, provider: str):
+        await self.acquire(provider)
+        try:
+            yield
+        finally:
+            self.release(provider)
+
+    async def call(self, provider: str, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run the blocking provider call `fn(*args)` in a thread once a slot is free.
+
+        Raises:
+            TTSRateLimitError: Re-raised after pausing the provider
+        """
+        async with self.slot(provider):
+            try:
+                result = await asyncio.to_thread(fn, *args)
+            except TTSRateLimitError as e:
+                self.note_rate_limited(provider, e.retry_after)
+                raise
+        state = self._state(provider)
+        with self._lock:
+            state.consecutive_rate_limits = 0
+        return result
+
+    # --- Backoff ---
+    def backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Retry-After plus a little jitter when given, else full-jitter exponential backoff."""
+        if retry_after is not None:
+            return retry_after + random.uniform(0.0, 0.5)
+        return random.uniform(0.0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def note_rate_limited(self, provider: str, retry_after: Optional[float] = None) -> None:
+        """Pause every caller of `provider` until the limit has passed."""
+        state = self._state(provider)
+        with self._lock:
+            state.stats["rate_limited"] += 1
+            state.consecutive_rate_limits += 1
+            attempt = state.consecutive_rate_limits
+        pause = self.backoff_delay(attempt, retry_after)
+        with self._lock:
+            state.paused_until = max(state.paused_until, time.monotonic() + pause)
+        log.warning(f"🚦 {provider} rate limited - pausing requests for {pause:.1f}s")
+
+    # --- Metrics ---
+    def metrics(self, provider: str) -> Dict[str, Any]:
+        state = self._state(provider)
+        with self._lock:
+            requests = state.stats["requests"]
+            return {
+                "queue_depth": state.waiting,
+                "in_flight": state.in_flight,
+                "requests": requests,
+                "rate_limited": state.stats["rate_limited"],
+                "avg_wait_s": state.stats["total_wait_s"] / requests if requests else 0.0,
+                "max_wait_s": state.stats["max_wait_s"],
+                "max_queue": state.stats["max_queue"],
+            }
+
+    def summary(self, provider: str) -> str:
+        m = self.metrics(provider)
+        return (f"{provider} scheduler: {m['requests']} requests, {m['rate_limited']} rate limited, "
+                f"wait avg {m['avg_wait_s']:.2f}s / max {m['max_wait_s']:.2f}s, peak queue {m['max_queue']}")
+
+_scheduler: Optional[TTSScheduler] = None
+_scheduler_lock = threading.Lock()
+
+def get_tts_scheduler() -> TTSScheduler:
+    """Process-wide scheduler configured from config (shared by all render jobs)."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            from config import (
+                OPENAI_TTS_CONCURRENCY, OPENAI_TTS_RPS, SPEECHIFY_CONCURRENCY, SPEECHIFY_RPS,
+                TTS_BACKOFF_BASE, TTS_BACKOFF_MAX
+            )
+            _scheduler = TTSScheduler(
+                limits={
+                    "openai": ProviderLimits(OPENAI_TTS_RPS, OPENAI_TTS_CONCURRENCY),
+                    "speechify": ProviderLimits(SPEECHIFY_RPS, SPEECHIFY_CONCURRENCY),
+                },
+                default_limits=ProviderLimits(1.0, 2),
+                backoff_base=TTS_BACKOFF_BASE,
+                backoff_max=TTS_BACKOFF_MAX,
+            )
+        return _scheduler
@@ -23,8 +23,10 @@ from models import AnalysedScene
 log = logging.getLogger(__name__)
 
 class VideoAnalysisService:
-    def __init__(self, video_path: str, openai_client: OpenAI):
+    def __init__(self, video_path: str, openai_client: OpenAI, workspace_dir: str = TEMP_ASSETS_DIR):
         self.video_path = video_path
+        # Scratch directory for extracted frames (per job when run by a worker)
+        self.workspace_dir = workspace_dir
         self.clip = VideoFileClip(video_path)
         self.openai_client = openai_client
 
@@ -37,6 +39,10 @@ class VideoAnalysisService:
         log.info(f"Video Properties: {props}")
         return props
 
+    def close(self) -> None:
+        """Release the source reader (long-lived workers would leak an ffmpeg process per job)."""
+        self.clip.close()
+
     def detect_scenes(self) -> List[AnalysedScene]:
         log.info("Starting scene detection...")
         video_manager = VideoManager([self.video_path])
@@ -71,7 +77,7 @@ class VideoAnalysisService:
         return analysed_scenes
 
     def _extract_frame_as_base64(self, time_seconds: float) -> str:
-        frame_path = os.path.join(TEMP_ASSETS_DIR, f"frame_at_{time_seconds:.2f}.jpg")
+        frame_path = os.path.join(self.workspace_dir, f"frame_at_{time_seconds:.2f}.jpg")
         self.clip.save_frame(frame_path, t=time_seconds)
         with open(frame_path, "rb") as image_file:
             encoded_string = base64.b64encode(image_file.read()).decode("utf-8")
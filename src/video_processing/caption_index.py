@@ -0,0 +1,93 @@
+"""
+Caption Timing Index - compact, bisect-searchable word timings.
+
+Word timings are compiled once per segment into a sorted numpy structured
+array of (start, end, word_id) so the per-frame "which word is active" lookup
+is O(log n) instead of a linear scan over timing dicts.
+"""
+import logging
+from bisect import bisect_right
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+WORD_TIMING_DTYPE = np.dtype([("start", "f8"), ("end", "f8"), ("word_id", "i4")])
+
+def _default_normalize(word: str) -> str:
+    return str(word).upper().strip()[:30]  # Limit length
+
+class WordTimingIndex:
+    """
+    Immutable interval index over the words of one caption segment.
+
+    Attributes:
+        entries: Structured array sorted by start time
+        words: Vocabulary of distinct (normalized) words, indexed by word_id
+    """
+
+    def __init__(self, entries: np.ndarray, words: List[str]):
+        self.entries = entries
+        self.words = words
+        # Plain-list copies: bisect on a list beats numpy call overhead for scalar lookups
+        self._starts: List[float] = entries["start"].tolist()
+        self._ends: List[float] = entries["end"].tolist()
+
+    @classmethod
+    def from_timings(cls,
+                     word_timings: List[Dict[str, Any]],
+                     normalize: Callable[[str], str] = _default_normalize) -> "WordTimingIndex":
+        """
+        Compile ASR word timing dicts into an index.
+
+        Entries missing 'word'/'start'/'end', with non-numeric times, empty
+        words or non-positive length are dropped.
+
+        Args:
+            word_timings: List of {'word', 'start', 'end'} dicts
+            normalize: Maps the raw word to its displayed form
+
+        Returns:
+            Compiled index (possibly empty)
+        """
+        vocabulary: Dict[str, int] = {}
+        rows = []
+        for word_data in word_timings or []:
+            if not (isinstance(word_data, dict) and
+                    all(key in word_data for key in ['word', 'start', 'end']) and
+                    isinstance(word_data['start'], (int, float)) and
+                    isinstance(word_data['end'], (int, float))):
+                continue
+            text = normalize(word_data['word'])
+            start, end = float(word_data['start']), float(word_data['end'])
+            if not text or end <= start:
+                continue
+            word_id = vocabulary.setdefault(text, len(vocabulary))
+            rows.append((start, end, word_id))
+
+        entries = np.array(rows, dtype=WORD_TIMING_DTYPE)
+        entries.sort(order="start", kind="stable")
+        return cls(entries, list(vocabulary))
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def lookup(self, t: float) -> int:
+        """
+        Return the entry index active at time `t`, or -1 if none.
+
+        For overlapping intervals the one with the latest start wins.
+        """
+        i = bisect_right(self._starts, t) - 1
+        if i >= 0 and t < self._ends[i]:
+            return i
+        return -1
+
+    def word_for_entry(self, entry_index: int) -> Optional[str]:
+        if entry_index < 0:
+            return None
+        return self.words[int(self.entries["word_id"][entry_index])]
+
+    def word_at(self, t: float) -> Optional[str]:
+        return self.word_for_entry(self.lookup(t))
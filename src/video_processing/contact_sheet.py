@@ -0,0 +1,74 @@
+"""
+Storyboard contact sheet - one frame per scene of a rendered video.
+
+Used with preview renders so a plan can be reviewed at a glance: a frame is
+grabbed from the middle of every segment and the frames are tiled into one
+labelled JPEG next to the video.
+"""
+import logging
+import os
+import subprocess
+import tempfile
+from typing import List, Optional, Sequence, Tuple
+
+from PIL import Image, ImageDraw
+
+log = logging.getLogger(__name__)
+
+LABEL_HEIGHT = 18
+
+def _grab_frame(video_path: str, timestamp: float, dest: str, ffmpeg_binary: str) -> bool:
+    result = subprocess.run(
+        [ffmpeg_binary, "-y", "-hide_banner", "-loglevel", "error",
+         "-ss", f"{timestamp:.3f}", "-i", video_path, "-frames:v", "1", dest],
+        capture_output=True, timeout=60
+    )
+    return result.returncode == 0 and os.path.exists(dest)
+
+def write_contact_sheet(
+    video_path: str,
+    scenes: Sequence[Tuple[str, float]],
+    output_path: str,
+    columns: int = 6,
+    ffmpeg_binary: str = "ffmpeg"
+) -> Optional[str]:
+    """
+    Tile one labelled frame per scene into a JPEG.
+
+    Args:
+        video_path: Rendered video
+        scenes: (scene id, timestamp in the video) per scene, in timeline order
+        output_path: Destination JPEG
+        columns: Frames per row
+
+    Returns:
+        `output_path`, or None if no frame could be grabbed
+    """
+    frames: List[Tuple[str, Image.Image]] = []
+    with tempfile.TemporaryDirectory(prefix="contact_sheet_") as workdir:
+        for index, (scene_id, timestamp) in enumerate(scenes):
+            frame_path = os.path.join(workdir, f"{index:04d}.png")
+            try:
+                if _grab_frame(video_path, timestamp, frame_path, ffmpeg_binary):
+                    with Image.open(frame_path) as image:
+                        frames.append((scene_id, image.convert("RGB")))
+            except (subprocess.SubprocessError, OSError) as e:
+                log.debug(f"Frame grab failed for scene {scene_id}: {e}")
+    if not frames:
+        return None
+
+    cell_w, cell_h = frames[0][1].size
+    columns = max(1, min(columns, len(frames)))
+    rows = -(-len(frames) // columns)
+    sheet = Image.new("RGB", (columns * cell_w, rows * (cell_h + LABEL_HEIGHT)), "black")
+    draw = ImageDraw.Draw(sheet)
+    for index, (scene_id, image) in enumerate(frames):
+        x = (index % columns) * cell_w
+        y = (index // columns) * (cell_h + LABEL_HEIGHT)
+        sheet.paste(image.resize((cell_w, cell_h)), (x, y))
+        draw.text((x + 4, y + cell_h + 3), f"{index + 1}. {scene_id}", fill="white")
+
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    sheet.save(output_path, quality=85)
+    log.info(f"🗂️ Storyboard contact sheet ({len(frames)} scenes): {output_path}")
+    return output_path
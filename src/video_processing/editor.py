@@ -6,9 +6,7 @@ comprehensive error handling, and optimized portrait video generation.
 """
 import logging
 import os
-import gc
 import time
-import psutil
 from dataclasses import dataclass
 from enum import Enum
 from typing import List, Dict, Any, Optional, Tuple, Union
@@ -16,15 +14,19 @@ from contextlib import contextmanager
 
 import numpy as np
 from moviepy.editor import (
-    VideoFileClip, AudioFileClip, TextClip,
+    VideoFileClip, AudioFileClip, ImageClip,
     CompositeVideoClip, concatenate_videoclips,
     CompositeAudioClip, afx, VideoClip
 )
 from moviepy.video.fx.all import resize, crop
 
-from config import OUTPUT_DIR, FPS
+from config import OUTPUT_DIR, FPS, CAPTIONS_FONT_PATH, TEXT_SPRITE_CACHE_SIZE
 from models import TextOverlay
+from resource_monitor import get_resource_monitor
 from utils import sanitize_filename
+from video_processing.caption_index import WordTimingIndex
+from video_processing.render_plan import PROFILE_FULL, RenderProfile
+from video_processing.text_renderer import TextStyle, get_text_renderer, paste_rgba
 
 log = logging.getLogger(__name__)
 
@@ -40,6 +42,7 @@ class RenderQuality(Enum):
     HIGH = {"fps": 30, "threads": 4, "bitrate": "4000k", "preset": "medium"}
     MEDIUM = {"fps": 24, "threads": 2, "bitrate": "2500k", "preset": "fast"}
     LOW = {"fps": 24, "threads": 1, "bitrate": "1500k", "preset": "ultrafast"}
+    PREVIEW = {"fps": 12, "threads": 2, "bitrate": "400k", "preset": "ultrafast"}
 
 @dataclass
 class SystemResourceMetrics:
@@ -76,6 +79,41 @@ class VideoProcessingError(Exception):
     """Custom exception for video processing errors."""
     pass
 
+def smart_crop_parameters(original_size: Tuple[int, int], target_format: Tuple[int, int]) -> Dict[str, int]:
+    """
+    Centre-crop window that brings `original_size` to the aspect ratio of `target_format`.
+
+    Returns:
+        {'x1', 'x2'} for a horizontal crop, {'y1', 'y2'} for a vertical one,
+        or {} when the aspect ratios already match (within 0.05)
+    """
+    original_w, original_h = original_size
+    target_aspect_ratio = target_format[0] / target_format[1]
+    original_aspect = original_w / original_h
+
+    if abs(original_aspect - target_aspect_ratio) < 0.05:
+        # Aspect ratios are very close, no cropping needed
+        return {}
+
+    if original_aspect > target_aspect_ratio:
+        # Video is too wide - crop sides (letterbox removal)
+        new_width = int(original_h * target_aspect_ratio)
+        x_center = original_w // 2
+        x1 = max(0, x_center - new_width // 2)
+        x2 = min(original_w, x1 + new_width)
+
+        log.debug(f"Horizontal crop: {original_w}px → {new_width}px (x1={x1}, x2={x2})")
+        return {'x1': x1, 'x2': x2}
+    else:
+        # Video is too tall - crop top/bottom (pillarbox removal)
+        new_height = int(original_w / target_aspect_ratio)
+        y_center = original_h // 2
+        y1 = max(0, y_center - new_height // 2)
+        y2 = min(original_h, y1 + new_height)
+
+        log.debug(f"Vertical crop: {original_h}px → {new_height}px (y1={y1}, y2={y2})")
+        return {'y1': y1, 'y2': y2}
+
 class SmartVideoEditor:
     """
     Production-grade video editor with intelligent resource management.
@@ -88,19 +126,30 @@ class SmartVideoEditor:
     - Performance metrics and detailed logging
     """
     
-    def __init__(self, target_format: Tuple[int, int] = VideoFormat.PORTRAIT):
+    def __init__(self, target_format: Tuple[int, int] = VideoFormat.PORTRAIT,
+                 profile: RenderProfile = PROFILE_FULL, emergency_fallback: bool = True):
         """
         Initialize the smart video editor.
         
         Args:
             target_format: Target video dimensions (width, height)
+            profile: Render profile; the preview profile renders a scaled-down proxy
+            emergency_fallback: On a failed render, write a placeholder clip instead of
+                raising (off for queued/batch jobs, whose failures must be retried)
         """
-        self.target_format = target_format
+        # Layout decisions follow the nominal format; pixels follow the profile
+        self.base_format = target_format
+        self.profile = profile
+        self.emergency_fallback = emergency_fallback
+        self.target_format = profile.frame_size(target_format)
         self.target_aspect_ratio = target_format[0] / target_format[1]
         
         # Initialize system monitoring
         self._initialize_system_metrics()
         
+        # Shared sprite cache for captions and text overlays
+        self.text_renderer = get_text_renderer(TEXT_SPRITE_CACHE_SIZE, CAPTIONS_FONT_PATH)
+        
         # Performance tracking
         self.processing_stats = {
             "clips_processed": 0,
@@ -110,32 +159,35 @@ class SmartVideoEditor:
         }
         
         log.info(f"SmartVideoEditor initialized")
-        log.info(f"Target format: {target_format[0]}x{target_format[1]} (aspect: {self.target_aspect_ratio:.3f})")
+        log.info(f"Target format: {self.target_format[0]}x{self.target_format[1]} (aspect: {self.target_aspect_ratio:.3f})"
+                 + (f", {profile.name} profile @ {profile.fps}fps" if profile.preview else ""))
         log.info(f"System: {self.system_metrics.total_ram_gb:.1f}GB RAM, Safe limit: {self.system_metrics.safe_limit_gb:.1f}GB")
     
     def _initialize_system_metrics(self) -> None:
-        """Initialize system resource monitoring."""
-        memory = psutil.virtual_memory()
-        cpu_percent = psutil.cpu_percent(interval=0.1)
+        """Initialize system resource monitoring from the shared background sampler."""
+        self.resource_monitor = get_resource_monitor()
+        snapshot = self.resource_monitor.latest()
         
         self.system_metrics = SystemResourceMetrics(
-            total_ram_gb=memory.total / (1024**3),
-            used_ram_gb=memory.used / (1024**3),
-            available_ram_gb=(memory.available / (1024**3)),
-            safe_limit_gb=(memory.total / (1024**3)) * 0.75,  # Use 75% max
-            cpu_usage_percent=cpu_percent
+            total_ram_gb=snapshot.total_ram_gb,
+            used_ram_gb=snapshot.used_ram_gb,
+            available_ram_gb=snapshot.available_ram_gb,
+            safe_limit_gb=snapshot.total_ram_gb * 0.75,  # Use 75% max
+            cpu_usage_percent=snapshot.cpu_percent
         )
     
     def _update_system_metrics(self) -> SystemResourceMetrics:
-        """Update current system resource metrics."""
-        memory = psutil.virtual_memory()
-        self.system_metrics.used_ram_gb = memory.used / (1024**3)
-        self.system_metrics.available_ram_gb = memory.available / (1024**3)
-        self.system_metrics.cpu_usage_percent = psutil.cpu_percent(interval=0.1)
+        """Update current system resource metrics (non-blocking snapshot read)."""
+        snapshot = self.resource_monitor.latest()
+        self.system_metrics.used_ram_gb = snapshot.used_ram_gb
+        self.system_metrics.available_ram_gb = snapshot.available_ram_gb
+        self.system_metrics.cpu_usage_percent = snapshot.cpu_percent
         
-        # Track peak memory usage
-        if self.system_metrics.used_ram_gb > self.processing_stats["memory_peak_usage"]:
-            self.processing_stats["memory_peak_usage"] = self.system_metrics.used_ram_gb
+        # Track peak memory usage (the sampler also catches peaks between reads)
+        self.processing_stats["memory_peak_usage"] = max(
+            self.processing_stats["memory_peak_usage"],
+            self.resource_monitor.peak_used_ram_gb
+        )
         
         return self.system_metrics
     
@@ -146,8 +198,8 @@ class SmartVideoEditor:
         
         if metrics_before.is_memory_critical:
             log.warning(f"Memory critical before {operation_name}. Forcing cleanup...")
-            gc.collect()
-            metrics_before = self._update_system_metrics()
+            if self.resource_monitor.collect_if_pressure(operation_name, force_signal=True):
+                metrics_before = self._update_system_metrics()
         
         start_time = time.time()
         
@@ -174,33 +226,7 @@ class SmartVideoEditor:
         Returns:
             Dict with crop parameters: {'x1', 'y1', 'x2', 'y2'}
         """
-        original_w, original_h = original_size
-        target_w, target_h = self.target_format
-        
-        original_aspect = original_w / original_h
-        
-        if abs(original_aspect - self.target_aspect_ratio) < 0.05:
-            # Aspect ratios are very close, no cropping needed
-            return {}
-        
-        if original_aspect > self.target_aspect_ratio:
-            # Video is too wide - crop sides (letterbox removal)
-            new_width = int(original_h * self.target_aspect_ratio)
-            x_center = original_w // 2
-            x1 = max(0, x_center - new_width // 2)
-            x2 = min(original_w, x1 + new_width)
-            
-            log.debug(f"Horizontal crop: {original_w}px → {new_width}px (x1={x1}, x2={x2})")
-            return {'x1': x1, 'x2': x2}
-        else:
-            # Video is too tall - crop top/bottom (pillarbox removal)
-            new_height = int(original_w / self.target_aspect_ratio)
-            y_center = original_h // 2
-            y1 = max(0, y_center - new_height // 2)
-            y2 = min(original_h, y1 + new_height)
-            
-            log.debug(f"Vertical crop: {original_h}px → {new_height}px (y1={y1}, y2={y2})")
-            return {'y1': y1, 'y2': y2}
+        return smart_crop_parameters(original_size, self.target_format)
     
     def _smart_resize_to_target_format(self, clip: VideoClip) -> VideoClip:
         """
@@ -237,14 +263,53 @@ class SmartVideoEditor:
             log.error(f"Smart resize failed: {e}. Using fallback basic resize.")
             return resize(clip, newsize=self.target_format)
     
+    def _render_overlay_sprite(self, text: str, font_size: int = 80) -> np.ndarray:
+        """Rasterize overlay text (wrapped to the frame width) as an RGBA sprite."""
+        # Adjust font size based on target format
+        if self.base_format == VideoFormat.PORTRAIT:
+            adjusted_font_size = min(font_size, 100)  # Limit for mobile readability
+        else:
+            adjusted_font_size = font_size
+        
+        style = TextStyle(
+            font_path=CAPTIONS_FONT_PATH,
+            font_size=adjusted_font_size,
+            color='white',
+            stroke_color='black',
+            stroke_width=3
+        ).scaled(self.profile.scale)
+        return self.text_renderer.render(text, style, max_width=int(self.target_format[0] * 0.9))
+    
+    def _caption_style(self) -> TextStyle:
+        """Text style for word-by-word captions in the current format."""
+        return TextStyle(
+            font_path=CAPTIONS_FONT_PATH,
+            font_size=70 if self.base_format == VideoFormat.PORTRAIT else 90,
+            color='yellow',
+            stroke_color='black',
+            stroke_width=2
+        ).scaled(self.profile.scale)
+    
+    def _caption_band_height(self, style: TextStyle) -> int:
+        return self.text_renderer.line_height(style) + int(round(20 * self.profile.scale))
+    
+    def _caption_band_top(self, band_height: int) -> int:
+        """Top edge (px) of the caption band; mirrors the positions used in _apply_overlays_safely."""
+        if self.base_format == VideoFormat.PORTRAIT:
+            return self.target_format[1] - band_height
+        return int(self.target_format[1] * 0.85)
+    
     def _create_optimized_text_overlay(self, 
                                      text: str, 
                                      duration: float,
                                      font_size: int = 80,
-                                     position: Union[str, Tuple] = 'center') -> Optional[TextClip]:
+                                     position: Union[str, Tuple] = 'center') -> Optional[VideoClip]:
         """
         Create memory-optimized text overlay with proper styling.
         
+        The text is rasterized once through the shared sprite cache and wrapped
+        to the frame width, so no ImageMagick process is involved.
+        
         Args:
             text: Text content
             duration: Clip duration
@@ -252,27 +317,13 @@ class SmartVideoEditor:
             position: Text position
             
         Returns:
-            Text clip or None if creation fails
+            Text clip (with alpha mask) or None if creation fails
         """
         try:
-            # Adjust font size based on target format
-            if self.target_format == VideoFormat.PORTRAIT:
-                adjusted_font_size = min(font_size, 100)  # Limit for mobile readability
-            else:
-                adjusted_font_size = font_size
-            
-            # Create text clip with optimized settings
-            text_clip = TextClip(
-                text,
-                fontsize=adjusted_font_size,
-                color='white',
-                font='Arial-Bold',
-                stroke_color='black',
-                stroke_width=3,
-                method='caption',  # Better text rendering
-                align='center'
-            ).set_position(position).set_duration(duration)
+            sprite = self._render_overlay_sprite(text, font_size)
             
+            # ImageClip derives the mask from the alpha channel
+            text_clip = ImageClip(sprite).set_position(position).set_duration(duration)
             return text_clip
             
         except Exception as e:
@@ -296,66 +347,49 @@ class SmartVideoEditor:
             if not word_timings:
                 return None
             
-            # Limit word count for performance
-            max_words = 100 if self.system_metrics.available_ram_gb > 2.0 else 50
-            limited_timings = word_timings[:max_words]
-            
-            # Pre-validate timing data
-            valid_timings = []
-            for word_data in limited_timings:
-                if (isinstance(word_data, dict) and 
-                    all(key in word_data for key in ['word', 'start', 'end']) and
-                    isinstance(word_data['start'], (int, float)) and
-                    isinstance(word_data['end'], (int, float))):
-                    valid_timings.append(word_data)
-            
-            if not valid_timings:
+            # Compile timings once; per-frame lookup is a bisect instead of a scan
+            timing_index = WordTimingIndex.from_timings(word_timings)
+            if not len(timing_index):
                 log.warning("No valid word timings found for captions")
                 return None
             
-            # Create optimized caption renderer
-            def create_caption_frame(t: float) -> np.ndarray:
-                """Create caption frame for given time."""
+            # Caption band geometry; sprites are rasterized once and blitted per frame
+            style = self._caption_style()
+            frame_width = self.target_format[0]
+            frame_height = self._caption_band_height(style)
+            
+            # Memo of the last composited layers; consecutive frames usually show the same word
+            last_frame = {"word_id": None, "rgb": None, "mask": None}
+            
+            def create_caption_layers(t: float) -> Tuple[np.ndarray, np.ndarray]:
+                """Create (RGB, mask) caption band for given time."""
+                entry = timing_index.lookup(t)
+                word_id = int(timing_index.entries["word_id"][entry]) if entry >= 0 else -1
+                if word_id == last_frame["word_id"]:
+                    return last_frame["rgb"], last_frame["mask"]
+                
+                band = np.zeros((frame_height, frame_width, 4), dtype=np.uint8)
                 try:
-                    # Find active word
-                    active_word = None
-                    for word_data in valid_timings:
-                        if word_data['start'] <= t < word_data['end']:
-                            active_word = str(word_data['word']).upper().strip()[:30]  # Limit length
-                            break
-                    
-                    if not active_word:
-                        # Return transparent frame
-                        frame_height = 120 if self.target_format == VideoFormat.PORTRAIT else 80
-                        return np.zeros((frame_height, self.target_format[0], 3), dtype=np.uint8)
-                    
-                    # Create text frame
-                    font_size = 70 if self.target_format == VideoFormat.PORTRAIT else 90
-                    temp_text_clip = TextClip(
-                        active_word,
-                        fontsize=font_size,
-                        color='yellow',
-                        font='Arial-Bold',
-                        stroke_color='black',
-                        stroke_width=2
-                    )
-                    
-                    frame = temp_text_clip.get_frame(0)
-                    temp_text_clip.close()  # Immediate cleanup
-                    
-                    # Ensure proper format
-                    if len(frame.shape) == 3 and frame.shape[2] > 3:
-                        frame = frame[:, :, :3]
-                    
-                    return frame
-                    
+                    if word_id >= 0:
+                        sprite = self.text_renderer.render(timing_index.words[word_id], style)
+                        x = (frame_width - sprite.shape[1]) // 2
+                        y = (frame_height - sprite.shape[0]) // 2
+                        paste_rgba(band, sprite, x, y)
                 except Exception as e:
                     log.debug(f"Caption frame creation failed at t={t:.2f}: {e}")
-                    frame_height = 120 if self.target_format == VideoFormat.PORTRAIT else 80
-                    return np.zeros((frame_height, self.target_format[0], 3), dtype=np.uint8)
-            
-            caption_clip = VideoClip(make_frame=create_caption_frame, duration=duration)
-            return caption_clip
+                
+                last_frame["word_id"] = word_id
+                last_frame["rgb"] = band[..., :3]
+                last_frame["mask"] = band[..., 3] / 255.0
+                return last_frame["rgb"], last_frame["mask"]
+            
+            caption_clip = VideoClip(make_frame=lambda t: create_caption_layers(t)[0], duration=duration)
+            caption_mask = VideoClip(
+                make_frame=lambda t: create_caption_layers(t)[1],
+                duration=duration,
+                ismask=True
+            )
+            return caption_clip.set_mask(caption_mask)
             
         except Exception as e:
             log.warning(f"Caption creation failed: {e}")
@@ -404,8 +438,12 @@ class SmartVideoEditor:
                 # Process video
                 actual_duration = min(duration, clip.duration)
                 clip = clip.subclip(0, actual_duration)
-                clip = self._smart_resize_to_target_format(clip)
-                clip.fps = 24  # Standard frame rate
+                if tuple(clip.size) != tuple(self.target_format):
+                    clip = self._smart_resize_to_target_format(clip)
+                else:
+                    # Mezzanine inputs are already cropped and scaled - no per-frame resize
+                    log.debug(f"{os.path.basename(source_path)} already at target size - skipping resize")
+                clip.fps = self.profile.fps  # Segment frame rate (24, lower for previews)
                 
                 # Apply overlays based on memory availability
                 current_metrics = self._update_system_metrics()
@@ -456,7 +494,7 @@ class SmartVideoEditor:
                 )
                 if caption_overlay:
                     # Position captions appropriately for format
-                    if self.target_format == VideoFormat.PORTRAIT:
+                    if self.base_format == VideoFormat.PORTRAIT:
                         position = ('center', 'bottom')
                     else:
                         position = ('center', 0.85)
@@ -477,6 +515,28 @@ class SmartVideoEditor:
             log.warning(f"Overlay application failed: {e}. Using clip without overlays.")
             return clip
     
+    def release_clip(self, clip: Optional[VideoClip]) -> None:
+        """
+        Close a processed clip and everything it holds open.
+        
+        CompositeVideoClip.close() does not close its layers, so the source
+        reader (and any overlay/mask clips) are walked and closed explicitly.
+        """
+        if clip is None:
+            return
+        for layer in getattr(clip, 'clips', None) or []:
+            self.release_clip(layer)
+        for attached in (getattr(clip, 'mask', None), getattr(clip, 'audio', None)):
+            if attached is not None:
+                try:
+                    attached.close()
+                except Exception:
+                    pass
+        try:
+            clip.close()
+        except Exception:
+            pass
+    
     def _create_fallback_clip(self, duration: float, error_message: str = "Processing Failed") -> VideoClip:
         """Create a fallback clip for failed processing."""
         try:
@@ -516,13 +576,19 @@ class SmartVideoEditor:
     
     def _determine_optimal_render_settings(self) -> RenderQuality:
         """Determine optimal render settings based on system resources."""
+        if self.profile.preview:
+            return RenderQuality.PREVIEW
+        
         current_metrics = self._update_system_metrics()
         
+        # Smooth CPU over the sampler window so one busy instant doesn't downgrade quality
+        cpu_percent = self.resource_monitor.average_cpu_percent()
+        
         if (current_metrics.available_ram_gb > 3.0 and 
-            current_metrics.cpu_usage_percent < 70):
+            cpu_percent < 70):
             return RenderQuality.HIGH
         elif (current_metrics.available_ram_gb > 1.5 and 
-              current_metrics.cpu_usage_percent < 85):
+              cpu_percent < 85):
             return RenderQuality.MEDIUM
         else:
             return RenderQuality.LOW
@@ -557,43 +623,24 @@ class SmartVideoEditor:
                         f"{current_metrics.available_ram_gb:.1f}GB available, "
                         f"max {max_clips} clips recommended")
                 
-                # Filter and limit clips
+                # Filter clips - content is never dropped; large timelines should use streaming render
                 valid_clips = [c for c in clips 
                               if c is not None and hasattr(c, 'duration') and c.duration > 0]
                 
                 if len(valid_clips) > max_clips:
-                    log.warning(f"Limiting clips from {len(valid_clips)} to {max_clips} for memory safety")
-                    valid_clips = valid_clips[:max_clips]
+                    log.warning(f"Rendering {len(valid_clips)} in-memory clips (>{max_clips} recommended). "
+                                f"Use the 'streaming' render backend to bound memory.")
                 
                 if not valid_clips:
+                    if not self.emergency_fallback:
+                        raise VideoProcessingError("No valid clips for rendering")
                     log.error("No valid clips for rendering")
                     valid_clips = [self._create_fallback_clip(5.0, "No Content Available")]
                 
-                # Smart duration management
-                total_duration = sum(c.duration for c in valid_clips)
-                max_duration = 120.0 if current_metrics.available_ram_gb > 2.0 else 60.0
-                
-                if total_duration > max_duration:
-                    log.info(f"Video duration ({total_duration:.1f}s) exceeds limit ({max_duration}s). Scaling clips.")
-                    scale_factor = max_duration / total_duration
-                    scaled_clips = []
-                    
-                    for clip in valid_clips:
-                        new_duration = max(0.5, clip.duration * scale_factor)
-                        try:
-                            scaled_clip = clip.subclip(0, new_duration)
-                            scaled_clip.fps = 24
-                            scaled_clips.append(scaled_clip)
-                        except Exception as e:
-                            log.warning(f"Clip scaling failed: {e}")
-                            scaled_clips.append(clip)  # Keep original if scaling fails
-                    
-                    valid_clips = scaled_clips
-                
                 # Concatenate clips
                 log.info(f"Concatenating {len(valid_clips)} clips...")
                 final_video = concatenate_videoclips(valid_clips)
-                final_video.fps = 24
+                final_video.fps = self.profile.fps
                 
                 # Add audio if available and memory permits
                 if audio_track and current_metrics.available_ram_gb > 1.0:
@@ -631,12 +678,9 @@ class SmartVideoEditor:
                 # Cleanup and final verification
                 final_video.close()
                 for clip in valid_clips:
-                    try:
-                        clip.close()
-                    except Exception:
-                        pass
+                    self.release_clip(clip)
                 
-                gc.collect()
+                self.resource_monitor.collect_if_pressure("video_render")
                 
                 # Verify output
                 if not os.path.exists(output_path):
@@ -657,6 +701,8 @@ class SmartVideoEditor:
                 
             except Exception as e:
                 log.error(f"❌ Video rendering failed: {e}")
+                if not self.emergency_fallback:
+                    raise VideoProcessingError(f"Render failed: {e}") from e
                 
                 # Emergency render attempt
                 try:
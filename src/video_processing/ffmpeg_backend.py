@@ -0,0 +1,229 @@
+"""
+FFmpeg Render Backend - compiles a RenderJob into a single ffmpeg invocation.
+
+Trim, crop, scale, fps conversion, text/caption overlays and concatenation
+all run inside one ffmpeg filtergraph (in C) instead of pushing every frame
+through moviepy in Python. The soundtrack is the same pre-mixed WAV every
+backend muxes (see audio_processing.mixer), so loudness and ducking do not
+depend on the backend. Geometry, styling and codec
+settings are taken from the SmartVideoEditor so the output matches the
+moviepy path and the two can be A/B compared.
+"""
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from config import OUTPUT_DIR, TEMP_ASSETS_DIR
+from media_probe import probe_media
+from utils import sanitize_filename
+from video_processing.caption_index import WordTimingIndex
+from video_processing.editor import SmartVideoEditor, VideoProcessingError
+from video_processing.render_plan import BACKEND_FFMPEG, RenderJob
+
+log = logging.getLogger(__name__)
+
+AUDIO_SAMPLE_RATE = 44100
+MAX_CAPTION_SPRITES_PER_SEGMENT = 150  # Beyond this the filtergraph gets unwieldy
+
+class FFmpegRenderBackend:
+    """Renders a RenderJob with one ffmpeg process."""
+
+    name = BACKEND_FFMPEG
+
+    def __init__(self, editor: SmartVideoEditor, ffmpeg_binary: str = "ffmpeg",
+                 workspace_dir: str = TEMP_ASSETS_DIR):
+        """
+        Args:
+            editor: Editor whose format, styling and quality policy are mirrored
+            ffmpeg_binary: ffmpeg executable name or path
+            workspace_dir: Job workspace holding the render's scratch directory
+        """
+        self.editor = editor
+        self.ffmpeg_binary = ffmpeg_binary
+        self.workspace_dir = workspace_dir
+
+    # --- Capability Check ---
+    def supports(self, job: RenderJob) -> Tuple[bool, str]:
+        """
+        Check whether this backend can render `job`.
+
+        Returns:
+            (supported, reason) - reason explains why not when unsupported
+        """
+        if not shutil.which(self.ffmpeg_binary):
+            return False, "ffmpeg executable not found"
+        if not job.segments:
+            return False, "no segments to render"
+        for spec in job.segments:
+            if not os.path.exists(spec.source_path):
+                return False, f"missing source for scene {spec.scene_id}"
+            if spec.caption_data:
+                distinct_words = len(WordTimingIndex.from_timings(spec.caption_data).words)
+                if distinct_words > MAX_CAPTION_SPRITES_PER_SEGMENT:
+                    return False, f"scene {spec.scene_id} has {distinct_words} distinct caption words"
+        for path in job.narration_paths:
+            if not os.path.exists(path):
+                return False, f"missing narration file {path}"
+        return True, ""
+
+    # --- Helpers ---
+    def _write_sprite(self, sprite: np.ndarray, workdir: str, name: str) -> str:
+        path = os.path.join(workdir, f"{name}.png")
+        Image.fromarray(np.ascontiguousarray(sprite), "RGBA").save(path)
+        return path
+
+    def _crop_filter(self, info: Dict) -> Optional[str]:
+        """Translate the editor's smart-crop parameters into an ffmpeg crop filter."""
+        width, height = info.get("width"), info.get("height")
+        if not width or not height:
+            return None
+        params = self.editor._calculate_smart_crop_parameters((width, height))
+        if "x1" in params:
+            return f"crop={params['x2'] - params['x1']}:{height}:{params['x1']}:0"
+        if "y1" in params:
+            return f"crop={width}:{params['y2'] - params['y1']}:0:{params['y1']}"
+        return None
+
+    @staticmethod
+    def _enable_expr(windows: List[Tuple[float, float]]) -> str:
+        return "+".join(f"between(t,{start:.3f},{end:.3f})" for start, end in windows)
+
+    # --- Command Construction ---
+    def build_command(self, job: RenderJob, workdir: str, output_path: str,
+                      audio_path: Optional[str] = None) -> List[str]:
+        """
+        Build the complete ffmpeg argv for `job`, muxing the pre-mixed `audio_path`.
+
+        Sprites for overlays and captions are written into `workdir`.
+        """
+        target_w, target_h = self.editor.target_format
+        quality = self.editor._determine_optimal_render_settings().value
+
+        inputs: List[str] = []
+        filters: List[str] = []
+        input_count = 0
+
+        def add_input(*args: str) -> int:
+            nonlocal input_count
+            inputs.extend(args)
+            input_count += 1
+            return input_count - 1
+
+        segment_labels = []
+        total_video_duration = 0.0
+        caption_style = self.editor._caption_style()
+        band_height = self.editor._caption_band_height(caption_style)
+        band_top = self.editor._caption_band_top(band_height)
+
+        for i, spec in enumerate(job.segments):
+            info = probe_media(spec.source_path) or {}
+            source_duration = info.get("duration") or spec.duration
+            duration = min(spec.duration, source_duration)
+            total_video_duration += duration
+
+            src = add_input("-t", f"{duration:.3f}", "-i", spec.source_path)
+            chain = [f"trim=duration={duration:.3f}", "setpts=PTS-STARTPTS"]
+            if (info.get("width"), info.get("height")) != (target_w, target_h):
+                if crop := self._crop_filter(info):
+                    chain.append(crop)
+                chain += [f"scale={target_w}:{target_h}", "setsar=1"]
+            if abs((info.get("fps") or 0.0) - self.editor.profile.fps) > 0.01:
+                chain.append(f"fps={self.editor.profile.fps}")
+            label = f"s{i}"
+            filters.append(f"[{src}:v]{','.join(chain)}[{label}]")
+
+            overlays: List[Tuple[int, int, int, Optional[str]]] = []  # (input, x, y, enable)
+
+            if spec.overlay_plan and spec.overlay_plan.text_content:
+                sprite = self.editor._render_overlay_sprite(
+                    spec.overlay_plan.text_content, spec.overlay_plan.font_size
+                )
+                png = self._write_sprite(sprite, workdir, f"overlay_{i}")
+                overlays.append((add_input("-i", png),
+                                 (target_w - sprite.shape[1]) // 2,
+                                 (target_h - sprite.shape[0]) // 2, None))
+
+            if spec.caption_data:
+                index = WordTimingIndex.from_timings(spec.caption_data)
+                windows: Dict[int, List[Tuple[float, float]]] = {}
+                for start, end, word_id in index.entries.tolist():
+                    if start < duration:
+                        windows.setdefault(word_id, []).append((start, min(end, duration)))
+                for word_id, word_windows in windows.items():
+                    sprite = self.editor.text_renderer.render(index.words[word_id], caption_style)
+                    png = self._write_sprite(sprite, workdir, f"caption_{i}_{word_id}")
+                    overlays.append((add_input("-i", png),
+                                     (target_w - sprite.shape[1]) // 2,
+                                     band_top + (band_height - sprite.shape[0]) // 2,
+                                     self._enable_expr(word_windows)))
+
+            for k, (overlay_input, x, y, enable) in enumerate(overlays):
+                next_label = f"s{i}o{k}"
+                enable_opt = f":enable='{enable}'" if enable else ""
+                filters.append(f"[{label}][{overlay_input}:v]overlay=x={x}:y={y}{enable_opt}[{next_label}]")
+                label = next_label
+            segment_labels.append(label)
+
+        concat_in = "".join(f"[{label}]" for label in segment_labels)
+        filters.append(
+            f"{concat_in}concat=n={len(segment_labels)}:v=1:a=0,fps={quality['fps']},format=yuv420p[vout]"
+        )
+
+        # --- Audio: the pre-mixed soundtrack is the only audio input ---
+        audio_input = None
+        if audio_path and os.path.exists(audio_path):
+            audio_input = add_input("-i", audio_path)
+
+        cmd = [self.ffmpeg_binary, "-y", "-hide_banner", "-loglevel", "error", *inputs,
+               "-filter_complex", ";".join(filters), "-map", "[vout]"]
+        if audio_input is not None:
+            cmd += ["-map", f"{audio_input}:a", "-c:a", "aac", "-ar", str(AUDIO_SAMPLE_RATE)]
+        cmd += [
+            "-c:v", "libx264", "-preset", quality["preset"], "-b:v", quality["bitrate"],
+            "-pix_fmt", "yuv420p", "-threads", str(quality["threads"]),
+            "-t", f"{total_video_duration:.3f}", "-movflags", "+faststart", output_path,
+        ]
+        return cmd
+
+    # --- Rendering ---
+    def render(self, job: RenderJob, audio_path: Optional[str],
+               output_path: Optional[str] = None) -> str:
+        """
+        Render `job` to disk with the pre-mixed `audio_path` as the soundtrack.
+
+        Returns:
+            Path to the rendered video
+
+        Raises:
+            VideoProcessingError: If the job is unsupported or ffmpeg fails
+        """
+        supported, reason = self.supports(job)
+        if not supported:
+            raise VideoProcessingError(f"ffmpeg backend cannot render job: {reason}")
+
+        output_path = output_path or os.path.join(OUTPUT_DIR, f"{sanitize_filename(job.title)}.mp4")
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        os.makedirs(self.workspace_dir, exist_ok=True)
+        workdir = tempfile.mkdtemp(prefix="ffmpeg_render_", dir=self.workspace_dir)
+
+        try:
+            cmd = self.build_command(job, workdir, output_path, audio_path)
+            log.info(f"🎞️ Rendering {len(job.segments)} segments with ffmpeg filtergraph backend...")
+            log.debug(f"ffmpeg command: {' '.join(cmd)}")
+            result = subprocess.run(cmd, capture_output=True, text=True)
+            if result.returncode != 0:
+                raise VideoProcessingError(f"ffmpeg exited with {result.returncode}: {result.stderr[-2000:]}")
+
+            if not os.path.exists(output_path) or os.path.getsize(output_path) < 1000:
+                raise VideoProcessingError("ffmpeg produced no usable output file")
+
+            log.info(f"✅ Video rendered successfully (ffmpeg): {output_path}")
+            return output_path
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
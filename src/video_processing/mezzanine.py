@@ -0,0 +1,160 @@
+"""
+Mezzanine Transcode Pool - normalizes stock footage in the background.
+
+Stock clips arrive in arbitrary resolutions, frame rates and long-GOP
+encodings, and every render backend would otherwise crop, scale and
+resample them frame by frame. As soon as a clip lands, this pool transcodes
+it with ffmpeg to a mezzanine at the target format and segment frame rate,
+trimmed to the scene's duration and encoded with a short GOP so seeks are
+cheap. A clip whose scene duration is not known yet is only transcoded
+whole, and only if it fits the window; anything longer keeps its original,
+so a mezzanine never cuts footage a scene needs. The transcodes run on
+background threads (ffmpeg does the work), overlapping with the remaining
+downloads and TTS; the editor then sees clips that are already at target
+size and skips its resize.
+"""
+import asyncio
+import logging
+import os
+import subprocess
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from media_probe import probe_media
+from video_processing.editor import smart_crop_parameters
+
+log = logging.getLogger(__name__)
+
+MEZZANINE_FPS = 24      # Same per-segment rate process_segment applies
+MEZZANINE_GOP = 12      # A keyframe every half second
+MEZZANINE_CRF = 18      # Visually lossless; the final encode sets the delivery quality
+
+class MezzaninePool:
+    """Background ffmpeg transcodes of downloaded clips to render-ready mezzanines."""
+
+    def __init__(
+        self,
+        target_format: Tuple[int, int],
+        workdir: str,
+        max_workers: int = 2,
+        max_seconds: float = 30.0,
+        ffmpeg_binary: str = "ffmpeg",
+        fps: int = MEZZANINE_FPS
+    ):
+        """
+        Args:
+            target_format: Output (width, height)
+            workdir: Directory for the mezzanine files
+            max_workers: Concurrent ffmpeg transcodes
+            max_seconds: Longest mezzanine; longer scenes or clips keep their original
+            ffmpeg_binary: ffmpeg executable name or path
+            fps: Mezzanine frame rate (the render profile's segment rate)
+        """
+        self.target_format = target_format
+        self.workdir = workdir
+        self.max_seconds = max_seconds
+        self.ffmpeg_binary = ffmpeg_binary
+        self.fps = fps
+        self.stats = {"transcoded": 0, "skipped": 0, "failed": 0, "seconds": 0.0}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mezzanine")
+        self._jobs: Dict[Tuple[str, Optional[float]], Future] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, source_path: str, duration: Optional[float] = None) -> Future:
+        """
+        Queue a transcode of `source_path` (deduplicated per source and duration).
+
+        Args:
+            source_path: Downloaded clip
+            duration: Seconds of the clip the scene uses; None transcodes the whole
+                clip if it fits within `max_seconds`
+
+        Returns:
+            Future resolving to the mezzanine path, or None if the transcode was
+            skipped or failed (callers keep the original)
+        """
+        window = round(duration, 3) if duration else None
+        if window is not None and window > self.max_seconds:
+            with self._lock:
+                self.stats["skipped"] += 1
+            skipped: Future = Future()
+            skipped.set_result(None)
+            return skipped
+        key = (os.path.abspath(source_path), window)
+        with self._lock:
+            if key not in self._jobs:
+                self._jobs[key] = self._executor.submit(self._transcode, key[0], window)
+            return self._jobs[key]
+
+    async def transcode(self, source_path: str, duration: Optional[float] = None) -> Optional[str]:
+        """Await the mezzanine for `source_path` without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(source_path, duration))
+
+    def _video_filter(self, info: Dict) -> str:
+        target_w, target_h = self.target_format
+        chain = []
+        width, height = info.get("width"), info.get("height")
+        if width and height:
+            params = smart_crop_parameters((width, height), self.target_format)
+            if "x1" in params:
+                chain.append(f"crop={params['x2'] - params['x1']}:{height}:{params['x1']}:0")
+            elif "y1" in params:
+                chain.append(f"crop={width}:{params['y2'] - params['y1']}:0:{params['y1']}")
+        chain += [f"scale={target_w}:{target_h}:flags=lanczos", "setsar=1", f"fps={self.fps}",
+                  "format=yuv420p"]
+        return ",".join(chain)
+
+    def _transcode(self, source_path: str, window: Optional[float]) -> Optional[str]:
+        started = time.monotonic()
+        info = probe_media(source_path) or {}
+        if window is None and not 0 < (info.get("duration") or 0) <= self.max_seconds:
+            # Unknown scene duration: a trimmed mezzanine could be shorter than the scene
+            with self._lock:
+                self.stats["skipped"] += 1
+            return None
+        base = os.path.splitext(os.path.basename(source_path))[0]
+        suffix = f"{window:g}s" if window is not None else "full"
+        output_path = os.path.join(
+            self.workdir, f"{base}_{self.target_format[0]}x{self.target_format[1]}_{suffix}.mezz.mp4"
+        )
+        tmp_path = f"{output_path}.tmp.mp4"
+        os.makedirs(self.workdir, exist_ok=True)
+        cmd = [
+            self.ffmpeg_binary, "-y", "-hide_banner", "-loglevel", "error",
+            "-i", source_path, *(["-t", f"{window:.3f}"] if window is not None else []), "-an",
+            "-vf", self._video_filter(info),
+            "-c:v", "libx264", "-preset", "veryfast", "-crf", str(MEZZANINE_CRF),
+            "-g", str(MEZZANINE_GOP), "-keyint_min", str(MEZZANINE_GOP), "-sc_threshold", "0",
+            "-movflags", "+faststart", tmp_path
+        ]
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=600)
+            if result.returncode != 0 or not os.path.exists(tmp_path) or os.path.getsize(tmp_path) < 1000:
+                raise RuntimeError(result.stderr[-500:] or "empty output")
+            os.replace(tmp_path, output_path)
+        except (subprocess.SubprocessError, OSError, RuntimeError) as e:
+            with self._lock:
+                self.stats["failed"] += 1
+            log.warning(f"⚠️ Mezzanine transcode failed for {os.path.basename(source_path)}: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return None
+
+        elapsed = time.monotonic() - started
+        with self._lock:
+            self.stats["transcoded"] += 1
+            self.stats["seconds"] += elapsed
+        log.debug(f"🎞️ Mezzanine ready: {os.path.basename(output_path)} in {elapsed:.1f}s")
+        return output_path
+
+    def summary(self) -> str:
+        return (f"mezzanine: {self.stats['transcoded']} transcoded, {self.stats['skipped']} skipped, "
+                f"{self.stats['failed']} failed, "
+                f"{self.stats['seconds']:.1f}s of background ffmpeg time")
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,180 @@
+"""
+Parallel Segment Renderer - encodes segments concurrently, joins without re-encoding.
+
+Each SegmentSpec is processed and encoded in its own worker process to an
+intermediate MP4 using one fixed set of codec parameters. The intermediates
+are then joined with ffmpeg's concat demuxer (stream copy) and the final mixed
+audio track is muxed in the same pass, so wall time scales with core count
+instead of being bound by a single encoder.
+"""
+import logging
+import multiprocessing
+import os
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import OUTPUT_DIR, RENDER_WORKERS, TEMP_ASSETS_DIR
+from utils import sanitize_filename
+from video_processing.editor import SmartVideoEditor, VideoProcessingError
+from video_processing.render_plan import BACKEND_PARALLEL, PROFILE_FULL, RenderJob, RenderProfile, SegmentSpec
+
+log = logging.getLogger(__name__)
+
+SEGMENT_RAM_ESTIMATE_GB = 1.0  # Rough peak per worker for one 1080p segment
+
+def encoder_pool(max_workers: int) -> ProcessPoolExecutor:
+    """
+    Process pool for segment encodes, started with `spawn`.
+
+    The parent runs background threads (resource monitor sampler, HTTP client
+    loop); forked children would inherit a dead sampler with a frozen snapshot
+    and possibly locks held by those threads at fork time.
+    """
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+
+# Per-process editor, created lazily inside each worker
+_worker_editor: Optional[SmartVideoEditor] = None
+
+def _encode_segment_worker(
+    spec: SegmentSpec,
+    output_path: str,
+    target_format: Tuple[int, int],
+    codec_settings: Dict[str, Any],
+    profile: RenderProfile = PROFILE_FULL
+) -> Tuple[str, str]:
+    """
+    Process one segment and encode it (video only) to `output_path`.
+
+    Runs in a worker process. Every worker receives the same codec settings,
+    which is what makes stream-copy concatenation of the results valid.
+    """
+    global _worker_editor
+    if (_worker_editor is None or _worker_editor.base_format != target_format
+            or _worker_editor.profile != profile):
+        _worker_editor = SmartVideoEditor(target_format, profile)
+
+    clip = _worker_editor.process_segment(
+        source_path=spec.source_path,
+        duration=spec.duration,
+        overlay_plan=spec.overlay_plan,
+        caption_data=spec.caption_data
+    )
+    try:
+        clip.write_videofile(
+            output_path,
+            codec='libx264',
+            audio=False,
+            logger=None,
+            ffmpeg_params=["-pix_fmt", "yuv420p"],
+            **codec_settings
+        )
+    finally:
+        clip.close()
+    return spec.scene_id, output_path
+
+class ParallelSegmentRenderer:
+    """Renders a RenderJob by encoding its segments in a process pool."""
+
+    name = BACKEND_PARALLEL
+
+    def __init__(self, editor: SmartVideoEditor, max_workers: Optional[int] = None,
+                 workspace_dir: str = TEMP_ASSETS_DIR):
+        """
+        Args:
+            editor: Editor providing the target format and quality policy
+            max_workers: Worker process cap (default: RENDER_WORKERS or CPU count)
+            workspace_dir: Job workspace holding the segment scratch directory
+        """
+        self.editor = editor
+        self.max_workers = max_workers or RENDER_WORKERS or os.cpu_count() or 1
+        self.workspace_dir = workspace_dir
+
+    def _worker_count(self, segment_count: int) -> int:
+        """Limit workers by CPU, segment count and available RAM."""
+        metrics = self.editor._update_system_metrics()
+        ram_bound = max(1, int(metrics.available_ram_gb / SEGMENT_RAM_ESTIMATE_GB))
+        return max(1, min(self.max_workers, segment_count, ram_bound))
+
+    def _codec_settings(self) -> Dict[str, Any]:
+        """One shared codec configuration; each worker encodes single-threaded."""
+        settings = dict(self.editor._determine_optimal_render_settings().value)
+        settings["threads"] = 1
+        return settings
+
+    def _concat_and_mux(self, segment_paths: List[str], audio_path: Optional[str],
+                        workdir: str, output_path: str) -> None:
+        list_path = os.path.join(workdir, "segments.txt")
+        with open(list_path, "w") as f:
+            for path in segment_paths:
+                escaped = os.path.abspath(path).replace("'", "'\\''")
+                f.write(f"file '{escaped}'\n")
+
+        cmd = ["ffmpeg", "-y", "-hide_banner", "-loglevel", "error",
+               "-f", "concat", "-safe", "0", "-i", list_path]
+        if audio_path and os.path.exists(audio_path):
+            cmd += ["-i", audio_path, "-map", "0:v", "-map", "1:a",
+                    "-c:v", "copy", "-c:a", "aac", "-shortest"]
+        else:
+            cmd += ["-c", "copy"]
+        cmd += ["-movflags", "+faststart", output_path]
+
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise VideoProcessingError(f"Segment concat failed: {result.stderr[-2000:]}")
+
+    def render(self, job: RenderJob, audio_path: Optional[str],
+               output_path: Optional[str] = None) -> str:
+        """
+        Render `job`, muxing the pre-mixed `audio_path` once at the end.
+
+        Returns:
+            Path to the rendered video
+
+        Raises:
+            VideoProcessingError: If any segment or the final concat fails
+        """
+        if not job.segments:
+            raise VideoProcessingError("No segments to render")
+        if not shutil.which("ffmpeg"):
+            raise VideoProcessingError("ffmpeg executable not found")
+
+        output_path = output_path or os.path.join(OUTPUT_DIR, f"{sanitize_filename(job.title)}.mp4")
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        os.makedirs(self.workspace_dir, exist_ok=True)
+        workdir = tempfile.mkdtemp(prefix="parallel_render_", dir=self.workspace_dir)
+
+        workers = self._worker_count(len(job.segments))
+        codec_settings = self._codec_settings()
+        log.info(f"🎞️ Encoding {len(job.segments)} segments on {workers} worker processes "
+                 f"({codec_settings['preset']}, {codec_settings['bitrate']})...")
+
+        try:
+            segment_paths = [os.path.join(workdir, f"segment_{i:04d}.mp4") for i in range(len(job.segments))]
+            with encoder_pool(workers) as pool:
+                futures = {
+                    pool.submit(_encode_segment_worker, spec, path,
+                                self.editor.base_format, codec_settings, self.editor.profile): spec.scene_id
+                    for spec, path in zip(job.segments, segment_paths)
+                }
+                for future in as_completed(futures):
+                    try:
+                        future.result()
+                        log.debug(f"✅ Segment {futures[future]} encoded")
+                    except Exception as e:
+                        for pending in futures:
+                            pending.cancel()
+                        raise VideoProcessingError(f"Segment {futures[future]} failed to encode: {e}")
+
+            self._concat_and_mux(segment_paths, audio_path, workdir, output_path)
+
+            if not os.path.exists(output_path) or os.path.getsize(output_path) < 1000:
+                raise VideoProcessingError("Parallel render produced no usable output file")
+
+            self.editor.processing_stats["clips_processed"] += len(job.segments)
+            log.info(f"✅ Video rendered successfully (parallel): {output_path}")
+            return output_path
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
@@ -0,0 +1,68 @@
+"""
+Render Plan - backend-neutral description of what to render.
+
+Assembly services describe a video as a list of SegmentSpec inputs plus the
+narration and music tracks. Every render backend (moviepy, ffmpeg, ...)
+consumes the same RenderJob, which lets runs be A/B compared and lets a
+backend fall back to another when a feature is unsupported.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from models import TextOverlay
+
+# Render backend identifiers
+BACKEND_MOVIEPY = "moviepy"
+BACKEND_FFMPEG = "ffmpeg"
+BACKEND_PARALLEL = "parallel"
+BACKEND_STREAMING = "streaming"
+RENDER_BACKENDS = (BACKEND_MOVIEPY, BACKEND_FFMPEG, BACKEND_PARALLEL, BACKEND_STREAMING)
+
+@dataclass(frozen=True)
+class RenderProfile:
+    """
+    Output resolution and frame rate of a render, relative to the target format.
+
+    The full profile renders at the target format and the segment rate; the
+    preview profile runs the same pipeline as a low-resolution proxy for plan
+    review, with captions and overlays scaled by the same factor.
+    """
+    name: str
+    scale: float = 1.0
+    fps: int = 24
+    preview: bool = False
+    contact_sheet: bool = False
+
+    def frame_size(self, target_format: Tuple[int, int]) -> Tuple[int, int]:
+        """Pixel size for `target_format` under this profile (even dimensions for yuv420p)."""
+        if self.scale == 1.0:
+            return target_format
+        return tuple(max(2, int(round(d * self.scale / 2)) * 2) for d in target_format)
+
+    def output_title(self, title: str) -> str:
+        return f"{title} preview" if self.preview else title
+
+PROFILE_FULL = RenderProfile("full")
+PROFILE_PREVIEW = RenderProfile("preview", scale=0.25, fps=12, preview=True, contact_sheet=True)
+
+@dataclass
+class SegmentSpec:
+    """Inputs for one timeline segment (one scene)."""
+    scene_id: str
+    source_path: str
+    duration: float
+    overlay_plan: Optional[TextOverlay] = None
+    caption_data: Optional[List[Dict[str, Any]]] = None
+
+@dataclass
+class RenderJob:
+    """A complete render: ordered segments plus the audio that goes under them."""
+    title: str
+    segments: List[SegmentSpec] = field(default_factory=list)
+    narration_paths: List[str] = field(default_factory=list)
+    music_path: Optional[str] = None
+    ducking_level: float = 0.15
+
+    @property
+    def total_duration(self) -> float:
+        return sum(s.duration for s in self.segments)
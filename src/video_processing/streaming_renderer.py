@@ -0,0 +1,149 @@
+"""
+Streaming Timeline Renderer - out-of-core, memory-bounded rendering.
+
+Instead of opening every processed segment up front and concatenating them,
+the timeline is exposed as one lazy VideoClip. Only the segment under the
+playhead has an open reader (plus its overlays); when the encoder moves past
+it, the segment is released and the next one is opened. Peak memory is
+therefore independent of the number of segments, so long plans render in
+full instead of being truncated.
+"""
+import logging
+import os
+from bisect import bisect_right
+from typing import List, Optional
+
+import numpy as np
+from moviepy.editor import AudioFileClip, VideoClip
+
+from config import OUTPUT_DIR
+from media_probe import probe_duration
+from utils import sanitize_filename
+from video_processing.editor import SmartVideoEditor, VideoProcessingError
+from video_processing.render_plan import BACKEND_STREAMING, RenderJob
+
+log = logging.getLogger(__name__)
+
+
+class _LazyTimeline:
+    """Frame source that keeps at most one processed segment open."""
+
+    def __init__(self, editor: SmartVideoEditor, job: RenderJob, durations: List[float]):
+        self.editor = editor
+        self.job = job
+        self.durations = durations
+        self.starts: List[float] = []
+        offset = 0.0
+        for duration in durations:
+            self.starts.append(offset)
+            offset += duration
+        self.total_duration = offset
+
+        self._active_index: Optional[int] = None
+        self._active_clip: Optional[VideoClip] = None
+        self.segments_opened = 0
+
+    def _activate(self, index: int) -> VideoClip:
+        if index == self._active_index:
+            return self._active_clip
+        self.release()
+
+        spec = self.job.segments[index]
+        self._active_clip = self.editor.process_segment(
+            source_path=spec.source_path,
+            duration=self.durations[index],
+            overlay_plan=spec.overlay_plan,
+            caption_data=spec.caption_data
+        )
+        self._active_index = index
+        self.segments_opened += 1
+        log.debug(f"Streaming segment {index + 1}/{len(self.durations)} ({spec.scene_id})")
+        return self._active_clip
+
+    def release(self) -> None:
+        """Close the active segment and let memory be reclaimed."""
+        if self._active_clip is not None:
+            self.editor.release_clip(self._active_clip)
+            self.editor.resource_monitor.collect_if_pressure("streaming segment release")
+        self._active_clip = None
+        self._active_index = None
+
+    def make_frame(self, t: float) -> np.ndarray:
+        index = min(max(bisect_right(self.starts, t) - 1, 0), len(self.starts) - 1)
+        clip = self._activate(index)
+        local_t = min(t - self.starts[index], max(0.0, clip.duration - 1.0 / self.editor.profile.fps))
+        return clip.get_frame(local_t)
+
+class StreamingTimelineRenderer:
+    """Renders a RenderJob with a single open segment at any moment."""
+
+    name = BACKEND_STREAMING
+
+    def __init__(self, editor: SmartVideoEditor):
+        self.editor = editor
+
+    def _segment_durations(self, job: RenderJob) -> List[float]:
+        """Timeline durations, clamped to source length like process_segment does."""
+        durations = []
+        for spec in job.segments:
+            source_duration = probe_duration(spec.source_path)
+            durations.append(min(spec.duration, source_duration) if source_duration > 0 else spec.duration)
+        return durations
+
+    def render(self, job: RenderJob, audio_path: Optional[str],
+               output_path: Optional[str] = None) -> str:
+        """
+        Render `job` with the pre-mixed `audio_path` as the soundtrack.
+
+        Returns:
+            Path to the rendered video
+
+        Raises:
+            VideoProcessingError: If the render fails
+        """
+        if not job.segments:
+            raise VideoProcessingError("No segments to render")
+
+        output_path = output_path or os.path.join(OUTPUT_DIR, f"{sanitize_filename(job.title)}.mp4")
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+
+        timeline = _LazyTimeline(self.editor, job, self._segment_durations(job))
+        audio_clip = None
+        final_video = None
+        with self.editor._memory_guard("streaming_render"):
+            try:
+                final_video = VideoClip(make_frame=timeline.make_frame, duration=timeline.total_duration)
+                final_video.fps = self.editor.profile.fps
+
+                if audio_path and os.path.exists(audio_path):
+                    audio_clip = AudioFileClip(audio_path)
+                    final_video.audio = audio_clip.subclip(0, min(audio_clip.duration, timeline.total_duration))
+
+                render_quality = self.editor._determine_optimal_render_settings()
+                log.info(f"🎞️ Streaming {len(job.segments)} segments ({timeline.total_duration:.1f}s) "
+                         f"with {render_quality.name} quality")
+
+                final_video.write_videofile(
+                    output_path,
+                    codec='libx264',
+                    audio_codec='aac',
+                    logger='bar',
+                    **render_quality.value
+                )
+            except Exception as e:
+                raise VideoProcessingError(f"Streaming render failed: {e}")
+            finally:
+                timeline.release()
+                if audio_clip is not None:
+                    audio_clip.close()
+                if final_video is not None:
+                    final_video.close()
+
+        if not os.path.exists(output_path) or os.path.getsize(output_path) < 1000:
+            raise VideoProcessingError("Streaming render produced no usable output file")
+
+        log.info(f"✅ Video rendered successfully (streaming): {output_path}")
+        log.info(f"📊 Processing stats: {self.editor.processing_stats['clips_processed']} clips, "
+                 f"{self.editor.processing_stats['clips_failed']} failed, "
+                 f"peak RAM: {self.editor.processing_stats['memory_peak_usage']:.1f}GB")
+        return output_path
@@ -0,0 +1,231 @@
+"""
+Text Rendering Subsystem - Pillow/FreeType rasterizer with a sprite cache.
+
+Rasterizes each distinct piece of text (per font/size/color/stroke) exactly once
+into an RGBA numpy sprite and keeps it in an LRU cache. Caption and overlay
+frames are then produced by cheap numpy blits instead of spawning an
+ImageMagick-backed TextClip per frame.
+
+This module deliberately has no dependency on the application config so that
+the legacy top-level scripts can use it as well.
+"""
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+log = logging.getLogger(__name__)
+
+# Font shipped at the repository root; used when no font is configured.
+BUNDLED_FONT_PATH = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "..", "NotoSans-ThinItalic.ttf")
+)
+
+@dataclass(frozen=True)
+class TextStyle:
+    """Immutable text styling; doubles as part of the sprite cache key."""
+    font_path: Optional[str] = None
+    font_size: int = 70
+    color: str = "white"
+    stroke_color: Optional[str] = "black"
+    stroke_width: int = 2
+
+    def scaled(self, factor: float) -> "TextStyle":
+        """Return a copy with font size and stroke scaled by `factor`."""
+        return TextStyle(
+            font_path=self.font_path,
+            font_size=max(1, int(round(self.font_size * factor))),
+            color=self.color,
+            stroke_color=self.stroke_color,
+            stroke_width=max(0, int(round(self.stroke_width * factor))),
+        )
+
+class TextRenderer:
+    """
+    Rasterizes text into RGBA sprites with LRU eviction.
+
+    Sprites are returned as read-only (H, W, 4) uint8 arrays and must never be
+    modified by callers - use `blit_rgba` to composite them onto a frame.
+    """
+
+    def __init__(self, max_sprites: int = 2048, default_font_path: Optional[str] = None):
+        """
+        Args:
+            max_sprites: Maximum number of sprites kept in memory
+            default_font_path: Font used when a style does not specify one
+        """
+        self.max_sprites = max_sprites
+        self.default_font_path = default_font_path
+        self._sprites: "OrderedDict[Tuple, np.ndarray]" = OrderedDict()
+        self._fonts: Dict[Tuple[Optional[str], int], ImageFont.ImageFont] = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    # --- Font Resolution ---
+    def _load_font(self, font_path: Optional[str], font_size: int) -> ImageFont.ImageFont:
+        """Resolve a font path or name to a FreeType font, with graceful fallbacks."""
+        key = (font_path, font_size)
+        if key in self._fonts:
+            return self._fonts[key]
+
+        candidates = [font_path, self.default_font_path, BUNDLED_FONT_PATH]
+        font = None
+        for candidate in candidates:
+            if not candidate:
+                continue
+            try:
+                # truetype() also searches system font dirs for bare names
+                font = ImageFont.truetype(candidate, font_size)
+                break
+            except (OSError, ValueError):
+                log.debug(f"Font '{candidate}' not usable, trying next fallback")
+
+        if font is None:
+            log.warning("No TrueType font available - using Pillow's default bitmap font")
+            font = ImageFont.load_default()
+
+        self._fonts[key] = font
+        return font
+
+    def line_height(self, style: TextStyle) -> int:
+        """Height in pixels of a single rendered line, including stroke."""
+        font = self._load_font(style.font_path, style.font_size)
+        ascent, descent = font.getmetrics() if hasattr(font, "getmetrics") else (style.font_size, 0)
+        return ascent + descent + 2 * style.stroke_width
+
+    # --- Layout ---
+    def _wrap(self, text: str, font: ImageFont.ImageFont, max_width: Optional[int], stroke: int) -> str:
+        """Greedy word wrap so no line exceeds `max_width` pixels."""
+        if not max_width:
+            return text
+        lines: List[str] = []
+        for paragraph in text.splitlines() or [""]:
+            current = ""
+            for word in paragraph.split():
+                candidate = f"{current} {word}".strip()
+                if current and font.getlength(candidate) + 2 * stroke > max_width:
+                    lines.append(current)
+                    current = word
+                else:
+                    current = candidate
+            lines.append(current)
+        return "\n".join(lines)
+
+    # --- Rasterization ---
+    def _rasterize(self, text: str, style: TextStyle, max_width: Optional[int]) -> np.ndarray:
+        font = self._load_font(style.font_path, style.font_size)
+        stroke = style.stroke_width if style.stroke_color else 0
+        layout = self._wrap(text, font, max_width, stroke)
+
+        probe = ImageDraw.Draw(Image.new("RGBA", (1, 1)))
+        left, top, right, bottom = probe.multiline_textbbox(
+            (0, 0), layout, font=font, stroke_width=stroke, align="center"
+        )
+        width, height = max(1, right - left), max(1, bottom - top)
+
+        image = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+        ImageDraw.Draw(image).multiline_text(
+            (-left, -top), layout, font=font, fill=style.color, align="center",
+            stroke_width=stroke, stroke_fill=style.stroke_color,
+        )
+        sprite = np.asarray(image, dtype=np.uint8).copy()
+        sprite.setflags(write=False)
+        return sprite
+
+    def render(self, text: str, style: TextStyle, max_width: Optional[int] = None) -> np.ndarray:
+        """
+        Get the RGBA sprite for `text`, rasterizing it on first use.
+
+        Args:
+            text: Text to render (may contain newlines)
+            style: Text styling
+            max_width: Optional wrap width in pixels
+
+        Returns:
+            Read-only (H, W, 4) uint8 array
+        """
+        key = (text, style, max_width)
+        with self._lock:
+            sprite = self._sprites.get(key)
+            if sprite is not None:
+                self._sprites.move_to_end(key)
+                self.stats["hits"] += 1
+                return sprite
+
+        sprite = self._rasterize(text, style, max_width)
+
+        with self._lock:
+            self.stats["misses"] += 1
+            self._sprites[key] = sprite
+            while len(self._sprites) > self.max_sprites:
+                self._sprites.popitem(last=False)
+                self.stats["evictions"] += 1
+        return sprite
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sprites.clear()
+
+# --- Compositing Helpers ---
+def blit_rgba(frame: np.ndarray, sprite: np.ndarray, x: int, y: int) -> np.ndarray:
+    """
+    Alpha-composite an RGBA sprite onto an RGB uint8 frame in place.
+
+    The sprite is clipped against the frame bounds, so partially off-screen
+    positions are allowed.
+    """
+    frame_h, frame_w = frame.shape[:2]
+    sprite_h, sprite_w = sprite.shape[:2]
+
+    x0, y0 = max(0, x), max(0, y)
+    x1, y1 = min(frame_w, x + sprite_w), min(frame_h, y + sprite_h)
+    if x0 >= x1 or y0 >= y1:
+        return frame
+
+    src = sprite[y0 - y:y1 - y, x0 - x:x1 - x]
+    dst = frame[y0:y1, x0:x1]
+    alpha = src[..., 3:4].astype(np.uint16)
+    dst[...] = ((src[..., :3] * alpha + dst * (255 - alpha) + 127) // 255).astype(np.uint8)
+    return frame
+
+def paste_rgba(canvas: np.ndarray, sprite: np.ndarray, x: int, y: int) -> np.ndarray:
+    """
+    Copy an RGBA sprite into a transparent RGBA canvas in place.
+
+    Unlike `blit_rgba` no blending happens - the sprite's pixels (including
+    alpha) replace the canvas region, clipped against the canvas bounds.
+    """
+    canvas_h, canvas_w = canvas.shape[:2]
+    sprite_h, sprite_w = sprite.shape[:2]
+
+    x0, y0 = max(0, x), max(0, y)
+    x1, y1 = min(canvas_w, x + sprite_w), min(canvas_h, y + sprite_h)
+    if x0 < x1 and y0 < y1:
+        canvas[y0:y1, x0:x1] = sprite[y0 - y:y1 - y, x0 - x:x1 - x]
+    return canvas
+
+def sprite_to_rgb_and_mask(sprite: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Split an RGBA sprite into an RGB frame and a float [0, 1] mask."""
+    return sprite[..., :3], sprite[..., 3].astype(np.float32) / 255.0
+
+# --- Process-wide Renderer ---
+_shared_renderer: Optional[TextRenderer] = None
+_shared_lock = threading.Lock()
+
+def get_text_renderer(max_sprites: int = 2048, default_font_path: Optional[str] = None) -> TextRenderer:
+    """
+    Return the process-wide renderer, creating it on first call.
+
+    Arguments only take effect on the first call; later callers share the
+    same sprite cache.
+    """
+    global _shared_renderer
+    with _shared_lock:
+        if _shared_renderer is None:
+            _shared_renderer = TextRenderer(max_sprites, default_font_path)
+        return _shared_renderer
@@ -0,0 +1,23 @@
+"""
+Worker Package Initializer
+
+Persistent render workers fed by a durable local job queue. Only the queue
+and the HTTP endpoint are exported here, so submitting or inspecting jobs
+stays light; the worker itself (which imports the whole rendering stack) is
+in `worker.daemon`. Run `python -m worker --help` from src/ for the CLI.
+"""
+from .job_queue import (
+    JOB_KINDS, KIND_GENERATIVE, KIND_PLAN, KIND_REMIX, Job, JobQueue, JobQueueError
+)
+from .server import JobServer
+
+__all__ = [
+    "JOB_KINDS",
+    "Job",
+    "JobQueue",
+    "JobQueueError",
+    "JobServer",
+    "KIND_GENERATIVE",
+    "KIND_PLAN",
+    "KIND_REMIX",
+]
@@ -0,0 +1,199 @@
+"""
+Command line for the render worker and its job queue (run from src/).
+
+    python -m worker serve [--workers N]         HTTP endpoint + N warm worker processes
+    python -m worker work                        one worker in this process, no endpoint
+    python -m worker submit plan video_plans/x.json [--priority 5] [--preview]
+    python -m worker submit generative "30s explainer on solar panels"
+    python -m worker submit remix /path/source.mp4 "summarize this video"
+    python -m worker status [JOB_ID] [--status queued]
+    python -m worker cancel JOB_ID
+    python -m worker retry JOB_ID
+
+Submission and queries go straight to the SQLite queue, so they work whether or
+not a worker is running.
+"""
+# --- Standard Library Imports ---
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import sys
+import time
+from typing import List, Optional
+
+# --- Local Application Imports ---
+import config
+from worker.job_queue import JOB_KINDS, KIND_GENERATIVE, KIND_PLAN, KIND_REMIX, JobQueue, JobQueueError
+from worker.server import JobServer
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - [%(processName)s] - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+log = logging.getLogger(__name__)
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# A worker that dies this soon after starting most likely fails in warm_up (missing
+# API key, bad persona, missing dependency); restarting it at once would just spin
+FAST_EXIT_SECONDS = 60.0
+RESTART_BACKOFF_MAX = 300.0
+MAX_FAST_EXITS = 5
+
+def _persona_path(persona: str) -> str:
+    return persona if os.path.isabs(persona) else os.path.join(SRC_DIR, persona)
+
+def _print(data) -> None:
+    print(json.dumps(data, indent=2))
+
+# --- Daemon ---
+def _spawn_worker(ctx, persona_file: str, render_backend: Optional[str], cpu_slots: int, index: int):
+    from worker.daemon import run_worker_process
+    process = ctx.Process(
+        target=run_worker_process, args=(persona_file, render_backend, cpu_slots), name=f"worker-{index}"
+    )
+    process.start()
+    return process
+
+def serve(args: argparse.Namespace) -> None:
+    """Start the endpoint and keep `--workers` worker processes alive until interrupted."""
+    queue = JobQueue(config.WORKER_DB_PATH, config.WORKER_LEASE_SECONDS)
+    server = JobServer(queue, args.host, args.port, config.WORKER_MAX_ATTEMPTS).start()
+    # Fresh interpreters: no threads or sockets inherited from this process
+    ctx = multiprocessing.get_context("spawn")
+    count = max(1, args.workers)
+    cpu_slots = max(1, (os.cpu_count() or 1) // count)
+    persona_file = _persona_path(args.persona)
+    workers = [_spawn_worker(ctx, persona_file, args.render_backend, cpu_slots, i) for i in range(count)]
+    started_at = [time.monotonic()] * count
+    fast_exits = [0] * count
+    restart_at = [None] * count  # Slot is waiting out its backoff until this time
+    log.info(f"🚀 {count} worker processes ({cpu_slots} CPU slots each) draining {queue.db_path}")
+
+    stopping = False
+    def _stop(*_args):
+        nonlocal stopping
+        stopping = True
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+
+    try:
+        while not stopping:
+            time.sleep(1.0)
+            now = time.monotonic()
+            for i, process in enumerate(workers):
+                if process is None or process.is_alive() or stopping:
+                    continue
+                if restart_at[i] is None:
+                    fast_exits[i] = fast_exits[i] + 1 if now - started_at[i] < FAST_EXIT_SECONDS else 0
+                    if fast_exits[i] >= MAX_FAST_EXITS:
+                        log.error(f"❌ {process.name} exited with code {process.exitcode} "
+                                  f"{fast_exits[i]} times in a row right after starting; giving up on it")
+                        workers[i] = None
+                        continue
+                    delay = min(RESTART_BACKOFF_MAX, 2.0 ** fast_exits[i]) if fast_exits[i] else 0.0
+                    restart_at[i] = now + delay
+                    log.warning(f"⚠️ {process.name} exited with code {process.exitcode}; "
+                                f"restarting in {delay:.0f}s")
+                if now >= restart_at[i]:
+                    restart_at[i] = None
+                    started_at[i] = now
+                    workers[i] = _spawn_worker(ctx, persona_file, args.render_backend, cpu_slots, i)
+            if all(process is None for process in workers):
+                log.error("❌ Every worker process failed to start; stopping")
+                break
+    finally:
+        log.info("Stopping workers (running jobs finish first)...")
+        running = [process for process in workers if process is not None]
+        for process in running:
+            if process.is_alive():
+                process.terminate()  # SIGTERM: the worker exits after its current job
+        for process in running:
+            process.join()
+        server.stop()
+    if all(process is None for process in workers):
+        sys.exit(1)
+
+def work(args: argparse.Namespace) -> None:
+    from worker.daemon import run_worker_process
+    run_worker_process(_persona_path(args.persona), args.render_backend, 0)
+
+# --- Client Commands ---
+def submit(args: argparse.Namespace) -> None:
+    values: List[str] = args.values
+    if args.kind == KIND_PLAN:
+        payload = {"plan_path": os.path.abspath(values[0])}
+    elif args.kind == KIND_GENERATIVE:
+        payload = {"prompt": " ".join(values)}
+    elif len(values) >= 2:
+        payload = {"video_path": os.path.abspath(values[0]), "query": " ".join(values[1:])}
+    else:
+        raise JobQueueError("remix jobs need a source video path and a remix request")
+    if args.preview:
+        payload["preview"] = True
+    if args.persona:
+        payload["persona"] = _persona_path(args.persona)
+    queue = JobQueue(config.WORKER_DB_PATH, config.WORKER_LEASE_SECONDS)
+    _print(queue.get(queue.submit(args.kind, payload, args.priority, args.max_attempts)).to_dict())
+
+def status(args: argparse.Namespace) -> None:
+    queue = JobQueue(config.WORKER_DB_PATH, config.WORKER_LEASE_SECONDS)
+    if args.job_id is not None:
+        _print(queue.get(args.job_id).to_dict())
+    else:
+        _print({"counts": queue.counts(),
+                "jobs": [job.to_dict() for job in queue.list_jobs(args.status, args.limit)]})
+
+def cancel(args: argparse.Namespace) -> None:
+    _print(JobQueue(config.WORKER_DB_PATH, config.WORKER_LEASE_SECONDS).cancel(args.job_id).to_dict())
+
+def retry(args: argparse.Namespace) -> None:
+    _print(JobQueue(config.WORKER_DB_PATH, config.WORKER_LEASE_SECONDS).retry(args.job_id).to_dict())
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m worker", description="Persistent render workers and job queue.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="Run the HTTP endpoint and worker processes.")
+    serve_parser.add_argument("--workers", type=int, default=config.WORKER_PROCESSES, help="Worker processes draining the queue.")
+    serve_parser.add_argument("--host", default=config.WORKER_HOST, help="Endpoint bind address.")
+    serve_parser.add_argument("--port", type=int, default=config.WORKER_PORT, help="Endpoint port.")
+    work_parser = commands.add_parser("work", help="Run a single worker in this process.")
+    for sub in (serve_parser, work_parser):
+        sub.add_argument("-p", "--persona", default="brand_persona.json", help="Default brand persona JSON (relative to src).")
+        sub.add_argument("--render-backend", default=None, help="Render backend (default: RENDER_BACKEND from config).")
+    serve_parser.set_defaults(func=serve)
+    work_parser.set_defaults(func=work)
+
+    submit_parser = commands.add_parser("submit", help="Queue a job.")
+    submit_parser.add_argument("kind", choices=JOB_KINDS, help=f"{KIND_PLAN}: plan file, {KIND_GENERATIVE}: video idea, {KIND_REMIX}: video + request.")
+    submit_parser.add_argument("values", nargs="+", help="Plan path | prompt | source video path and remix request.")
+    submit_parser.add_argument("--priority", type=int, default=0, help="Higher runs first.")
+    submit_parser.add_argument("--max-attempts", type=int, default=config.WORKER_MAX_ATTEMPTS, help="Attempts before the job fails.")
+    submit_parser.add_argument("--preview", action="store_true", help="Render a low-resolution proxy.")
+    submit_parser.add_argument("-p", "--persona", default=None, help="Brand persona JSON for this job (default: the worker's).")
+    submit_parser.set_defaults(func=submit)
+
+    status_parser = commands.add_parser("status", help="Show one job, or recent jobs and queue counts.")
+    status_parser.add_argument("job_id", type=int, nargs="?", default=None)
+    status_parser.add_argument("--status", default=None, help="Only jobs in this state.")
+    status_parser.add_argument("--limit", type=int, default=20)
+    status_parser.set_defaults(func=status)
+
+    for name, func, help_text in (("cancel", cancel, "Cancel a queued or running job."),
+                                  ("retry", retry, "Requeue a failed or cancelled job.")):
+        sub = commands.add_parser(name, help=help_text)
+        sub.add_argument("job_id", type=int)
+        sub.set_defaults(func=func)
+    return parser
+
+if __name__ == "__main__":
+    cli_args = build_parser().parse_args()
+    try:
+        cli_args.func(cli_args)
+    except JobQueueError as e:
+        log.error(str(e)); sys.exit(1)
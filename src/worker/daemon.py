@@ -0,0 +1,259 @@
+"""
+Render Worker - a long-lived process that drains the job queue.
+
+A one-shot run pays for Python startup, the heavy imports checked by
+`check_dependencies`, API client creation and loading the ASR model before
+any work starts. A worker pays that once: it warms everything up, then claims
+jobs from the shared SQLite queue until stopped. Per-process singletons (HTTP
+connection pool, TTS rate limiter, ASR model registry, text sprite/font
+cache, resource monitor) stay warm across jobs.
+
+While a job runs, a heartbeat thread extends its lease and picks up
+cancellation requests; the job stops at its next checkpoint (between TTS,
+render and the other stages).
+"""
+# --- Standard Library Imports ---
+import asyncio
+import json
+import logging
+import os
+import shutil
+import signal
+import socket
+import threading
+import time
+from dataclasses import replace
+from typing import Any, Dict, List, Optional
+
+# --- Local Application Imports ---
+import config
+from batch import BatchRunner
+from main import check_dependencies, initialize_clients
+from audio_processing import get_asr_registry
+from models import AnalysedScene, RemixPlan, VideoPlan
+from resource_monitor import get_resource_monitor
+from services import (
+    AudioService, MediaService, PlanningService, RemixAssemblyService, VideoAnalysisService
+)
+from utils import sanitize_filename
+from video_processing.editor import VideoEditor
+from video_processing.render_plan import PROFILE_FULL, PROFILE_PREVIEW, RenderProfile
+from video_processing.text_renderer import get_text_renderer
+from worker.job_queue import KIND_GENERATIVE, KIND_PLAN, KIND_REMIX, Job, JobQueue
+
+log = logging.getLogger(__name__)
+
+class JobCancelled(Exception):
+    """Raised at a checkpoint once cancellation of the running job was requested."""
+
+class RenderWorker:
+    """Claims and runs jobs from a JobQueue with warm clients and models."""
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        persona_file: str,
+        render_backend: Optional[str] = None,
+        cpu_slots: int = 0,
+        poll_seconds: float = config.WORKER_POLL_SECONDS
+    ):
+        """
+        Args:
+            queue: Shared job queue
+            persona_file: Default brand persona (jobs may name another)
+            render_backend: Backend override (default: RENDER_BACKEND)
+            cpu_slots: Encoder slots this worker may use (0 = one per core)
+            poll_seconds: Sleep between claims while the queue is empty
+        """
+        self.queue = queue
+        self.persona_file = persona_file
+        self.render_backend = render_backend
+        self.cpu_slots = cpu_slots
+        self.poll_seconds = poll_seconds
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.stop_event = threading.Event()
+        self.stats = {"done": 0, "failed": 0, "cancelled": 0}
+        self._cancel_event = threading.Event()
+
+    # --- Warm-up ---
+    def warm_up(self) -> None:
+        """Import, create and load everything a job needs, once per process."""
+        started = time.monotonic()
+        check_dependencies()
+        self.openai_client, self.speechify_client = initialize_clients()
+        self.planner = PlanningService(self.openai_client)
+        self.persona = self.planner.load_brand_persona(self.persona_file)
+        if not self.persona:
+            raise RuntimeError(f"Could not load brand persona '{self.persona_file}'")
+        if config.ASR_PREWARM:
+            get_asr_registry().prewarm(config.ASR_BACKEND, config.ASR_MODEL, config.ASR_CPU_THREADS or None)
+        get_text_renderer(config.TEXT_SPRITE_CACHE_SIZE, config.CAPTIONS_FONT_PATH)
+        get_resource_monitor()
+        # One job at a time per worker; the runner also owns the shared HTTP pool
+        self.runner = BatchRunner(
+            self.openai_client, self.speechify_client, self.persona, self.render_backend,
+            max_jobs=1, cpu_slots=self.cpu_slots
+        )
+        for path in (config.OUTPUT_DIR, config.PLANS_DIR):
+            os.makedirs(path, exist_ok=True)
+        log.info(f"🔥 Worker {self.worker_id} warm in {time.monotonic() - started:.1f}s")
+
+    # --- Main Loop ---
+    def run_forever(self) -> None:
+        log.info(f"👷 Worker {self.worker_id} polling {self.queue.db_path}")
+        while not self.stop_event.is_set():
+            job = self.queue.claim(self.worker_id)
+            if job is None:
+                self.stop_event.wait(self.poll_seconds)
+                continue
+            self.run_job(job)
+        log.info(f"👋 Worker {self.worker_id} stopped ({self.stats['done']} done, "
+                 f"{self.stats['failed']} failed, {self.stats['cancelled']} cancelled)")
+
+    def stop(self, *_args) -> None:
+        """Finish the running job, then exit the loop (also the SIGTERM/SIGINT handler)."""
+        self.stop_event.set()
+
+    def run_job(self, job: Job) -> None:
+        log.info(f"▶️ Job {job.id} ({job.kind}, attempt {job.attempts}/{job.max_attempts})")
+        started = time.monotonic()
+        self._cancel_event.clear()
+        job_done = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job.id, job_done), daemon=True)
+        heartbeat.start()
+        workspace = os.path.join(config.TEMP_ASSETS_DIR, f"worker-{os.getpid()}", f"job-{job.id}")
+        try:
+            os.makedirs(workspace, exist_ok=True)
+            output_path = self._dispatch(job, workspace)
+            if not output_path:
+                raise RuntimeError("render produced no output")
+            if not self.queue.complete(job.id, self.worker_id, output_path):
+                log.warning(f"⚠️ Job {job.id} finished after its lease moved to another worker; result not recorded")
+                return
+            self.stats["done"] += 1
+            log.info(f"✅ Job {job.id} done in {time.monotonic() - started:.1f}s: {output_path}")
+        except JobCancelled:
+            self.queue.mark_cancelled(job.id, self.worker_id)
+            self.stats["cancelled"] += 1
+            log.info(f"🛑 Job {job.id} cancelled")
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            updated = self.queue.fail(job.id, self.worker_id, error)
+            self.stats["failed"] += 1
+            log.error(f"❌ Job {job.id} failed ({updated.status}): {error}")
+        finally:
+            job_done.set()
+            heartbeat.join()
+            shutil.rmtree(workspace, ignore_errors=True)
+
+    def _heartbeat(self, job_id: int, job_done: threading.Event) -> None:
+        interval = max(1.0, self.queue.lease_seconds / 4)
+        while not job_done.wait(interval):
+            try:
+                if self.queue.heartbeat(job_id, self.worker_id):
+                    self._cancel_event.set()
+            except Exception as e:
+                log.warning(f"⚠️ Heartbeat for job {job_id} failed: {e}")
+
+    def _checkpoint(self) -> None:
+        if self._cancel_event.is_set():
+            raise JobCancelled()
+
+    # --- Job Kinds ---
+    def _dispatch(self, job: Job, workspace: str) -> Optional[str]:
+        payload = job.payload
+        persona = self._persona(payload)
+        profile = self._profile(payload)
+        if job.kind == KIND_PLAN:
+            with open(payload["plan_path"], "r") as f:
+                data = json.load(f)
+            if "video_title" in data and "sections" in data:
+                return self._render_generative(VideoPlan.parse_obj(data), persona, profile, workspace)
+            if "remix_video_title" in data and "source_video_path" in data:
+                return self._render_remix(RemixPlan.parse_obj(data), None, workspace)
+            raise ValueError(f"Could not determine plan type of '{payload['plan_path']}'")
+        if job.kind == KIND_GENERATIVE:
+            return self._run_generative(payload["prompt"], persona, profile, workspace)
+        if job.kind == KIND_REMIX:
+            return self._run_remix(payload["video_path"], payload["query"], workspace)
+        raise ValueError(f"Unknown job kind '{job.kind}'")
+
+    def _persona(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        if not payload.get("persona"):
+            return self.persona
+        persona = self.planner.load_brand_persona(payload["persona"])
+        if not persona:
+            raise ValueError(f"Could not load brand persona '{payload['persona']}'")
+        return persona
+
+    @staticmethod
+    def _profile(payload: Dict[str, Any]) -> RenderProfile:
+        if payload.get("preview"):
+            return replace(PROFILE_PREVIEW, contact_sheet=config.PREVIEW_CONTACT_SHEET)
+        return PROFILE_FULL
+
+    def _run_generative(self, prompt: str, persona: Dict[str, Any], profile: RenderProfile,
+                        workspace: str) -> Optional[str]:
+        self._checkpoint()
+        plan = self.planner.create_generative_plan(prompt, persona)
+        if not plan:
+            raise RuntimeError("planning failed")
+        plan_path = os.path.join(config.PLANS_DIR, f"{sanitize_filename(plan.video_title)}.json")
+        with open(plan_path, "w") as f:
+            f.write(plan.json(indent=2))
+        log.info(f"Plan saved to '{plan_path}'")
+        return self._render_generative(plan, persona, profile, workspace)
+
+    def _render_generative(self, plan: VideoPlan, persona: Dict[str, Any], profile: RenderProfile,
+                           workspace: str) -> Optional[str]:
+        return self.runner.render_plan(plan, workspace, self._checkpoint, profile, persona)
+
+    def _run_remix(self, video_path: str, query: str, workspace: str) -> Optional[str]:
+        if not os.path.exists(video_path):
+            raise FileNotFoundError(video_path)
+        self._checkpoint()
+        analysis_service = VideoAnalysisService(video_path, self.openai_client, workspace)
+        try:
+            analysis_service.get_video_properties()
+            scenes = analysis_service.detect_scenes()
+            self._checkpoint()
+            scenes = asyncio.run(analysis_service.tag_scenes_with_vision(scenes))
+        finally:
+            analysis_service.close()
+        self._checkpoint()
+        plan = asyncio.run(self.planner.create_remix_plan(query, scenes, video_path))
+        if not plan:
+            raise RuntimeError("remix planning failed")
+        plan_path = os.path.join(config.PLANS_DIR, f"{sanitize_filename(plan.remix_video_title)}.json")
+        with open(plan_path, "w") as f:
+            f.write(plan.json(indent=2))
+        return self._render_remix(plan, scenes, workspace)
+
+    def _render_remix(self, plan: RemixPlan, scenes: Optional[List[AnalysedScene]], workspace: str) -> Optional[str]:
+        if scenes is None:
+            analysis_service = VideoAnalysisService(plan.source_video_path, self.openai_client, workspace)
+            try:
+                scenes = analysis_service.detect_scenes()
+            finally:
+                analysis_service.close()
+        self._checkpoint()
+        audio_service = AudioService(self.openai_client, self.speechify_client, workspace_dir=workspace)
+        media_service = MediaService(workspace_dir=workspace)
+        remix_service = RemixAssemblyService(
+            media_service, audio_service, VideoEditor(emergency_fallback=False), workspace
+        )
+        try:
+            return asyncio.run(remix_service.assemble_and_render_remix(plan, scenes))
+        finally:
+            if media_service.mezzanine:
+                media_service.mezzanine.shutdown(wait=False)
+
+def run_worker_process(persona_file: str, render_backend: Optional[str], cpu_slots: int) -> None:
+    """Entry point of one worker process (also used by `python -m worker work`)."""
+    worker = RenderWorker(
+        JobQueue(config.WORKER_DB_PATH, config.WORKER_LEASE_SECONDS), persona_file, render_backend, cpu_slots
+    )
+    signal.signal(signal.SIGTERM, worker.stop)
+    signal.signal(signal.SIGINT, worker.stop)
+    worker.warm_up()
+    worker.run_forever()
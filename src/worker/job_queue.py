@@ -0,0 +1,307 @@
+"""
+Durable local job queue on SQLite.
+
+Any number of worker processes (and the HTTP endpoint / CLI) open the same
+database file. Claims happen inside `BEGIN IMMEDIATE` transactions, so one
+job is handed to exactly one worker. Running jobs carry a heartbeat; a job
+whose worker stopped heartbeating for longer than the lease is put back in
+the queue (counting as a failed attempt). Failed jobs are retried with
+exponential backoff up to `max_attempts`.
+
+Job states:
+
+    queued -> running -> done
+                      -> failed     (attempts exhausted)
+                      -> queued     (retry after backoff)
+    queued / running  -> cancelled  (running jobs stop at their next checkpoint)
+"""
+import json
+import logging
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+log = logging.getLogger(__name__)
+
+# --- Job Kinds and States ---
+KIND_PLAN = "plan"              # payload: {"plan_path": ...}
+KIND_GENERATIVE = "generative"  # payload: {"prompt": ...}
+KIND_REMIX = "remix"            # payload: {"video_path": ..., "query": ...}
+JOB_KINDS = (KIND_PLAN, KIND_GENERATIVE, KIND_REMIX)
+# Non-empty string fields each kind's payload must carry
+REQUIRED_PAYLOAD_KEYS = {
+    KIND_PLAN: ("plan_path",),
+    KIND_GENERATIVE: ("prompt",),
+    KIND_REMIX: ("video_path", "query"),
+}
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+STATUS_CANCELLED = "cancelled"
+FINAL_STATES = (STATUS_DONE, STATUS_FAILED, STATUS_CANCELLED)
+
+RETRY_BACKOFF_BASE = 30.0   # Seconds before the first retry; doubles per attempt
+RETRY_BACKOFF_MAX = 900.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    not_before REAL NOT NULL DEFAULT 0,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    heartbeat REAL,
+    output_path TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, priority DESC, id);
+"""
+
+class JobQueueError(Exception):
+    """Invalid job submission or state transition."""
+
+@dataclass
+class Job:
+    id: int
+    kind: str
+    payload: Dict[str, Any]
+    priority: int
+    status: str
+    attempts: int
+    max_attempts: int
+    not_before: float
+    cancel_requested: bool
+    worker: Optional[str]
+    heartbeat: Optional[float]
+    output_path: Optional[str]
+    error: Optional[str]
+    created_at: float
+    started_at: Optional[float]
+    finished_at: Optional[float]
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> "Job":
+        data = dict(row)
+        data["payload"] = json.loads(data["payload"])
+        data["cancel_requested"] = bool(data["cancel_requested"])
+        return cls(**data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.__dict__)
+
+class JobQueue:
+    """Priority job queue shared by every process that opens `db_path`."""
+
+    def __init__(self, db_path: str, lease_seconds: float = 120.0):
+        """
+        Args:
+            db_path: SQLite database file (created on first use)
+            lease_seconds: Heartbeat age after which a running job is presumed orphaned
+        """
+        self.db_path = db_path
+        self.lease_seconds = lease_seconds
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # One short-lived connection per operation: safe across threads and processes
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    # --- Producers ---
+    def submit(self, kind: str, payload: Dict[str, Any], priority: int = 0, max_attempts: int = 3) -> int:
+        """Queue a job. Higher `priority` runs first. Returns the job id."""
+        if kind not in JOB_KINDS:
+            raise JobQueueError(f"Unknown job kind '{kind}' (expected one of {', '.join(JOB_KINDS)})")
+        # Reject malformed jobs here, not after max_attempts failed runs on a worker
+        if not isinstance(payload, dict):
+            raise JobQueueError(f"Job payload must be an object, got {type(payload).__name__}")
+        missing = [key for key in REQUIRED_PAYLOAD_KEYS[kind]
+                   if not isinstance(payload.get(key), str) or not payload[key].strip()]
+        if missing:
+            raise JobQueueError(f"'{kind}' jobs need {', '.join(missing)} in their payload")
+        try:
+            priority, max_attempts = int(priority), max(1, int(max_attempts))
+        except (TypeError, ValueError):
+            raise JobQueueError("priority and max_attempts must be integers")
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "INSERT INTO jobs (kind, payload, priority, max_attempts, created_at) VALUES (?, ?, ?, ?, ?)",
+                (kind, json.dumps(payload), priority, max_attempts, time.time())
+            )
+            job_id = cursor.lastrowid
+        log.info(f"📥 Queued job {job_id} ({kind}, priority {priority})")
+        return job_id
+
+    def cancel(self, job_id: int) -> Optional[Job]:
+        """Cancel a queued job now, or flag a running one. Returns the updated job."""
+        with self._transaction() as conn:
+            job = self._get(conn, job_id)
+            if job.status == STATUS_QUEUED:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, cancel_requested = 1, finished_at = ? WHERE id = ?",
+                    (STATUS_CANCELLED, time.time(), job_id)
+                )
+            elif job.status == STATUS_RUNNING:
+                conn.execute("UPDATE jobs SET cancel_requested = 1 WHERE id = ?", (job_id,))
+            return self._get(conn, job_id)
+
+    def retry(self, job_id: int) -> Job:
+        """Put a failed or cancelled job back in the queue with a fresh attempt budget."""
+        with self._transaction() as conn:
+            job = self._get(conn, job_id)
+            if job.status not in (STATUS_FAILED, STATUS_CANCELLED):
+                raise JobQueueError(f"Job {job_id} is {job.status}; only failed or cancelled jobs can be retried")
+            conn.execute(
+                "UPDATE jobs SET status = ?, attempts = 0, not_before = 0, cancel_requested = 0, "
+                "worker = NULL, error = NULL, finished_at = NULL WHERE id = ?",
+                (STATUS_QUEUED, job_id)
+            )
+            return self._get(conn, job_id)
+
+    # --- Queries ---
+    @staticmethod
+    def _get(conn: sqlite3.Connection, job_id: int) -> Job:
+        row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            raise JobQueueError(f"No job with id {job_id}")
+        return Job.from_row(row)
+
+    def get(self, job_id: int) -> Job:
+        with self._connect() as conn:
+            return self._get(conn, job_id)
+
+    def list_jobs(self, status: Optional[str] = None, limit: int = 50) -> List[Job]:
+        """Most recent jobs first, optionally filtered by status."""
+        with self._connect() as conn:
+            if status:
+                rows = conn.execute("SELECT * FROM jobs WHERE status = ? ORDER BY id DESC LIMIT ?", (status, limit))
+            else:
+                rows = conn.execute("SELECT * FROM jobs ORDER BY id DESC LIMIT ?", (limit,))
+            return [Job.from_row(row) for row in rows.fetchall()]
+
+    def counts(self) -> Dict[str, int]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    # --- Workers ---
+    def claim(self, worker_id: str) -> Optional[Job]:
+        """Atomically take the highest-priority ready job, requeueing orphaned ones first."""
+        now = time.time()
+        with self._transaction() as conn:
+            self._requeue_orphans(conn, now)
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE status = ? AND not_before <= ? "
+                "ORDER BY priority DESC, id LIMIT 1",
+                (STATUS_QUEUED, now)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = ?, worker = ?, attempts = attempts + 1, heartbeat = ?, "
+                "started_at = ?, error = NULL WHERE id = ?",
+                (STATUS_RUNNING, worker_id, now, now, row["id"])
+            )
+            return self._get(conn, row["id"])
+
+    def _requeue_orphans(self, conn: sqlite3.Connection, now: float) -> None:
+        orphans = conn.execute(
+            "SELECT * FROM jobs WHERE status = ? AND heartbeat < ?",
+            (STATUS_RUNNING, now - self.lease_seconds)
+        ).fetchall()
+        for row in orphans:
+            job = Job.from_row(row)
+            log.warning(f"⚠️ Job {job.id} lost its worker ({job.worker}); lease expired")
+            self._settle_failure(conn, job, f"worker {job.worker} stopped heartbeating", now)
+
+    def heartbeat(self, job_id: int, worker_id: str) -> bool:
+        """Extend the lease of a running job. Returns True if cancellation was requested."""
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET heartbeat = ? WHERE id = ? AND worker = ? AND status = ?",
+                (time.time(), job_id, worker_id, STATUS_RUNNING)
+            )
+            row = conn.execute("SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return bool(row and row["cancel_requested"])
+
+    # Terminal updates only apply while `worker_id` still holds the job: a worker
+    # whose lease expired must not overwrite a job another worker has reclaimed.
+    def complete(self, job_id: int, worker_id: str, output_path: Optional[str]) -> bool:
+        """Mark the job done. Returns False if `worker_id` no longer holds it."""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, output_path = ?, finished_at = ? "
+                "WHERE id = ? AND worker = ? AND status = ?",
+                (STATUS_DONE, output_path, time.time(), job_id, worker_id, STATUS_RUNNING)
+            )
+            return cursor.rowcount == 1
+
+    def mark_cancelled(self, job_id: int, worker_id: str) -> bool:
+        """Mark a running job cancelled. Returns False if `worker_id` no longer holds it."""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ? WHERE id = ? AND worker = ? AND status = ?",
+                (STATUS_CANCELLED, time.time(), job_id, worker_id, STATUS_RUNNING)
+            )
+            return cursor.rowcount == 1
+
+    def fail(self, job_id: int, worker_id: str, error: str) -> Job:
+        """Record a failed attempt: requeue with backoff, or fail for good."""
+        with self._transaction() as conn:
+            job = self._get(conn, job_id)
+            if job.status != STATUS_RUNNING or job.worker != worker_id:
+                return job
+            self._settle_failure(conn, job, error, time.time())
+            return self._get(conn, job_id)
+
+    @staticmethod
+    def _settle_failure(conn: sqlite3.Connection, job: Job, error: str, now: float) -> None:
+        if job.cancel_requested:
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE id = ?",
+                (STATUS_CANCELLED, error, now, job.id)
+            )
+        elif job.attempts < job.max_attempts:
+            delay = min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * 2 ** (job.attempts - 1))
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, not_before = ?, worker = NULL WHERE id = ?",
+                (STATUS_QUEUED, error, now + delay, job.id)
+            )
+            log.info(f"🔁 Job {job.id} will retry in {delay:.0f}s (attempt {job.attempts}/{job.max_attempts})")
+        else:
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE id = ?",
+                (STATUS_FAILED, error, now, job.id)
+            )
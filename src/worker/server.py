@@ -0,0 +1,123 @@
+"""
+Local HTTP endpoint of the job queue (JSON in, JSON out).
+
+    GET  /health               queue counts per status
+    GET  /jobs[?status=queued] recent jobs
+    GET  /jobs/<id>            one job
+    POST /jobs                 {"kind", "payload", "priority"?, "max_attempts"?} -> job
+    POST /jobs/<id>/cancel     cancel (queued) or flag (running) -> job
+    POST /jobs/<id>/retry      requeue a failed/cancelled job -> job
+
+Only the standard library is used, and it binds to localhost by default: the
+endpoint is a submission channel for the local machine, not a public API.
+"""
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from worker.job_queue import JobQueue, JobQueueError
+
+log = logging.getLogger(__name__)
+
+MAX_BODY_BYTES = 1024 * 1024
+
+def _make_handler(queue: JobQueue, default_max_attempts: int):
+    class JobRequestHandler(BaseHTTPRequestHandler):
+        def log_message(self, fmt: str, *args: Any) -> None:
+            log.debug(f"{self.address_string()} {fmt % args}")
+
+        def _send(self, status: int, body: Any) -> None:
+            data = json.dumps(body, indent=2).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _read_json(self) -> Dict[str, Any]:
+            length = int(self.headers.get("Content-Length") or 0)
+            if length > MAX_BODY_BYTES:
+                raise JobQueueError("Request body too large")
+            body = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(body, dict):
+                raise JobQueueError("Request body must be a JSON object")
+            return body
+
+        def _route(self) -> Tuple[str, Optional[int], Optional[str]]:
+            """(collection, job id, action) of the request path."""
+            parts = [p for p in urlparse(self.path).path.split("/") if p]
+            collection = parts[0] if parts else ""
+            job_id = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else None
+            action = parts[2] if len(parts) > 2 else None
+            return collection, job_id, action
+
+        def do_GET(self) -> None:
+            try:
+                collection, job_id, _ = self._route()
+                if collection == "health":
+                    self._send(200, {"status": "ok", "jobs": queue.counts()})
+                elif collection == "jobs" and job_id is not None:
+                    self._send(200, queue.get(job_id).to_dict())
+                elif collection == "jobs":
+                    query = parse_qs(urlparse(self.path).query)
+                    status = query.get("status", [None])[0]
+                    limit = int(query.get("limit", ["50"])[0])
+                    self._send(200, [job.to_dict() for job in queue.list_jobs(status, limit)])
+                else:
+                    self._send(404, {"error": "not found"})
+            except JobQueueError as e:
+                self._send(404, {"error": str(e)})
+            except (TypeError, ValueError) as e:
+                self._send(400, {"error": str(e)})
+
+        def do_POST(self) -> None:
+            try:
+                collection, job_id, action = self._route()
+                if collection != "jobs":
+                    self._send(404, {"error": "not found"})
+                elif job_id is None:
+                    body = self._read_json()
+                    new_id = queue.submit(
+                        body.get("kind", ""), body.get("payload") or {},
+                        int(body.get("priority", 0)), int(body.get("max_attempts", default_max_attempts))
+                    )
+                    self._send(201, queue.get(new_id).to_dict())
+                elif action == "cancel":
+                    self._send(200, queue.cancel(job_id).to_dict())
+                elif action == "retry":
+                    self._send(200, queue.retry(job_id).to_dict())
+                else:
+                    self._send(404, {"error": "not found"})
+            except JobQueueError as e:
+                self._send(400, {"error": str(e)})
+            except (TypeError, ValueError) as e:
+                self._send(400, {"error": f"invalid request: {e}"})
+
+    return JobRequestHandler
+
+class JobServer:
+    """Threaded HTTP server for the queue, run on a background thread."""
+
+    def __init__(self, queue: JobQueue, host: str, port: int, default_max_attempts: int = 3):
+        self.httpd = ThreadingHTTPServer((host, port), _make_handler(queue, default_max_attempts))
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "JobServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="job-server", daemon=True)
+        self._thread.start()
+        log.info(f"🌐 Job endpoint listening on {self.address}")
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
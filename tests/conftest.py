@@ -0,0 +1,45 @@
+"""
+Shared pytest setup: the application runs from src/ with absolute imports
+(`import config`, `from services import ...`), so tests import it the same way.
+"""
+import importlib.util
+import os
+import sys
+import threading
+
+import pytest
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+def load_module(relative_path: str, name: str):
+    """
+    Import one module by path, skipping its package __init__.
+
+    Package initializers pull in the whole rendering stack (moviepy, openai,
+    ...); the concurrency primitives under test only need the standard library.
+    """
+    spec = importlib.util.spec_from_file_location(name, os.path.join(SRC_DIR, relative_path))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def run_with_timeout(fn, timeout: float = 5.0):
+    """Run `fn()` on a daemon thread; fail the test instead of hanging if it blocks."""
+    outcome = {}
+
+    def target():
+        try:
+            outcome["result"] = fn()
+        except BaseException as e:  # re-raised on the test thread
+            outcome["error"] = e
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        pytest.fail(f"call did not finish within {timeout}s (deadlock?)")
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome.get("result")
@@ -0,0 +1,36 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from conftest import load_module
+
+alignment = load_module("audio_processing/alignment.py", "alignment_under_test")
+
+MIN_CONFIDENCE = 0.6  # config.ALIGNMENT_MIN_CONFIDENCE default
+
+def test_short_dips_without_punctuation_are_not_trusted():
+    words = "solar panels keep working on cloudy days".split()
+    islands = [(0.0, 0.8), (0.95, 1.75), (1.9, 2.7)]  # 0.15s gaps: below LONG_PAUSE_SECONDS
+    result = alignment.align_words_to_islands(words, islands)
+    assert len(result.word_timings) == len(words)
+    assert result.confidence < MIN_CONFIDENCE
+    assert result.reason == "no pauses to verify against"
+
+def test_single_island_without_punctuation_is_not_trusted():
+    words = "solar panels keep working on cloudy days".split()
+    result = alignment.align_words_to_islands(words, [(0.0, 2.4)])
+    assert result.confidence < MIN_CONFIDENCE
+
+def test_punctuation_matched_to_a_long_pause_is_trusted():
+    words = "Solar panels work, even on cloudy days.".split()
+    islands = [(0.0, 1.0), (1.4, 2.4)]
+    result = alignment.align_words_to_islands(words, islands)
+    assert result.confidence >= MIN_CONFIDENCE
+    # The comma's word ends where the pause starts, the next word starts after it
+    assert result.word_timings[2]["end"] == pytest.approx(1.0)
+    assert result.word_timings[3]["start"] == pytest.approx(1.4)
+
+def test_implausible_speaking_rate_scores_zero():
+    result = alignment.align_words_to_islands(["Hello,", "world."], [(0.0, 10.0)])
+    assert result.confidence == 0.0
+    assert "speaking rate" in result.reason
@@ -0,0 +1,127 @@
+import threading
+import time
+
+import pytest
+
+from worker.job_queue import (
+    KIND_GENERATIVE, KIND_PLAN, KIND_REMIX, STATUS_CANCELLED, STATUS_DONE, STATUS_FAILED, STATUS_QUEUED,
+    STATUS_RUNNING, JobQueue, JobQueueError
+)
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(str(tmp_path / "jobs.sqlite3"), lease_seconds=60)
+
+def skip_backoff(queue, job_id):
+    """Make a job waiting out its retry backoff claimable now."""
+    with queue._transaction() as conn:
+        conn.execute("UPDATE jobs SET not_before = 0 WHERE id = ?", (job_id,))
+
+def test_claim_orders_by_priority_then_submission(queue):
+    low = queue.submit(KIND_PLAN, {"plan_path": "a.json"}, priority=0)
+    high = queue.submit(KIND_PLAN, {"plan_path": "b.json"}, priority=5)
+    low_second = queue.submit(KIND_PLAN, {"plan_path": "c.json"}, priority=0)
+
+    claimed = [queue.claim("w1").id for _ in range(3)]
+
+    assert claimed == [high, low, low_second]
+    assert queue.claim("w1") is None
+    job = queue.get(high)
+    assert job.status == STATUS_RUNNING and job.worker == "w1" and job.attempts == 1
+
+def test_concurrent_claims_hand_each_job_out_once(queue):
+    ids = {queue.submit(KIND_PLAN, {"plan_path": f"{i}.json"}) for i in range(20)}
+    claimed, lock = [], threading.Lock()
+
+    def drain(worker_id):
+        while (job := queue.claim(worker_id)) is not None:
+            with lock:
+                claimed.append(job.id)
+
+    threads = [threading.Thread(target=drain, args=(f"w{i}",)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(claimed) == sorted(ids)
+
+def test_failure_retries_with_backoff_until_attempts_run_out(queue):
+    job_id = queue.submit(KIND_GENERATIVE, {"prompt": "idea"}, max_attempts=2)
+
+    queue.claim("w1")
+    retried = queue.fail(job_id, "w1", "boom")
+    assert retried.status == STATUS_QUEUED
+    assert retried.not_before > time.time()
+    assert queue.claim("w1") is None  # still backing off
+
+    skip_backoff(queue, job_id)
+    assert queue.claim("w2").attempts == 2
+    failed = queue.fail(job_id, "w2", "boom again")
+    assert failed.status == STATUS_FAILED and failed.error == "boom again"
+
+    requeued = queue.retry(job_id)
+    assert requeued.status == STATUS_QUEUED and requeued.attempts == 0
+
+def test_expired_lease_requeues_and_blocks_the_stale_worker(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"), lease_seconds=0.2)
+    job_id = queue.submit(KIND_PLAN, {"plan_path": "a.json"}, max_attempts=3)
+    queue.claim("stale")
+    time.sleep(0.3)
+
+    assert queue.claim("other") is None  # orphan requeued, but behind its retry backoff
+    orphaned = queue.get(job_id)
+    assert orphaned.status == STATUS_QUEUED and "stale" in orphaned.error
+
+    skip_backoff(queue, job_id)
+    assert queue.claim("other").id == job_id
+
+    # The original worker finishing late must not touch the reclaimed job
+    assert queue.complete(job_id, "stale", "late.mp4") is False
+    assert queue.mark_cancelled(job_id, "stale") is False
+    assert queue.fail(job_id, "stale", "late failure").status == STATUS_RUNNING
+    assert queue.complete(job_id, "other", "out.mp4") is True
+    assert queue.get(job_id).status == STATUS_DONE
+
+def test_heartbeat_extends_lease_and_reports_cancellation(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"), lease_seconds=0.3)
+    job_id = queue.submit(KIND_PLAN, {"plan_path": "a.json"})
+    queue.claim("w1")
+    for _ in range(3):
+        time.sleep(0.15)
+        assert queue.heartbeat(job_id, "w1") is False
+    assert queue.claim("w2") is None
+    assert queue.get(job_id).status == STATUS_RUNNING
+
+    queue.cancel(job_id)
+    assert queue.heartbeat(job_id, "w1") is True
+    assert queue.mark_cancelled(job_id, "w1") is True
+    assert queue.get(job_id).status == STATUS_CANCELLED
+
+def test_cancel_queued_job_and_reject_bad_input(queue):
+    job_id = queue.submit(KIND_PLAN, {"plan_path": "a.json"})
+    assert queue.cancel(job_id).status == STATUS_CANCELLED
+    assert queue.claim("w1") is None
+
+    with pytest.raises(JobQueueError):
+        queue.submit("unknown", {})
+    with pytest.raises(JobQueueError):
+        queue.get(999)
+    with pytest.raises(JobQueueError):
+        queue.retry(queue.submit(KIND_PLAN, {"plan_path": "b.json"}))
+
+@pytest.mark.parametrize("kind, payload", [
+    (KIND_PLAN, {}),
+    (KIND_PLAN, ["a.json"]),
+    (KIND_GENERATIVE, {"prompt": "  "}),
+    (KIND_REMIX, {"video_path": "/tmp/source.mp4"}),
+    (KIND_REMIX, {"video_path": 3, "query": "summarize"}),
+])
+def test_submit_rejects_payloads_missing_required_fields(queue, kind, payload):
+    with pytest.raises(JobQueueError):
+        queue.submit(kind, payload)
+    assert queue.counts().get(STATUS_QUEUED, 0) == 0
+
+def test_submit_rejects_non_integer_priority(queue):
+    with pytest.raises(JobQueueError):
+        queue.submit(KIND_PLAN, {"plan_path": "a.json"}, priority=None)
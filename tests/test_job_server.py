@@ -0,0 +1,41 @@
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+from worker.job_queue import JobQueue
+from worker.server import JobServer
+
+@pytest.fixture
+def server(tmp_path):
+    server = JobServer(JobQueue(str(tmp_path / "jobs.sqlite3"), lease_seconds=60), "127.0.0.1", 0).start()
+    yield server
+    server.stop()
+
+def post(server, path, body):
+    request = urllib.request.Request(
+        f"{server.address}{path}", data=json.dumps(body).encode("utf-8"),
+        headers={"Content-Type": "application/json"}, method="POST"
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status, json.load(response)
+    except urllib.error.HTTPError as e:
+        return e.code, json.load(e)
+
+def test_submit_returns_the_queued_job(server):
+    status, job = post(server, "/jobs", {"kind": "generative", "payload": {"prompt": "solar panels"}})
+    assert status == 201
+    assert job["status"] == "queued"
+
+@pytest.mark.parametrize("body", [
+    {"kind": "plan", "payload": {"plan_path": "a.json"}, "priority": None},
+    {"kind": "plan", "payload": {"plan_path": "a.json"}, "max_attempts": [3]},
+    {"kind": "plan", "payload": {}},
+    {"kind": "remix", "payload": "source.mp4"},
+])
+def test_bad_submissions_get_a_400_response(server, body):
+    status, reply = post(server, "/jobs", body)
+    assert status == 400
+    assert "error" in reply
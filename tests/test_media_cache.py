@@ -0,0 +1,37 @@
+import os
+import time
+
+from cache.disk_cache import STALE_TEMP_SECONDS, DiskCache
+from cache.media_cache import SearchCache
+
+def _age(path: str, seconds: float) -> None:
+    old = time.time() - seconds
+    os.utime(path, (old, old))
+
+def test_expired_search_entry_counts_as_a_miss(tmp_path):
+    cache = SearchCache(str(tmp_path), ttl_seconds=60)
+    key = cache.key("pexels", "search", {"query": "ocean"})
+    cache.put(key, {"videos": []})
+    assert cache.get(key) == {"videos": []}
+
+    meta_path = cache.cache.path_for(key, ".json") + ".meta.json"
+    with open(meta_path, "w") as f:
+        f.write('{"stored_at": 0}')
+    assert cache.get(key) is None
+    assert cache.cache.stats["hits"] == 1
+    assert cache.cache.stats["misses"] == 1
+
+def test_eviction_sweeps_stale_temp_files_only(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=1024 * 1024)
+    stale_part = tmp_path / "abc.download.mp4.part"
+    fresh_part = tmp_path / "def.download.mp4.part"
+    for path in (stale_part, fresh_part):
+        path.write_bytes(b"partial")
+    _age(str(stale_part), STALE_TEMP_SECONDS + 60)
+
+    entry = cache.put_bytes("ab" * 32, b"data", ".json")
+    assert not stale_part.exists()
+    assert fresh_part.exists()
+    assert os.path.isfile(entry)
+    assert cache.stats["temp_swept"] == 1
+    assert cache.stats["evictions"] == 0
@@ -0,0 +1,59 @@
+import threading
+import time
+
+from conftest import run_with_timeout
+from resource_scheduler import ResourceScheduler
+
+def test_reservation_is_returned_after_the_block():
+    scheduler = ResourceScheduler(cpu_slots=4, ram_gb=8)
+    with scheduler.reserve(3, 6.0):
+        assert scheduler._cpu_free == 1
+        assert scheduler._ram_free == 2.0
+    assert scheduler._cpu_free == 4
+    assert scheduler._ram_free == 8.0
+
+def test_reservation_is_returned_when_the_block_raises():
+    scheduler = ResourceScheduler(cpu_slots=2, ram_gb=4)
+    try:
+        with scheduler.reserve(2, 4.0):
+            raise RuntimeError("render failed")
+    except RuntimeError:
+        pass
+    assert scheduler._cpu_free == 2
+    assert scheduler._ram_free == 4.0
+
+def test_oversized_request_is_clamped_instead_of_waiting_forever():
+    scheduler = ResourceScheduler(cpu_slots=2, ram_gb=4)
+    reservation = scheduler.reserve(16, 64.0)
+    run_with_timeout(reservation.__enter__)
+    assert scheduler._cpu_free == 0
+    assert scheduler._ram_free == 0.0
+    reservation.__exit__(None, None, None)
+    assert scheduler._cpu_free == 2
+
+def test_waiters_are_admitted_when_capacity_frees_and_caps_hold():
+    scheduler = ResourceScheduler(cpu_slots=4, ram_gb=100)
+    in_use = {"now": 0, "max": 0}
+    lock = threading.Lock()
+
+    def job():
+        with scheduler.reserve(2, 1.0):
+            with lock:
+                in_use["now"] += 2
+                in_use["max"] = max(in_use["max"], in_use["now"])
+            time.sleep(0.05)
+            with lock:
+                in_use["now"] -= 2
+
+    def run_all():
+        threads = [threading.Thread(target=job) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    run_with_timeout(run_all)
+    assert in_use["max"] == 4
+    assert scheduler.stats["reservations"] == 5
+    assert scheduler.stats["waits"] >= 1
+    assert scheduler._cpu_free == 4
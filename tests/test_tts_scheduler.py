@@ -0,0 +1,64 @@
+import asyncio
+import time
+
+import pytest
+
+from conftest import load_module, run_with_timeout
+
+tts_scheduler = load_module("services/tts_scheduler.py", "tts_scheduler_under_test")
+
+def make_scheduler():
+    return tts_scheduler.TTSScheduler(
+        limits={"openai": tts_scheduler.ProviderLimits(requests_per_second=50, max_concurrency=2)},
+        default_limits=tts_scheduler.ProviderLimits(requests_per_second=50, max_concurrency=1),
+        backoff_base=0.01,
+        backoff_max=0.05,
+    )
+
+def test_successful_call_returns_result_and_releases_slot():
+    scheduler = make_scheduler()
+
+    result = run_with_timeout(lambda: asyncio.run(scheduler.call("openai", lambda x: x * 2, 21)))
+
+    assert result == 42
+    metrics = scheduler.metrics("openai")
+    assert metrics["requests"] == 1
+    assert metrics["in_flight"] == 0
+    assert metrics["rate_limited"] == 0
+
+def test_rate_limited_call_pauses_provider_then_success_resets():
+    scheduler = make_scheduler()
+
+    def limited():
+        raise tts_scheduler.TTSRateLimitError("429", retry_after=0.05)
+
+    with pytest.raises(tts_scheduler.TTSRateLimitError):
+        run_with_timeout(lambda: asyncio.run(scheduler.call("openai", limited)))
+
+    state = scheduler._state("openai")
+    assert scheduler.metrics("openai")["rate_limited"] == 1
+    assert state.consecutive_rate_limits == 1
+    assert state.paused_until > time.monotonic()
+    assert state.in_flight == 0
+
+    # The next call waits out the pause, succeeds and clears the streak
+    started = time.monotonic()
+    assert run_with_timeout(lambda: asyncio.run(scheduler.call("openai", lambda: "ok"))) == "ok"
+    assert time.monotonic() - started >= 0.04
+    assert state.consecutive_rate_limits == 0
+
+def test_concurrency_cap_is_respected():
+    scheduler = make_scheduler()
+    peak = {"now": 0, "max": 0}
+
+    def slow():
+        peak["now"] += 1
+        peak["max"] = max(peak["max"], peak["now"])
+        time.sleep(0.05)
+        peak["now"] -= 1
+
+    async def many():
+        await asyncio.gather(*(scheduler.call("speechify", slow) for _ in range(3)))
+
+    run_with_timeout(lambda: asyncio.run(many()))
+    assert peak["max"] == 1  # default limits: one in flight
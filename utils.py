@@ -4,16 +4,18 @@ import os
 import shutil
 import re
 import random
-import requests
 from PIL import Image as PILImage, ImageFont, ImageDraw
 import numpy as np
 from moviepy.editor import (
     ImageClip, VideoFileClip, AudioFileClip, 
-    TextClip, CompositeVideoClip, vfx, afx
+    CompositeVideoClip, vfx, afx
 )
 from moviepy.video.fx.all import crop, resize
 import traceback
 
+from src.http_client import HttpClientError, get_http_client
+from src.video_processing.text_renderer import TextStyle, get_text_renderer
+
 # --- Logging Helper Functions ---
 def print_status(message: str):
     """Prints an informational message."""
@@ -65,8 +67,7 @@ def fetch_from_pexels(
     
     print_status(f"Pexels: '{query}' (sec: {section_num_str}, type: {media_type})...")
     try:
-        r = requests.get(search_url, headers=headers, params=params, timeout=25); r.raise_for_status()
-        data = r.json(); items = data.get(media_type if media_type == "videos" else "photos", [])
+        data = get_http_client().get_json_sync(search_url, params=params, headers=headers, timeout=25); items = data.get(media_type if media_type == "videos" else "photos", [])
         if not items and media_type == "videos":
             print_status(f"Pexels: No videos for '{query}'. Trying images."); 
             return fetch_from_pexels(query, section_num_str, pexels_api_key, temp_assets_dir, "photos", per_page, orientation)
@@ -86,10 +87,8 @@ def fetch_from_pexels(
             else: print_warning(f"Pexels: No image URL for photo ID {item_id}."); return None
         if not dl_url: print_warning(f"No download URL for Pexels item ID {item_id}."); return None
 
-        mr = requests.get(dl_url, stream=True, timeout=70); mr.raise_for_status()
         fpath = os.path.join(temp_assets_dir, f"pexels_{sanitize_filename(query)}_{section_num_str}_{item_id}{ext}")
-        with open(fpath, "wb") as f: 
-            for chunk in mr.iter_content(chunk_size=1024*1024*2): f.write(chunk)
+        get_http_client().download_sync(dl_url, fpath, timeout=70, chunk_size=1024*1024*2)
         print_status(f"Pexels: Downloaded {os.path.basename(fpath)}")
         return {"path":fpath, "type":media_type[:-1] if media_type.endswith('s') else media_type}
     except Exception as e: print_error(f"Pexels error ('{query}'): {e}"); return None
@@ -111,8 +110,7 @@ def fetch_from_freesound(
     }
     print_status(f"Freesound: Searching for music with query '{query}'...")
     try:
-        r = requests.get(url, params=params, timeout=25); r.raise_for_status()
-        data = r.json(); tracks = data.get('results', [])
+        data = get_http_client().get_json_sync(url, params=params, timeout=25); tracks = data.get('results', [])
         if not tracks: print_warning(f"Freesound: No music found for query: '{query}'."); return None
 
         track = random.choice(tracks)
@@ -120,10 +118,8 @@ def fetch_from_freesound(
         dl_url = track.get('previews', {}).get('preview-hq-mp3')
         if not dl_url: print_warning(f"Freesound: No HQ MP3 preview found for track ID {track_id}."); return None
         
-        mr = requests.get(dl_url, stream=True, timeout=100); mr.raise_for_status()
         fpath = os.path.join(temp_assets_dir, f"freesound_music_{track_id}.mp3")
-        with open(fpath, "wb") as f: 
-            for chunk in mr.iter_content(chunk_size=1024*1024): f.write(chunk)
+        get_http_client().download_sync(dl_url, fpath, timeout=100)
         
         with AudioFileClip(fpath) as clip: dur = clip.duration
         if dur and dur > 0.1: 
@@ -132,7 +128,7 @@ def fetch_from_freesound(
         else: 
             print_error(f"Freesound: File '{fpath}' invalid duration."); 
             if os.path.exists(fpath): os.remove(fpath)
-    except requests.exceptions.RequestException as e: print_error(f"Freesound API error ('{query}'): {e}")
+    except HttpClientError as e: print_error(f"Freesound API error ('{query}'): {e}")
     except Exception as e: print_error(f"Freesound fetch/download error: {e}\n{traceback.format_exc()}")
     return None
 
@@ -190,20 +186,23 @@ def create_animated_karaoke_captions(
     font_path = style_config.get("font_path", "DejaVu-Sans-Bold")
     font_size = style_config.get("font_size", 85)
     stroke_width = style_config.get("stroke_width", 4.5)
+    renderer = get_text_renderer()
     
     for word in words:
         is_keyword = word.strip(".,!?").lower() in [k.lower() for k in keywords]
         
         text_color = style_config.get("accent_color", "yellow") if is_keyword else style_config.get("color", "white")
+        style = TextStyle(
+            font_path=font_path, font_size=int(font_size), color=text_color,
+            stroke_color=style_config.get("stroke_color", "black"),
+            stroke_width=int(round(stroke_width))
+        )
         
         try:
-            word_clip = TextClip(
-                word, fontsize=font_size, color=text_color, font=font_path,
-                stroke_color=style_config.get("stroke_color", "black"),
-                stroke_width=stroke_width, method='caption'
-            )
+            # Sprite is rasterized once per word/style and shared across clips
+            word_clip = ImageClip(renderer.render(word, style, max_width=video_width))
         except Exception as e:
-            print_error(f"Could not create TextClip for word '{word}': {e}")
+            print_error(f"Could not render caption sprite for word '{word}': {e}")
             continue # Skip this word if it fails
 
         # Keyword animation: slight pop